@@ -32,6 +32,10 @@ class AppConfig(BaseSettings):
 
     # ── Google Gemini ───────────────────────────────────────────────────
     google_api_key: str = Field(default="", description="Google Gemini API key")
+    gemini_file_api: bool = Field(
+        default=False,
+        description="Upload PDFs to the Gemini File API once and reference them, instead of inlining per call",
+    )
 
     # ── OpenAI ──────────────────────────────────────────────────────────
     openai_api_key: str = Field(default="", description="OpenAI API key")
@@ -63,8 +67,44 @@ class AppConfig(BaseSettings):
     max_upload_size_mb: int = Field(default=50, ge=1)
     server_port: int = Field(default=32123)
 
-    # ── Cancellation ────────────────────────────────────────────────────
-    cancel_signal_file: str = Field(default="cancel_signal.flag")
+    # ── PDF rendering ───────────────────────────────────────────────────
+    pdf_eager_fonts: bool = Field(
+        default=True,
+        description="Register PDF fonts once at import time instead of on the first render",
+    )
+    pdf_font_manifest: str = Field(
+        default="~/.createslide/fonts.json",
+        description="Where the resolved PDF font paths are cached between runs",
+    )
+
+    # ── LLM response cache ──────────────────────────────────────────────
+    llm_cache_enabled: bool = Field(
+        default=False,
+        description="Serve repeated low-temperature LLM requests from an on-disk cache",
+    )
+    llm_cache_dir: str = Field(default="~/.createslide/llm_cache")
+    llm_cache_ttl: float = Field(default=24 * 3600, ge=0, description="Seconds before a cached response expires")
+    llm_cache_max_temperature: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=2.0,
+        description="Calls with a higher temperature are never cached",
+    )
+    slide_result_cache: bool = Field(
+        default=False,
+        description="Reuse the slide outline when document, mode, instructions and provider are unchanged",
+    )
+
+    # ── Review pipeline ─────────────────────────────────────────────────
+    review_speculative: bool = Field(
+        default=False,
+        description="Run both Analyst variants alongside the Librarian and keep the matching one "
+        "(lower latency, one extra discarded LLM call)",
+    )
+    review_checkpoint_dir: str = Field(
+        default="",
+        description="Where review progress is saved for crash-resume (empty, the default, disables)",
+    )
 
     # ── Logging ─────────────────────────────────────────────────────────
     log_file: str = Field(default="app.log")
@@ -1,21 +1,20 @@
-"""Thread-safe cancellation signalling via file + in-memory flag.
-
-Supports both the legacy global signal and per-request ``CancelToken`` objects.
-"""
+"""Thread-safe, in-process cancellation signalling via per-request ``CancelToken`` objects."""
 
 from __future__ import annotations
 
-import os
+import asyncio
+import contextlib
 import threading
 
-from app.config import settings
-
 # ── Per-request CancelToken ──────────────────────────────────────────────
 
 
 class CancelToken:
     """Lightweight, per-request cancellation token (thread-safe).
 
+    Worker threads poll :meth:`is_set`; coroutines can ``await`` :meth:`wait`
+    and are woken as soon as :meth:`cancel` is called, from any thread.
+
     Usage::
 
         token = CancelToken()
@@ -23,58 +22,42 @@ class CancelToken:
         # later:
         token.cancel()  # signal cancellation
         token.is_set()  # check from worker thread
+        await token.wait()  # or wait for it from the event loop
     """
 
-    __slots__ = ("_event",)
+    __slots__ = ("_event", "_lock", "_waiters", "is_set")
 
     def __init__(self) -> None:
         self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        # Bound C method: the per-check cost on provider threads is one flag read
+        self.is_set = self._event.is_set
 
     def cancel(self) -> None:
-        """Request cancellation."""
+        """Request cancellation and wake any coroutine in :meth:`wait`."""
         self._event.set()
-
-    def is_set(self) -> bool:
-        """Return ``True`` if cancellation has been requested."""
-        return self._event.is_set()
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(event.set)
+
+    async def wait(self) -> None:
+        """Return once cancellation has been requested."""
+        if self._event.is_set():
+            return
+        event = asyncio.Event()
+        entry = (asyncio.get_running_loop(), event)
+        with self._lock:
+            self._waiters.append(entry)
+        try:
+            if not self._event.is_set():  # cancelled before we registered
+                await event.wait()
+        finally:
+            with self._lock:
+                self._waiters.remove(entry)
 
     def reset(self) -> None:
         """Clear the cancellation flag for reuse."""
         self._event.clear()
-
-
-# ── Legacy global signal (kept for backward-compat) ──────────────────────
-
-_lock = threading.Lock()
-_cancel_flag = False
-
-
-def set_cancel_signal() -> None:
-    """Raise the cancel flag (file + memory)."""
-    global _cancel_flag
-    with _lock:
-        _cancel_flag = True
-    try:
-        with open(settings.cancel_signal_file, "w") as f:
-            f.write("CANCEL")
-    except OSError:
-        pass  # rely on in-memory flag
-
-
-def clear_cancel_signal() -> None:
-    """Reset the cancel flag (file + memory)."""
-    global _cancel_flag
-    with _lock:
-        _cancel_flag = False
-    try:
-        if os.path.exists(settings.cancel_signal_file):
-            os.remove(settings.cancel_signal_file)
-    except OSError:
-        pass
-
-
-def check_cancel_signal() -> bool:
-    """Return ``True`` if cancellation has been requested."""
-    if _cancel_flag:
-        return True
-    return os.path.exists(settings.cancel_signal_file)
@@ -1,22 +1,37 @@
 """Shared thread-pool executor and async helpers.
 
-Provides a bounded ``ThreadPoolExecutor`` reused across all requests
-and an ``run_in_executor`` helper that wraps sync callables for
-``await``-able usage from Mesop async generators.
+Provides a bounded ``ThreadPoolExecutor`` reused across all requests,
+an ``run_in_executor`` helper that wraps sync callables for
+``await``-able usage from Mesop async generators, and
+``await_cancellable`` for awaiting a submitted future under user cancel.
+
+The pool is sized for I/O waits, not cores: jobs spend most of their time
+blocked on LLM calls, while parsing and rendering hold the GIL, so extra
+threads add memory and contention rather than throughput.  Set
+``SLIDEGENIUS_MAX_WORKERS`` (default 4) to cap concurrent jobs per process.
+Code already running in the pool must not submit to it and wait, or a
+full pool deadlocks; such nested fan-out uses its own short-lived pool.
 """
 
 from __future__ import annotations
 
 import asyncio
+import atexit
 import concurrent.futures
 import functools
 import os
 from collections.abc import Callable
-from typing import Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+if TYPE_CHECKING:
+    from app.core.cancellation import CancelToken
 
 T = TypeVar("T")
 
-_MAX_WORKERS = int(os.environ.get("SLIDEGENIUS_MAX_WORKERS", "4"))
+# Returned by await_cancellable() when the caller cancelled first
+CANCELLED: Any = object()
+
+_DEFAULT_MAX_WORKERS = 4
 _executor: concurrent.futures.ThreadPoolExecutor | None = None
 
 
@@ -25,7 +40,8 @@ def get_executor() -> concurrent.futures.ThreadPoolExecutor:
     global _executor
     if _executor is None or _executor._shutdown:
         _executor = concurrent.futures.ThreadPoolExecutor(
-            max_workers=_MAX_WORKERS,
+            # Read on first use so a value from .env (loaded after import) applies
+            max_workers=int(os.environ.get("SLIDEGENIUS_MAX_WORKERS", _DEFAULT_MAX_WORKERS)),
             thread_name_prefix="slidegenius",
         )
     return _executor
@@ -43,9 +59,50 @@ async def run_in_executor(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     return await loop.run_in_executor(get_executor(), bound)
 
 
+async def await_cancellable(
+    future: concurrent.futures.Future[T],
+    cancelled: Callable[[], bool] | None = None,
+    poll_interval: float = 0.3,
+    token: CancelToken | None = None,
+) -> T:
+    """Await a pool *future*; return :data:`CANCELLED` if cancellation fires first.
+
+    Completion is event-driven via ``asyncio.wrap_future``.  When *token* is
+    given its cancellation is awaited directly, with no wake-ups while the
+    job runs.  *cancelled* is polled every *poll_interval* seconds only for
+    signals that have no event; pass ``None`` when *token* covers them.
+    On cancel the underlying future is cancelled too (if not yet running).
+    """
+    aio_fut: asyncio.Future[T] = asyncio.wrap_future(future)
+    watchers: list[asyncio.Future[None]] = []
+    if cancelled is not None:
+        watchers.append(asyncio.ensure_future(_watch_cancel(cancelled, poll_interval)))
+    if token is not None:
+        watchers.append(asyncio.ensure_future(token.wait()))
+    try:
+        waitables: set[asyncio.Future[Any]] = {aio_fut, *watchers}
+        await asyncio.wait(waitables, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+    if aio_fut.done():
+        return aio_fut.result()
+    aio_fut.cancel()  # propagates to *future*
+    return cast("T", CANCELLED)
+
+
+async def _watch_cancel(cancelled: Callable[[], bool], poll_interval: float) -> None:
+    while not cancelled():
+        await asyncio.sleep(poll_interval)
+
+
 def shutdown_executor(wait: bool = False) -> None:
     """Shut down the shared executor (e.g. on app teardown)."""
     global _executor
     if _executor is not None:
         _executor.shutdown(wait=wait, cancel_futures=True)
         _executor = None
+
+
+# Release the shared pool when the interpreter exits
+atexit.register(shutdown_executor)
@@ -7,8 +7,15 @@ unquoted keys, and substring extraction as graceful fallbacks.
 from __future__ import annotations
 
 import ast
+import copy
+import functools
 import json
 import re
+from typing import cast
+
+_OBJECT_SPAN_RE = re.compile(r"\{.*\}", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+_BARE_KEY_RE = re.compile(r"(\w+):")
 
 
 def robust_json_parse(text: str) -> dict | list:
@@ -22,6 +29,9 @@ def robust_json_parse(text: str) -> dict | list:
         5. Fix trailing commas, then re-try.
         6. Quote bare JS-style keys, then re-try.
 
+    Steps 3-6 are memoised per text (retries, resumes and LLM cache hits
+    feed the same response back); callers get their own copy.
+
     Raises ``ValueError`` if every strategy fails.
     """
     text = text.strip()
@@ -37,45 +47,51 @@ def robust_json_parse(text: str) -> dict | list:
 
     # 2. Strict JSON
     try:
-        return json.loads(text)
+        return cast("dict | list", json.loads(text))
     except json.JSONDecodeError:
         pass
 
+    return copy.deepcopy(_lenient_parse(text))
+
+
+@functools.lru_cache(maxsize=128)
+def _lenient_parse(text: str) -> dict | list:
+    """Fallback strategies 3-6 of :func:`robust_json_parse`."""
     # 3. Python literal (single quotes, tuples, …)
     try:
-        return ast.literal_eval(text)
+        return cast("dict | list", ast.literal_eval(text))
     except (ValueError, SyntaxError):
         pass
 
     # 4. Substring extraction
-    match = re.search(r"\{.*\}", text, re.DOTALL)
+    match = _OBJECT_SPAN_RE.search(text)
     if match:
         subset = match.group(0)
         try:
-            return json.loads(subset)
+            return cast("dict | list", json.loads(subset))
         except Exception:
             pass
         try:
-            return ast.literal_eval(subset)
+            return cast("dict | list", ast.literal_eval(subset))
         except Exception:
             pass
         text = subset  # narrow scope for remaining repairs
 
     # 5. Fix trailing commas before ] or }
-    text_fixed = re.sub(r",\s*([\]}])", r"\1", text)
+    text_fixed = _TRAILING_COMMA_RE.sub(r"\1", text)
     try:
-        return json.loads(text_fixed)
+        return cast("dict | list", json.loads(text_fixed))
     except Exception:
         pass
     try:
-        return ast.literal_eval(text_fixed)
+        return cast("dict | list", ast.literal_eval(text_fixed))
     except Exception:
         pass
 
     # 6. Quote unquoted JavaScript-style keys
     try:
-        text_quoted = re.sub(r"(\w+):", r'"\1":', text_fixed)
-        return json.loads(text_quoted)
+        text_quoted = _BARE_KEY_RE.sub(r'"\1":', text_fixed)
+        return cast("dict | list", json.loads(text_quoted))
     except Exception:
         pass
 
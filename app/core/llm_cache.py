@@ -0,0 +1,103 @@
+"""Content-addressed on-disk cache for LLM responses.
+
+Re-running the same upload with the same prompt is common while iterating
+on prompts or the UI.  For low-temperature calls the answer is close to
+deterministic, so :meth:`LLMProvider.generate` can serve it from disk
+instead of paying for another round-trip.
+
+Entries are small JSON files named by a SHA-256 of the request, expired by
+age.  Opt in with ``LLM_CACHE_ENABLED=true``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from app.config import settings
+
+# id(bytes) → (bytes, digest).  One upload is digested by the review
+# checkpoints, the LLM cache and every Gemini attempt; the entry keeps the
+# object alive, so an id match with the same object means the same content.
+_DIGEST_MEMO_SIZE = 4
+_digest_memo: dict[int, tuple[bytes, str]] = {}
+
+
+def file_digest(data: bytes | None) -> str:
+    """Short content hash of an uploaded file (``""`` when absent)."""
+    if not data:
+        return ""
+    hit = _digest_memo.get(id(data))
+    if hit is not None and hit[0] is data:
+        return hit[1]
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    # Only immutable bytes can be recognised by identity
+    if type(data) is bytes:
+        if len(_digest_memo) >= _DIGEST_MEMO_SIZE:
+            _digest_memo.clear()
+        _digest_memo[id(data)] = (data, digest)
+    return digest
+
+
+class LLMCache:
+    """Directory of ``<sha256>.json`` entries with a time-to-live."""
+
+    def __init__(self, directory: str, ttl: float):
+        self.directory = os.path.expanduser(directory)
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(**parts: object) -> str:
+        """Stable key for a request described by JSON-serialisable *parts*."""
+        blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """Return ``(text, model)`` for a fresh entry, else ``None``."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as fh:
+                entry = json.load(fh)
+            return entry["text"], entry["model"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key: str, value: tuple[str, str]) -> None:
+        """Store ``(text, model)``; failures are ignored (cache is best-effort)."""
+        text, model = value
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"text": text, "model": model}, fh, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if tmp:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+
+
+_cache: LLMCache | None = None
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Return the shared cache, or ``None`` when caching is disabled."""
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = LLMCache(settings.llm_cache_dir, settings.llm_cache_ttl)
+    return _cache
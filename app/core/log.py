@@ -104,6 +104,10 @@ def setup_logging(*, json_format: bool = True) -> None:
     except Exception:
         pass
 
+    # A re-run (e.g. Mesop's reloader re-importing main.py) replaces the file
+    if _log_file_obj is not None:
+        with contextlib.suppress(Exception):
+            _log_file_obj.close()
     _log_file_obj = open(settings.log_file, "a", encoding="utf-8", buffering=1)  # noqa: SIM115
     sys.stdout = _log_file_obj
     sys.stderr = _log_file_obj
@@ -0,0 +1,13 @@
+"""Prompt pieces shared by every service."""
+
+# Prefix for the extracted document text sent to text-only providers
+DOCUMENT_CONTEXT_PREFIX = "Nội dung tài liệu:\n"
+
+
+def with_document_text(doc_text: str, *prompt_parts: str) -> str:
+    """Prepend *doc_text* to the prompt, assembled in a single join.
+
+    The document is often 100 KB+, so it is copied exactly once instead of
+    once per intermediate f-string.
+    """
+    return "".join((DOCUMENT_CONTEXT_PREFIX, doc_text, "\n\n", *prompt_parts))
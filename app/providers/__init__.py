@@ -7,6 +7,6 @@ Usage:
     text, model = provider.generate(system="...", prompt="...", cancel_check=fn)
 """
 
-from app.providers.registry import get_provider, list_providers
+from app.providers.registry import clear_provider_cache, get_provider, list_providers
 
-__all__ = ["get_provider", "list_providers"]
+__all__ = ["clear_provider_cache", "get_provider", "list_providers"]
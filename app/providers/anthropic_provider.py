@@ -6,11 +6,11 @@ Supports system messages, JSON mode, and temperature.
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
 from typing import ClassVar
 
-from app.core.log import safe_print
 from app.providers.base import (
     LLMProvider,
     _AbortAllError,
@@ -18,12 +18,10 @@ from app.providers.base import (
     _SkipModelError,
 )
 
-try:
-    import anthropic
+# Optional SDK, imported on first call so startup does not pay for it
+HAS_ANTHROPIC = importlib.util.find_spec("anthropic") is not None
 
-    HAS_ANTHROPIC = True
-except ImportError:
-    HAS_ANTHROPIC = False
+logger = logging.getLogger(__name__)
 
 
 class AnthropicProvider(LLMProvider):
@@ -57,7 +55,9 @@ class AnthropicProvider(LLMProvider):
         if not HAS_ANTHROPIC:
             raise _AbortAllError("Thư viện anthropic chưa được cài đặt. Chạy: pip install anthropic")
 
-        safe_print(f"DEBUG: Anthropic calling model: {model}", logging.DEBUG)
+        logger.debug("Anthropic calling model: %s", model)
+
+        import anthropic
 
         client = anthropic.Anthropic(api_key=key)
 
@@ -80,7 +80,7 @@ class AnthropicProvider(LLMProvider):
         try:
             response = client.messages.create(**kwargs)
             text = response.content[0].text if response.content else ""
-            return (text or "").strip()
+            return text or ""
         except Exception as exc:
             _classify_anthropic_error(exc, model)
             return ""  # unreachable
@@ -8,14 +8,23 @@ fallback logic in :meth:`generate` is inherited by all concrete providers
 
 from __future__ import annotations
 
+import logging
 import time
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import ClassVar
 
 from app.config import settings
+from app.core.llm_cache import file_digest, get_llm_cache
 from app.core.log import safe_print
 
+logger = logging.getLogger(__name__)
+
+
+def _short(exc: BaseException, n: int = 120) -> str:
+    """Truncated ``str(exc)`` for one-line log messages."""
+    return str(exc)[:n]
+
 
 class LLMProvider(ABC):
     """Strategy interface + shared retry/fallback loop."""
@@ -24,6 +33,8 @@ class LLMProvider(ABC):
 
     # Subclasses must set these
     default_model_list: ClassVar[list[str]] = []
+    # Set by providers whose _call_model accepts ``stream_callback``
+    supports_streaming: ClassVar[bool] = False
 
     def __init__(self, api_keys: list[str] | None = None):
         self.api_keys = api_keys or []
@@ -41,9 +52,18 @@ class LLMProvider(ABC):
         temperature: float | None = None,
         file_bytes: bytes | None = None,
         mime_type: str | None = None,
+        stream_callback: Callable[[str], None] | None = None,
+        refresh_cache: bool = False,
     ) -> tuple[str, str]:
         """Generate text.  Routes through key-rotation → retry loop → _call_model.
 
+        *stream_callback* receives text chunks as they arrive, for providers
+        that support streaming and only for non-JSON calls (JSON needs the
+        full buffer).  Chunks from a failed attempt are not retracted.
+
+        *refresh_cache* skips the LLM cache lookup; the fresh answer still
+        replaces the cached entry.
+
         Returns:
             ``(response_text, model_name_used)``
         """
@@ -59,11 +79,32 @@ class LLMProvider(ABC):
                 "Set the corresponding environment variable or pass keys explicitly."
             )
 
+        cache = get_llm_cache() if temperature <= settings.llm_cache_max_temperature else None
+        cache_key = ""
+        if cache is not None:
+            cache_key = cache.make_key(
+                provider=self.name,
+                models=list(models),
+                system=system,
+                prompt=prompt,
+                temperature=temperature,
+                json=response_format_json,
+                file=file_digest(file_bytes),
+                mime=mime_type,
+            )
+            hit = None if refresh_cache else cache.get(cache_key)
+            if hit is not None:
+                logger.info("[%s] LLM cache hit (%s).", self.name, hit[1])
+                return hit
+
+        if not self.supports_streaming or response_format_json:
+            stream_callback = None
+
         last_exc: Exception | None = None
         for idx, key in enumerate(keys):
             safe_print(f"🔑 [{self.name}] Key {idx + 1}/{len(keys)}")
             try:
-                return self._retry_loop(
+                result = self._retry_loop(
                     key=key,
                     system=system,
                     prompt=prompt,
@@ -73,10 +114,15 @@ class LLMProvider(ABC):
                     temperature=temperature,
                     file_bytes=file_bytes,
                     mime_type=mime_type,
+                    stream_callback=stream_callback,
                 )
             except Exception as exc:
-                safe_print(f"⚠️ [{self.name}] Key {idx + 1} failed: {str(exc)[:120]}")
+                safe_print(f"⚠️ [{self.name}] Key {idx + 1} failed: {_short(exc)}")
                 last_exc = exc
+            else:
+                if cache is not None:
+                    cache.set(cache_key, result)
+                return result
 
         raise ValueError(f"[{self.name}] All keys exhausted. Last error: {last_exc}")
 
@@ -94,6 +140,7 @@ class LLMProvider(ABC):
         temperature: float,
         file_bytes: bytes | None,
         mime_type: str | None,
+        stream_callback: Callable[[str], None] | None = None,
     ) -> tuple[str, str]:
         """Cyclic model fallback with smart delay, shared by every provider."""
         permanently_failed: set[str] = set()
@@ -101,9 +148,18 @@ class LLMProvider(ABC):
         min_delay = self._min_retry_delay()
         total_cycles = settings.ai_retry_cycles
         last_error: Exception | None = None
+        # Local aliases: LOAD_FAST instead of attribute/global lookups per iteration
+        cancelled = cancel_check or _never_cancelled
+        clock = time.monotonic
+        smart_wait = self._smart_wait
+        call_model = self._call_model
+        # Only streaming-capable providers take the extra keyword
+        stream_kwargs = {"stream_callback": stream_callback} if stream_callback else {}
 
         for cycle in range(1, total_cycles + 1):
-            self._check_cancel(cancel_check)
+            if cancelled():
+                safe_print("⚠️ Cancel requested. Aborting.")
+                raise ValueError("Operation cancelled by user.")
             safe_print(f"\n--- [{self.name}] CYCLE {cycle}/{total_cycles} ---")
 
             available = [m for m in models if m not in permanently_failed]
@@ -116,11 +172,11 @@ class LLMProvider(ABC):
                     continue
 
                 # Smart delay
-                self._smart_wait(model_name, model_last_used, min_delay, cancel_check)
-                model_last_used[model_name] = time.time()
+                smart_wait(model_name, model_last_used, min_delay, cancel_check)
+                model_last_used[model_name] = clock()
 
                 try:
-                    text = self._call_model(
+                    text = call_model(
                         key=key,
                         model=model_name,
                         system=system,
@@ -129,10 +185,12 @@ class LLMProvider(ABC):
                         temperature=temperature,
                         file_bytes=file_bytes,
                         mime_type=mime_type,
+                        **stream_kwargs,
                     )
-                    if text and text.strip():
+                    stripped = text.strip() if text else ""
+                    if stripped:
                         safe_print(f"✅ [{self.name}] Success with {model_name}.")
-                        return text.strip(), model_name
+                        return stripped, model_name
                     else:
                         safe_print(f"[{model_name}] Empty response. Skipping...")
                         continue
@@ -146,7 +204,7 @@ class LLMProvider(ABC):
                 except _AbortAllError as aae:
                     raise ValueError(str(aae)) from aae
                 except Exception as exc:
-                    safe_print(f"[{model_name}] Unexpected: {str(exc)[:150]}. Skipping.")
+                    safe_print(f"[{model_name}] Unexpected: {_short(exc, 150)}. Skipping.")
                     last_error = exc
 
             if cycle < total_cycles:
@@ -170,7 +228,9 @@ class LLMProvider(ABC):
         file_bytes: bytes | None,
         mime_type: str | None,
     ) -> str:
-        """Execute a single model call.  Return the response text.
+        """Execute a single model call.  Return the raw response text.
+
+        Whitespace stripping is done once by the retry loop, not here.
 
         Raise:
             _PermanentModelError – model should never be retried (404, quota=0).
@@ -188,12 +248,6 @@ class LLMProvider(ABC):
 
     # ── Helpers ─────────────────────────────────────────────────────────
 
-    @staticmethod
-    def _check_cancel(cancel_check: Callable[[], bool] | None) -> None:
-        if cancel_check and cancel_check():
-            safe_print("⚠️ Cancel requested. Aborting.")
-            raise ValueError("Operation cancelled by user.")
-
     @staticmethod
     def _smart_wait(
         model: str,
@@ -201,10 +255,10 @@ class LLMProvider(ABC):
         min_delay: float,
         cancel_check: Callable[[], bool] | None,
     ) -> None:
-        last = timestamps.get(model, 0)
-        if last == 0:
+        last = timestamps.get(model)
+        if last is None:
             return
-        elapsed = time.time() - last
+        elapsed = time.monotonic() - last
         if elapsed >= min_delay:
             return
         wait = min_delay - elapsed
@@ -218,6 +272,10 @@ class LLMProvider(ABC):
             waited += step
 
 
+def _never_cancelled() -> bool:
+    return False
+
+
 # ── Sentinel exception hierarchy (internal only) ───────────────────────
 
 
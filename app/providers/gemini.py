@@ -1,22 +1,47 @@
-"""Google Gemini provider (via google-genai SDK)."""
+"""Google Gemini provider (via google-genai SDK).
+
+``google.genai`` pulls in gRPC, protobuf and auth (~0.4 s), so it is imported
+on first use rather than when the provider registry loads.
+"""
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import io
 import logging
 import os
-from typing import ClassVar
-
-from google import genai
-from google.genai import types
+import threading
+import time
+from typing import TYPE_CHECKING, ClassVar
 
+from app.config import settings
+from app.core.llm_cache import file_digest
 from app.core.log import safe_print
 from app.providers.base import (
     LLMProvider,
     _AbortAllError,
     _PermanentModelError,
+    _short,
     _SkipModelError,
 )
 
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# File API uploads (opt-in, ``GEMINI_FILE_API``) keyed by (api key, content
+# digest) → (file name, uri, mime, uploaded_at), least recently used first.
+# Shared across provider instances so retries and multi-step pipelines send a
+# document once.  Entries are reused for 1h; the remote file is deleted when
+# its entry expires, is evicted, or the process exits.
+_UPLOAD_TTL = 3600.0
+_UPLOAD_CACHE_SIZE = 32
+_uploads: dict[tuple[str, str], tuple[str, str, str, float]] = {}
+_uploads_lock = threading.Lock()
+
 
 class GeminiProvider(LLMProvider):
     """Google Gemini — supports native multimodal PDF input."""
@@ -33,6 +58,13 @@ class GeminiProvider(LLMProvider):
         "gemini-1.5-flash",
     ]
 
+    # Upper bound on memoised generation configs per provider instance
+    _CONFIG_CACHE_SIZE = 32
+
+    def __init__(self, api_keys: list[str] | None = None):
+        super().__init__(api_keys)
+        self._config_cache: dict[tuple[str, bool, float], types.GenerateContentConfig] = {}
+
     # ── Subclass hooks ──────────────────────────────────────────────────
 
     def _resolve_env_keys(self) -> list[str]:
@@ -51,14 +83,17 @@ class GeminiProvider(LLMProvider):
         file_bytes: bytes | None,
         mime_type: str | None,
     ) -> str:
-        safe_print(f"DEBUG: Gemini calling model: {model}", logging.DEBUG)
+        from google import genai
+        from google.genai import types
+
+        logger.debug("Gemini calling model: %s", model)
 
         client = genai.Client(api_key=key)
 
         # Build content parts
         parts: list[types.Part] = []
         if file_bytes and mime_type and mime_type == "application/pdf":
-            parts.append(types.Part.from_bytes(data=file_bytes, mime_type="application/pdf"))
+            parts.append(self._file_part(client, key, file_bytes, "application/pdf"))
             parts.append(types.Part.from_text(text=prompt))
         elif file_bytes and mime_type:
             # Non-PDF binary → must extract text upstream (done by services layer)
@@ -66,11 +101,7 @@ class GeminiProvider(LLMProvider):
         else:
             parts.append(types.Part.from_text(text=prompt))
 
-        config = types.GenerateContentConfig(
-            system_instruction=system if system else None,
-            response_mime_type="application/json" if response_format_json else "text/plain",
-            temperature=temperature,
-        )
+        config = self._generation_config(system, response_format_json, temperature)
 
         try:
             response = client.models.generate_content(
@@ -87,6 +118,70 @@ class GeminiProvider(LLMProvider):
             self._classify_error(exc, model)
             return ""  # unreachable — classify always raises
 
+    @staticmethod
+    def _file_part(client: genai.Client, key: str, file_bytes: bytes, mime_type: str) -> types.Part:
+        """Reference to the document via the File API, uploaded once per key and content.
+
+        Falls back to inline bytes when uploads are disabled or fail.
+        """
+        from google.genai import types
+
+        if not settings.gemini_file_api:
+            return types.Part.from_bytes(data=file_bytes, mime_type=mime_type)
+
+        cache_key = (key, file_digest(file_bytes))
+        now = time.monotonic()
+        with _uploads_lock:
+            stale = _take_expired(now)
+            hit = _uploads.pop(cache_key, None)
+            if hit is not None:
+                _uploads[cache_key] = hit  # most recently used goes last
+        _delete_remote(stale)
+        if hit is not None:
+            return types.Part.from_uri(file_uri=hit[1], mime_type=hit[2])
+
+        try:
+            uploaded = client.files.upload(
+                file=io.BytesIO(file_bytes), config=types.UploadFileConfig(mime_type=mime_type)
+            )
+        except Exception as exc:
+            logger.info("Gemini file upload failed, sending inline: %s", _short(exc))
+            uploaded = None
+        if uploaded is None or not uploaded.uri:
+            return types.Part.from_bytes(data=file_bytes, mime_type=mime_type)
+
+        uri, uploaded_mime = uploaded.uri, uploaded.mime_type or mime_type
+        evicted: list[tuple[str, str]] = []
+        with _uploads_lock:
+            previous = _uploads.pop(cache_key, None)  # a concurrent upload of the same file
+            if previous is not None:
+                evicted.append((key, previous[0]))
+            while len(_uploads) >= _UPLOAD_CACHE_SIZE:
+                oldest = next(iter(_uploads))
+                evicted.append((oldest[0], _uploads.pop(oldest)[0]))
+            _uploads[cache_key] = (uploaded.name or "", uri, uploaded_mime, time.monotonic())
+        _delete_remote(evicted)
+        return types.Part.from_uri(file_uri=uri, mime_type=uploaded_mime)
+
+    def _generation_config(
+        self, system: str, response_format_json: bool, temperature: float
+    ) -> types.GenerateContentConfig:
+        """Return the config for these parameters, built once and reused across retries."""
+        cache_key = (system, response_format_json, temperature)
+        config = self._config_cache.get(cache_key)
+        if config is None:
+            from google.genai import types
+
+            if len(self._config_cache) >= self._CONFIG_CACHE_SIZE:
+                self._config_cache.clear()
+            config = types.GenerateContentConfig(
+                system_instruction=system if system else None,
+                response_mime_type="application/json" if response_format_json else "text/plain",
+                temperature=temperature,
+            )
+            self._config_cache[cache_key] = config
+        return config
+
     # ── Error classification ────────────────────────────────────────────
 
     @staticmethod
@@ -103,3 +198,37 @@ class GeminiProvider(LLMProvider):
         if "model output must contain" in msg or "Tool use is not expected" in msg:
             raise _SkipModelError("Empty/blocked output")
         raise _SkipModelError(str(exc)[:150])
+
+
+# ── File API housekeeping ──────────────────────────────────────────────
+
+
+def _take_expired(now: float) -> list[tuple[str, str]]:
+    """Remove expired uploads from the memo; returns (api key, file name) pairs.
+
+    Called with ``_uploads_lock`` held.
+    """
+    expired = [k for k, entry in _uploads.items() if now - entry[3] >= _UPLOAD_TTL]
+    return [(k[0], _uploads.pop(k)[0]) for k in expired]
+
+
+def _delete_remote(files: list[tuple[str, str]]) -> None:
+    """Delete uploaded files from the File API (best-effort, errors ignored)."""
+    if not files:
+        return
+    from google import genai
+
+    for key, name in files:
+        if name:
+            with contextlib.suppress(Exception):
+                genai.Client(api_key=key).files.delete(name=name)
+
+
+def _delete_all_uploads() -> None:
+    with _uploads_lock:
+        files = [(k[0], entry[0]) for k, entry in _uploads.items()]
+        _uploads.clear()
+    _delete_remote(files)
+
+
+atexit.register(_delete_all_uploads)
@@ -10,11 +10,11 @@ Requires: ``pip install litellm``
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
 from typing import ClassVar
 
-from app.core.log import safe_print
 from app.providers.base import (
     LLMProvider,
     _AbortAllError,
@@ -22,12 +22,10 @@ from app.providers.base import (
     _SkipModelError,
 )
 
-try:
-    import litellm
+# Optional SDK, imported on first call; litellm alone takes seconds to import
+HAS_LITELLM = importlib.util.find_spec("litellm") is not None
 
-    HAS_LITELLM = True
-except ImportError:
-    HAS_LITELLM = False
+logger = logging.getLogger(__name__)
 
 
 class LiteLLMProvider(LLMProvider):
@@ -68,7 +66,7 @@ class LiteLLMProvider(LLMProvider):
         if not HAS_LITELLM:
             raise _AbortAllError("Thư viện litellm chưa được cài đặt. Chạy: pip install litellm")
 
-        safe_print(f"DEBUG: LiteLLM calling model: {model}", logging.DEBUG)
+        logger.debug("LiteLLM calling model: %s", model)
 
         messages = []
         if system:
@@ -88,12 +86,14 @@ class LiteLLMProvider(LLMProvider):
         if key and key != "litellm":
             kwargs["api_key"] = key
 
+        import litellm
+
         try:
             # Suppress LiteLLM's verbose logging
             litellm.suppress_debug_info = True
             response = litellm.completion(**kwargs)
             text = response.choices[0].message.content  # type: ignore[union-attr]
-            return (text or "").strip()
+            return text or ""
         except Exception as exc:
             _classify_litellm_error(exc, model)
             return ""  # unreachable
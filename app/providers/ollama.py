@@ -5,16 +5,21 @@ Reuses the OpenAI chat-completions helper but with:
   * Dummy API key (``"ollama"``).
   * Shorter retry delays (``min_retry_delay_local``).
   * Long timeout for large models (72B can be slow).
-  * Dynamic model discovery via ``/api/tags``.
+  * Dynamic model discovery via ``/api/tags`` (cached per server for 5 min).
+  * One pooled ``httpx.Client`` shared by probes, discovery and chat calls.
+  * Optional token streaming for free-text calls (``stream_callback``).
 """
 
 from __future__ import annotations
 
-import json
+import contextlib
+import importlib.util
 import logging
 import os
-import urllib.request
-from typing import ClassVar
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, ClassVar
 
 from app.config import settings
 from app.core.log import safe_print
@@ -25,18 +30,28 @@ from app.providers.base import (
     _SkipModelError,
 )
 
-try:
+# openai (and httpx, which it brings) are imported on first use, not at
+# registry load; see openai_provider
+HAS_OPENAI = importlib.util.find_spec("openai") is not None
+
+if TYPE_CHECKING:
+    import httpx
     from openai import OpenAI as OpenAIClient
 
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
+logger = logging.getLogger(__name__)
+
+# Discovered model names keyed by Ollama API root → (names, fetched_at).
+# Shared across provider instances; a server's model set rarely changes.
+_MODELS_TTL = 300.0
+_model_lists: dict[str, tuple[tuple[str, ...], float]] = {}
+_model_lists_lock = threading.Lock()
 
 
 class OllamaProvider(LLMProvider):
     """Ollama (local / DGX Spark) — free, no external API key required."""
 
     name = "ollama"
+    supports_streaming = True
 
     # Static fallback list (used when server is unreachable)
     default_model_list: ClassVar[list[str]] = [
@@ -50,6 +65,29 @@ class OllamaProvider(LLMProvider):
     def __init__(self, api_keys: list[str] | None = None, base_url: str | None = None):
         super().__init__(api_keys)
         self.base_url = base_url or settings.ollama_base_url
+        self._http: httpx.Client | None = None
+        self._clients: dict[tuple[str, str], OpenAIClient] = {}
+
+    # ── Shared HTTP pool ────────────────────────────────────────────────
+
+    def _http_client(self) -> httpx.Client:
+        """Return the keep-alive client shared by every request to this server."""
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.Client(timeout=settings.ollama_timeout)
+        return self._http
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._clients.clear()
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __del__(self) -> None:
+        with contextlib.suppress(Exception):
+            self.close()
 
     # ── Subclass hooks ──────────────────────────────────────────────────
 
@@ -71,6 +109,7 @@ class OllamaProvider(LLMProvider):
         temperature: float,
         file_bytes: bytes | None,
         mime_type: str | None,
+        stream_callback: Callable[[str], None] | None = None,
     ) -> str:
         if not HAS_OPENAI:
             raise _AbortAllError("Thư viện openai chưa được cài đặt. Chạy: pip install openai")
@@ -78,15 +117,20 @@ class OllamaProvider(LLMProvider):
         base = key if key.startswith("http") else self.base_url
         api_key = os.environ.get("OLLAMA_API_KEY", settings.ollama_api_key)
 
-        safe_print(f"🏠 Ollama @ {base} → model {model}", logging.DEBUG)
+        logger.debug("🏠 Ollama @ %s → model %s", base, model)
 
-        client = OpenAIClient(
-            base_url=base,
-            api_key=api_key,
-            timeout=settings.ollama_timeout,
-        )
+        client = self._clients.get((base, api_key))
+        if client is None:
+            from openai import OpenAI as OpenAIClient
+
+            client = self._clients[(base, api_key)] = OpenAIClient(
+                base_url=base,
+                api_key=api_key,
+                timeout=settings.ollama_timeout,
+                http_client=self._http_client(),
+            )
 
-        return self._chat_completion(client, model, system, prompt, response_format_json, temperature)
+        return self._chat_completion(client, model, system, prompt, response_format_json, temperature, stream_callback)
 
     # ── Chat completion (mirrors OpenAI logic, no o-series quirks) ─────
 
@@ -98,6 +142,7 @@ class OllamaProvider(LLMProvider):
         prompt: str,
         response_format_json: bool,
         temperature: float,
+        stream_callback: Callable[[str], None] | None = None,
     ) -> str:
         messages = []
         if system:
@@ -113,9 +158,11 @@ class OllamaProvider(LLMProvider):
             kwargs["response_format"] = {"type": "json_object"}
 
         try:
+            if stream_callback is not None:
+                return _stream_completion(client, kwargs, stream_callback)
             resp = client.chat.completions.create(**kwargs)
             text = resp.choices[0].message.content
-            return (text or "").strip()
+            return text or ""
         except Exception as exc:
             _classify_ollama_error(exc, model)
             return ""  # unreachable
@@ -123,21 +170,30 @@ class OllamaProvider(LLMProvider):
     # ── Dynamic model discovery ─────────────────────────────────────────
 
     def list_models(self) -> list[str]:
-        """Query the Ollama ``/api/tags`` endpoint for available models."""
+        """Query the Ollama ``/api/tags`` endpoint for available models.
+
+        Successful results are reused for ``_MODELS_TTL`` seconds; the static
+        fallback list is never cached, so a server that comes up is seen at once.
+        """
         # Strip /v1 suffix to get raw Ollama API root
         raw_base = self.base_url.rstrip("/")
         if raw_base.endswith("/v1"):
             raw_base = raw_base[:-3]
 
-        url = f"{raw_base}/api/tags"
+        with _model_lists_lock:
+            hit = _model_lists.get(raw_base)
+        if hit is not None and time.monotonic() - hit[1] < _MODELS_TTL:
+            return list(hit[0])
+
         try:
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                data = json.loads(resp.read().decode())
-                models = [m["name"] for m in data.get("models", [])]
-                if models:
-                    safe_print(f"Ollama models discovered: {models}")
-                    return models
+            resp = self._http_client().get(f"{raw_base}/api/tags", timeout=5)
+            data = resp.json()
+            models = tuple(m["name"] for m in data.get("models", []))
+            if models:
+                safe_print(f"Ollama models discovered: {list(models)}")
+                with _model_lists_lock:
+                    _model_lists[raw_base] = (models, time.monotonic())
+                return list(models)
         except Exception as exc:
             safe_print(f"Could not query Ollama models: {exc}")
 
@@ -146,13 +202,23 @@ class OllamaProvider(LLMProvider):
     def check_connectivity(self) -> bool:
         """Return ``True`` if the Ollama server responds to ``/v1/models``."""
         try:
-            req = urllib.request.Request(f"{self.base_url}/models", method="GET")
-            with urllib.request.urlopen(req, timeout=3) as resp:
-                return resp.status == 200
+            resp = self._http_client().get(f"{self.base_url}/models", timeout=3)
+            return resp.status_code == 200
         except Exception:
             return False
 
 
+def _stream_completion(client, kwargs: dict, stream_callback: Callable[[str], None]) -> str:
+    """Run a streamed chat completion, forwarding each delta to *stream_callback*."""
+    parts: list[str] = []
+    for chunk in client.chat.completions.create(stream=True, **kwargs):
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            stream_callback(delta)
+    return "".join(parts)
+
+
 def _classify_ollama_error(exc: Exception, model: str) -> None:
     msg = str(exc)
     low = msg.lower()
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import os
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
-from app.core.log import safe_print
 from app.providers.base import (
     LLMProvider,
     _AbortAllError,
@@ -14,13 +14,14 @@ from app.providers.base import (
     _SkipModelError,
 )
 
-# Lazy import — openai is an optional dependency
-try:
+# openai is optional and slow to import (~0.4 s); check for it here and
+# import it when the first client is built
+HAS_OPENAI = importlib.util.find_spec("openai") is not None
+
+if TYPE_CHECKING:
     from openai import OpenAI as OpenAIClient
 
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
+logger = logging.getLogger(__name__)
 
 
 class OpenAIProvider(LLMProvider):
@@ -38,6 +39,19 @@ class OpenAIProvider(LLMProvider):
         "gpt-3.5-turbo",
     ]
 
+    def __init__(self, api_keys: list[str] | None = None):
+        super().__init__(api_keys)
+        # One client (and its keep-alive connection pool) per API key
+        self._clients: dict[str, OpenAIClient] = {}
+
+    def _client(self, key: str) -> OpenAIClient:
+        client = self._clients.get(key)
+        if client is None:
+            from openai import OpenAI as OpenAIClient
+
+            client = self._clients[key] = OpenAIClient(api_key=key)
+        return client
+
     # ── Subclass hooks ──────────────────────────────────────────────────
 
     def _resolve_env_keys(self) -> list[str]:
@@ -59,9 +73,8 @@ class OpenAIProvider(LLMProvider):
         if not HAS_OPENAI:
             raise _AbortAllError("Thư viện openai chưa được cài đặt. Chạy: pip install openai")
 
-        safe_print(f"DEBUG: OpenAI calling model: {model}", logging.DEBUG)
-        client = OpenAIClient(api_key=key)
-        return self._chat_completion(client, model, system, prompt, response_format_json, temperature)
+        logger.debug("OpenAI calling model: %s", model)
+        return self._chat_completion(self._client(key), model, system, prompt, response_format_json, temperature)
 
     # ── Shared chat-completions helper ──────────────────────────────────
 
@@ -91,7 +104,7 @@ class OpenAIProvider(LLMProvider):
         try:
             resp = client.chat.completions.create(**kwargs)
             text = resp.choices[0].message.content
-            return (text or "").strip()
+            return text or ""
         except Exception as exc:
             _classify_openai_error(exc, model)
             return ""  # unreachable
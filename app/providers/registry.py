@@ -12,6 +12,10 @@ Usage:
 
 from __future__ import annotations
 
+import functools
+import os
+
+from app.config import settings
 from app.providers.base import LLMProvider
 from app.providers.gemini import GeminiProvider
 from app.providers.ollama import OllamaProvider
@@ -46,10 +50,19 @@ if _HAS_ANTHROPIC:
 if _HAS_LITELLM:
     _PROVIDERS["litellm"] = LiteLLMProvider  # type: ignore[assignment]
 
+# Human-readable names used in the "missing key" error message
+_PROVIDER_LABELS: dict[str, str] = {"openai": "OpenAI", "ollama": "Ollama", "gemini": "Google"}
+
 
 def register_provider(name: str, cls: type[LLMProvider]) -> None:
     """Register a custom provider at runtime (e.g. LiteLLM proxy)."""
     _PROVIDERS[name.lower()] = cls
+    clear_provider_cache()
+
+
+def clear_provider_cache() -> None:
+    """Drop the memoized provider instances (and their SDK clients)."""
+    _cached_provider.cache_clear()
 
 
 def get_provider(
@@ -58,7 +71,13 @@ def get_provider(
     api_keys: list[str] | None = None,
     base_url: str | None = None,
 ) -> LLMProvider:
-    """Instantiate a provider by name.
+    """Return a provider by name.
+
+    Instances built from the server's configured keys are memoized per
+    ``(name, api_keys, base_url)`` so repeated calls reuse the same SDK
+    clients and their keep-alive connections.  Keys entered by a user get a
+    fresh instance each time, so they are never held process-wide or shared
+    between sessions (a review still reuses its one instance for all steps).
 
     Args:
         name: ``"gemini"``, ``"openai"``, ``"ollama"`` (or any registered name).
@@ -66,15 +85,38 @@ def get_provider(
         base_url: Override base URL (only relevant for Ollama / proxies).
     """
     key = name.lower().strip()
-    cls = _PROVIDERS.get(key)
-    if cls is None:
+    if key not in _PROVIDERS:
         available = ", ".join(sorted(_PROVIDERS))
         raise ValueError(f"Unknown provider '{name}'. Available: {available}")
+    keys = tuple(api_keys or ())
+    if not _server_keys_only(key, keys):
+        return _new_provider(key, keys, base_url)
+    return _cached_provider(key, keys, base_url)
+
 
+def _server_keys_only(name: str, api_keys: tuple[str, ...]) -> bool:
+    """True when *api_keys* are all keys the server itself is configured with."""
+    if not api_keys:
+        return True
+    try:
+        configured = resolve_provider_keys(name)
+    except ValueError:
+        return False
+    return set(api_keys) <= set(configured)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_provider(key: str, api_keys: tuple[str, ...], base_url: str | None) -> LLMProvider:
+    return _new_provider(key, api_keys, base_url)
+
+
+def _new_provider(key: str, api_keys: tuple[str, ...], base_url: str | None) -> LLMProvider:
+    cls = _PROVIDERS[key]
+    keys = list(api_keys) or None
     # OllamaProvider has an extra base_url kwarg
     if key == "ollama":
-        return cls(api_keys=api_keys, base_url=base_url)  # type: ignore[call-arg]
-    return cls(api_keys=api_keys)
+        return cls(api_keys=keys, base_url=base_url)  # type: ignore[call-arg]
+    return cls(api_keys=keys)
 
 
 def list_providers() -> list[str]:
@@ -90,10 +132,6 @@ def resolve_provider_keys(provider: str, api_key: str | None = None, api_keys: l
 
     Backward-compatible helper used by services layer.
     """
-    import os
-
-    from app.config import settings
-
     keys_to_use: list[str] = []
     if api_keys and len(api_keys) > 0:
         keys_to_use = [k.strip() for k in api_keys if k.strip()]
@@ -112,17 +150,10 @@ def resolve_provider_keys(provider: str, api_key: str | None = None, api_keys: l
                 keys_to_use = [env_key]
 
     if not keys_to_use:
-        provider_names = {"openai": "OpenAI", "ollama": "Ollama", "gemini": "Google"}
         raise ValueError(
-            f"Thiếu {provider_names.get(provider, provider)} API Key. "
+            f"Thiếu {_PROVIDER_LABELS.get(provider, provider)} API Key. "
             "Vui lòng thiết lập biến môi trường hoặc nhập vào giao diện."
         )
 
     # Deduplicate preserving order
-    seen: set[str] = set()
-    unique: list[str] = []
-    for k in keys_to_use:
-        if k not in seen:
-            unique.append(k)
-            seen.add(k)
-    return unique
+    return list(dict.fromkeys(keys_to_use))
@@ -5,9 +5,14 @@ Centralises all ReportLab logic that was previously scattered in summarizer.py.
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import functools
+import io
 import json
 import os
 import re
+from typing import BinaryIO
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
@@ -23,123 +28,184 @@ from reportlab.platypus import (
     Spacer,
 )
 
+from app.config import settings
+
+# ── Precompiled Markdown patterns ────────────────────────────────────────
+
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_ITALIC_RE = re.compile(r"\*(.*?)\*")
+_HEADING_MD_RE = re.compile(r"##\s*(.*?)\n")
+_XML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 # ── Font state (module-level singletons) ─────────────────────────────────
 
 HAS_UNICODE_FONT = False
+_fonts_probed = False  # registration is attempted at most once per process
 FONT_FAMILY = "Helvetica"
 FONT_REGULAR = "Helvetica"
 FONT_BOLD = "Helvetica-Bold"
 FONT_ITALIC = "Helvetica-Oblique"
 
 
-def register_fonts() -> None:
-    """Try to register a Unicode-capable font (Arial → DejaVu → Liberation)."""
+# Cached result of the last successful font probe (skips the candidate scan on later starts)
+_FONT_MANIFEST_PATH = os.path.expanduser(settings.pdf_font_manifest)
+
+_FONT_CANDIDATES: list[dict] = [
+    {
+        "family": "Arial",
+        "regular": [
+            "C:\\Windows\\Fonts\\arial.ttf",
+            "/Library/Fonts/Arial.ttf",
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+        ],
+        "bold": [
+            "C:\\Windows\\Fonts\\arialbd.ttf",
+            "/Library/Fonts/Arial Bold.ttf",
+            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+        ],
+        "italic": [
+            "C:\\Windows\\Fonts\\ariali.ttf",
+            "/Library/Fonts/Arial Italic.ttf",
+            "/System/Library/Fonts/Supplemental/Arial Italic.ttf",
+        ],
+    },
+    {
+        "family": "DejaVuSans",
+        "regular": ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/local/share/fonts/DejaVuSans.ttf"],
+        "bold": [
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+            "/usr/local/share/fonts/DejaVuSans-Bold.ttf",
+        ],
+        "italic": [
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf",
+            "/usr/local/share/fonts/DejaVuSans-Oblique.ttf",
+        ],
+    },
+    {
+        "family": "LiberationSans",
+        "regular": [
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
+        ],
+        "bold": [
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+            "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf",
+        ],
+        "italic": [
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Italic.ttf",
+            "/usr/share/fonts/truetype/liberation2/LiberationSans-Italic.ttf",
+        ],
+    },
+]
+
+
+def _first_existing(paths: list[str]) -> str:
+    for p in paths:
+        if os.path.exists(p):
+            return p
+    return ""
+
+
+def _load_font_manifest() -> dict | None:
+    """Return the cached font paths if every referenced file still exists."""
+    try:
+        with open(_FONT_MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+        entry = {key: str(manifest[key]) for key in ("family", "regular", "bold", "italic")}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not entry["family"] or not os.path.exists(entry["regular"]):
+        return None
+    if any(entry[k] and not os.path.exists(entry[k]) for k in ("bold", "italic")):
+        return None
+    return entry
+
+
+def _save_font_manifest(entry: dict) -> None:
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(_FONT_MANIFEST_PATH) or ".", exist_ok=True)
+        with open(_FONT_MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+
+
+def _register_family(family: str, regular: str, bold: str, italic: str) -> None:
+    """Register *family* from resolved TTF paths and make it the active PDF font."""
     global HAS_UNICODE_FONT, FONT_FAMILY, FONT_REGULAR, FONT_BOLD, FONT_ITALIC
 
-    if HAS_UNICODE_FONT:
+    bold_name = f"{family}-Bold"
+    italic_name = f"{family}-Italic"
+    registered = set(pdfmetrics.getRegisteredFontNames())
+
+    if family not in registered:
+        pdfmetrics.registerFont(TTFont(family, regular))
+        registered.add(family)
+
+    if bold and bold_name not in registered:
+        pdfmetrics.registerFont(TTFont(bold_name, bold))
+        registered.add(bold_name)
+    else:
+        bold_name = family
+
+    if italic and italic_name not in registered:
+        pdfmetrics.registerFont(TTFont(italic_name, italic))
+    else:
+        italic_name = family
+
+    pdfmetrics.registerFontFamily(family, normal=family, bold=bold_name, italic=italic_name, boldItalic=bold_name)
+
+    FONT_FAMILY = family
+    FONT_REGULAR = family
+    FONT_BOLD = bold_name
+    FONT_ITALIC = italic_name
+    HAS_UNICODE_FONT = True
+
+
+def register_fonts() -> None:
+    """Try to register a Unicode-capable font (Arial → DejaVu → Liberation).
+
+    The winning paths are cached in a small JSON manifest so later process
+    starts register them directly instead of probing every candidate.
+    """
+    global _fonts_probed
+
+    if _fonts_probed or HAS_UNICODE_FONT:
         return
+    _fonts_probed = True
 
-    def _first(paths: list[str]) -> str:
-        for p in paths:
-            if os.path.exists(p):
-                return p
-        return ""
+    manifest = _load_font_manifest()
+    if manifest:
+        try:
+            _register_family(**manifest)
+            return
+        except Exception:
+            pass  # stale / unreadable font — fall back to a full probe
 
-    candidates = [
-        {
-            "family": "Arial",
-            "regular": [
-                "C:\\Windows\\Fonts\\arial.ttf",
-                "/Library/Fonts/Arial.ttf",
-                "/System/Library/Fonts/Supplemental/Arial.ttf",
-            ],
-            "bold": [
-                "C:\\Windows\\Fonts\\arialbd.ttf",
-                "/Library/Fonts/Arial Bold.ttf",
-                "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-            ],
-            "italic": [
-                "C:\\Windows\\Fonts\\ariali.ttf",
-                "/Library/Fonts/Arial Italic.ttf",
-                "/System/Library/Fonts/Supplemental/Arial Italic.ttf",
-            ],
-        },
-        {
-            "family": "DejaVuSans",
-            "regular": ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/local/share/fonts/DejaVuSans.ttf"],
-            "bold": [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                "/usr/local/share/fonts/DejaVuSans-Bold.ttf",
-            ],
-            "italic": [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf",
-                "/usr/local/share/fonts/DejaVuSans-Oblique.ttf",
-            ],
-        },
-        {
-            "family": "LiberationSans",
-            "regular": [
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-            ],
-            "bold": [
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-                "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf",
-            ],
-            "italic": [
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Italic.ttf",
-                "/usr/share/fonts/truetype/liberation2/LiberationSans-Italic.ttf",
-            ],
-        },
-    ]
-
-    for cand in candidates:
-        regular_path = _first(cand["regular"])
+    for cand in _FONT_CANDIDATES:
+        regular_path = _first_existing(cand["regular"])
         if not regular_path:
             continue
+        entry = {
+            "family": cand["family"],
+            "regular": regular_path,
+            "bold": _first_existing(cand["bold"]),
+            "italic": _first_existing(cand["italic"]),
+        }
         try:
-            family = cand["family"]
-            bold_name = f"{family}-Bold"
-            italic_name = f"{family}-Italic"
-
-            if family not in pdfmetrics.getRegisteredFontNames():
-                pdfmetrics.registerFont(TTFont(family, regular_path))
-
-            bold_path = _first(cand["bold"])
-            if bold_path and bold_name not in pdfmetrics.getRegisteredFontNames():
-                pdfmetrics.registerFont(TTFont(bold_name, bold_path))
-            else:
-                bold_name = family
-
-            italic_path = _first(cand["italic"])
-            if italic_path and italic_name not in pdfmetrics.getRegisteredFontNames():
-                pdfmetrics.registerFont(TTFont(italic_name, italic_path))
-            else:
-                italic_name = family
-
-            pdfmetrics.registerFontFamily(
-                family, normal=family, bold=bold_name, italic=italic_name, boldItalic=bold_name
-            )
-
-            FONT_FAMILY = family
-            FONT_REGULAR = family
-            FONT_BOLD = bold_name
-            FONT_ITALIC = italic_name
-            HAS_UNICODE_FONT = True
-            return
+            _register_family(**entry)
         except Exception:
             continue
+        _save_font_manifest(entry)
+        return
 
 
 # ── XML / Markdown helpers ───────────────────────────────────────────────
 
 
 def _markdown_to_xml(text: str) -> str:
-    if not isinstance(text, str):
-        text = json.dumps(text, ensure_ascii=False)
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    text = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", text)
-    text = re.sub(r"##\s*(.*?)\n", r"<b>\1</b><br/>", text)
+    """Convert Markdown-ish *text* to ReportLab paragraph XML (caller guarantees ``str``)."""
+    text = text.translate(_XML_ESCAPE_TABLE)
+    text = _BOLD_RE.sub(r"<b>\1</b>", text)
+    text = _HEADING_MD_RE.sub(r"<b>\1</b><br/>", text)
     lines = text.split("\n")
     processed = []
     for line in lines:
@@ -151,45 +217,76 @@ def _markdown_to_xml(text: str) -> str:
     return "<br/>".join(processed)
 
 
+def _markdown_to_xml_any(value: object) -> str:
+    """Like :func:`_markdown_to_xml` for LLM fields of unknown type (non-strings become JSON)."""
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    return _markdown_to_xml(value)
+
+
+def _md_hash(line: str, story: list, styles: dict) -> None:
+    if line.startswith("# "):
+        story.append(Paragraph(line[2:].strip(), styles["title"]))
+        story.append(Paragraph("---", styles["line_muted"]))
+        story.append(Spacer(1, 10))
+    elif line.startswith("## "):
+        story.append(Paragraph(line[3:].strip(), styles["header"]))
+    elif line.startswith("### "):
+        story.append(Paragraph(line[4:].strip(), styles["sub_header"]))
+    else:
+        _md_paragraph(line, story, styles)
+
+
+def _md_quote(line: str, story: list, styles: dict) -> None:
+    if line.startswith("> "):
+        text = line[2:].strip().strip('"')
+        story.append(Paragraph(f"<i>\u201c{text}\u201d</i>", styles["quote"]))
+    else:
+        _md_paragraph(line, story, styles)
+
+
+def _md_dash(line: str, story: list, styles: dict) -> None:
+    if line.startswith("- "):
+        _md_bullet(line, story, styles)
+    elif line == "---":
+        story.append(Spacer(1, 10))
+        story.append(Paragraph("---", styles["line_muted"]))
+        story.append(Spacer(1, 10))
+    else:
+        _md_paragraph(line, story, styles)
+
+
+def _md_star(line: str, story: list, styles: dict) -> None:
+    if line.startswith("* "):
+        _md_bullet(line, story, styles)
+    else:
+        _md_paragraph(line, story, styles)
+
+
+def _md_bullet(line: str, story: list, styles: dict) -> None:
+    text = _BOLD_RE.sub(r"<b>\1</b>", line[2:].strip())
+    story.append(Paragraph(f"&bull;  {text}", styles["body"]))
+
+
+def _md_paragraph(line: str, story: list, styles: dict) -> None:
+    text = _BOLD_RE.sub(r"<b>\1</b>", line)
+    text = _ITALIC_RE.sub(r"<i>\1</i>", text)
+    story.append(Paragraph(text, styles["body"]))
+
+
+# First-character dispatch: prose lines hit a single dict miss instead of six prefix checks
+_MD_LINE_HANDLERS = {"#": _md_hash, ">": _md_quote, "-": _md_dash, "*": _md_star}
+
+
 def _parse_markdown_lines(lines: list[str], story: list, styles: dict) -> None:
+    """Append flowables for *lines*, which the caller has already stripped."""
     for line in lines:
-        line = line.strip()
         if not line:
             story.append(Spacer(1, 6))
             continue
+        handler = _MD_LINE_HANDLERS.get(line[0], _md_paragraph)
         try:
-            if line.startswith("# "):
-                story.append(Paragraph(line[2:].strip(), styles["title"]))
-                story.append(
-                    Paragraph(
-                        "---",
-                        ParagraphStyle("Line", parent=styles["body"], alignment=TA_CENTER, textColor=colors.lightgrey),
-                    )
-                )
-                story.append(Spacer(1, 10))
-            elif line.startswith("## "):
-                story.append(Paragraph(line[3:].strip(), styles["header"]))
-            elif line.startswith("### "):
-                story.append(Paragraph(line[4:].strip(), styles["sub_header"]))
-            elif line.startswith("> "):
-                text = line[2:].strip().strip('"')
-                story.append(Paragraph(f"<i>\u201c{text}\u201d</i>", styles["quote"]))
-            elif line.startswith("- ") or line.startswith("* "):
-                text = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", line[2:].strip())
-                story.append(Paragraph(f"&bull;  {text}", styles["body"]))
-            elif line == "---":
-                story.append(Spacer(1, 10))
-                story.append(
-                    Paragraph(
-                        "---",
-                        ParagraphStyle("Line", parent=styles["body"], alignment=TA_CENTER, textColor=colors.lightgrey),
-                    )
-                )
-                story.append(Spacer(1, 10))
-            else:
-                text = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", line)
-                text = re.sub(r"\*(.*?)\*", r"<i>\1</i>", text)
-                story.append(Paragraph(text, styles["body"]))
+            handler(line, story, styles)
         except Exception:
             story.append(Paragraph(line, styles["body"]))
 
@@ -197,9 +294,15 @@ def _parse_markdown_lines(lines: list[str], story: list, styles: dict) -> None:
 # ── PDF styles ───────────────────────────────────────────────────────────
 
 
+@functools.lru_cache(maxsize=4)
 def _create_pdf_styles(font_regular: str, font_bold: str, font_italic: str) -> dict:
+    """Build the paragraph styles for one font triple.
+
+    Memoized: fonts only change once per process, and the styles are never
+    mutated by the builders, so every PDF can share the same dict.
+    """
     base = getSampleStyleSheet()
-    return {
+    styles = {
         "base": base,
         "title": ParagraphStyle(
             "CustomTitle",
@@ -264,6 +367,37 @@ def _create_pdf_styles(font_regular: str, font_bold: str, font_italic: str) -> d
         ),
     }
 
+    # Derived one-off styles, built once here instead of per line / per idea
+    body = styles["body"]
+    normal = base["Normal"]
+    styles.update(
+        {
+            "line": ParagraphStyle("Line", parent=body, alignment=TA_CENTER),
+            "line_muted": ParagraphStyle("Line", parent=body, alignment=TA_CENTER, textColor=colors.lightgrey),
+            "brand": ParagraphStyle("Brand", parent=normal, alignment=TA_CENTER, fontSize=10, textColor=colors.grey),
+            "sub_brand": ParagraphStyle(
+                "SubBrand", parent=normal, alignment=TA_CENTER, fontSize=9, textColor=colors.grey
+            ),
+            "sub_brand_small": ParagraphStyle(
+                "SubBrand", parent=normal, alignment=TA_CENTER, fontSize=8, textColor=colors.grey
+            ),
+            "author": ParagraphStyle("Author", parent=body, alignment=TA_CENTER, fontSize=12),
+            "quote_author": ParagraphStyle("QuoteAuthor", parent=body, alignment=TA_RIGHT, fontSize=10),
+            "idea_title": ParagraphStyle(
+                "IdeaTitle",
+                parent=base["Heading2"],
+                fontName=font_bold,
+                fontSize=14,
+                spaceBefore=6,
+                textColor=colors.darkblue,
+            ),
+            "ai_header": ParagraphStyle(
+                "AIHeader", parent=body, fontSize=10, textColor=colors.darkorange, spaceBefore=4
+            ),
+        }
+    )
+    return styles
+
 
 def _make_footer(font_regular: str, label: str = "Document Summary"):
     def _footer(canvas_obj, doc):
@@ -286,30 +420,31 @@ def _build_review_story(data: dict, styles: dict) -> list:
     genre = data.get("genre", "Book Review")
     category = data.get("category", "General")
     story.append(Spacer(1, 20))
-    story.append(
-        Paragraph(
-            "EXPERT BOOK REVIEW",
-            ParagraphStyle(
-                "Brand", parent=styles["base"]["Normal"], alignment=TA_CENTER, fontSize=10, textColor=colors.grey
-            ),
-        )
-    )
-    story.append(
-        Paragraph(
-            f"{category} | {genre}",
-            ParagraphStyle(
-                "SubBrand", parent=styles["base"]["Normal"], alignment=TA_CENTER, fontSize=9, textColor=colors.grey
-            ),
-        )
-    )
+    story.append(Paragraph("EXPERT BOOK REVIEW", styles["brand"]))
+    story.append(Paragraph(f"{category} | {genre}", styles["sub_brand"]))
     story.append(Spacer(1, 10))
-    _parse_markdown_lines(review_text.split("\n"), story, styles)
+    _parse_markdown_lines([ln.strip() for ln in review_text.split("\n")], story, styles)
     return story
 
 
+def _core_idea_block(idea: dict, styles: dict) -> KeepTogether:
+    """One deep-dive core idea: title, optional quote and commentary, divider."""
+    quote = idea.get("quote", "")
+    commentary = idea.get("commentary", "")
+    elements = [Paragraph(idea.get("title", "BIG IDEA").upper(), styles["idea_title"])]
+    if quote:
+        elements.append(Paragraph(f"<i>\u201c{quote}\u201d</i>", styles["quote"]))
+    if commentary:
+        elements += [
+            Paragraph("<b>\U0001f4a1 Key Insight:</b>", styles["ai_header"]),
+            Paragraph(_markdown_to_xml_any(commentary), styles["body"]),
+        ]
+    elements += [Spacer(1, 10), Paragraph("---", styles["line"]), Spacer(1, 10)]
+    return KeepTogether(elements)
+
+
 def _build_deep_dive_story(data: dict, styles: dict) -> list:
     story = []
-    base = styles["base"]
     body = styles["body"]
     metadata = data.get("metadata", {})
     doc_title = metadata.get("title", "BOOK SUMMARY")
@@ -317,34 +452,21 @@ def _build_deep_dive_story(data: dict, styles: dict) -> list:
     doc_slogan = metadata.get("slogan", "More Wisdom in Less Time")
 
     story.append(Spacer(1, 30))
-    story.append(
-        Paragraph(
-            "BOOK NOTES",
-            ParagraphStyle("Brand", parent=base["Normal"], alignment=TA_CENTER, fontSize=10, textColor=colors.grey),
-        )
-    )
-    story.append(
-        Paragraph(
-            "More Wisdom in Less Time",
-            ParagraphStyle("SubBrand", parent=base["Normal"], alignment=TA_CENTER, fontSize=8, textColor=colors.grey),
-        )
-    )
+    story.append(Paragraph("BOOK NOTES", styles["brand"]))
+    story.append(Paragraph("More Wisdom in Less Time", styles["sub_brand_small"]))
     story.append(Spacer(1, 15))
     story.append(Paragraph(doc_title.upper(), styles["title"]))
     story.append(Paragraph(doc_slogan, styles["slogan"]))
-    story.append(
-        Paragraph(f"<b>By {doc_author}</b>", ParagraphStyle("Author", parent=body, alignment=TA_CENTER, fontSize=12))
-    )
+    story.append(Paragraph(f"<b>By {doc_author}</b>", styles["author"]))
     story.append(Spacer(1, 15))
-    story.append(Paragraph("---", ParagraphStyle("Line", parent=body, alignment=TA_CENTER)))
+    story.append(Paragraph("---", styles["line"]))
 
     story.append(Paragraph("THE BIG IDEAS (CÁC Ý TƯỞNG LỚN)", styles["header"]))
     big_ideas = data.get("big_ideas", [])
     if isinstance(big_ideas, list):
-        for idea in big_ideas:
-            story.append(Paragraph(f"&bull; <b>{idea}</b>", body))
+        story.extend([Paragraph(f"&bull; <b>{idea}</b>", body) for idea in big_ideas])
     story.append(Spacer(1, 15))
-    story.append(Paragraph("---", ParagraphStyle("Line", parent=body, alignment=TA_CENTER)))
+    story.append(Paragraph("---", styles["line"]))
 
     intro_data = data.get("introduction", {})
     story.append(Paragraph("GIỚI THIỆU", styles["header"]))
@@ -353,45 +475,10 @@ def _build_deep_dive_story(data: dict, styles: dict) -> list:
     if intro_data.get("best_quote"):
         story.append(Spacer(1, 8))
         story.append(Paragraph(f"<i>\u201c{intro_data['best_quote']}\u201d</i>", styles["quote"]))
-        story.append(
-            Paragraph(
-                f"\u2014 {doc_author}", ParagraphStyle("QuoteAuthor", parent=body, alignment=TA_RIGHT, fontSize=10)
-            )
-        )
+        story.append(Paragraph(f"\u2014 {doc_author}", styles["quote_author"]))
     story.append(PageBreak())
 
-    for idea in data.get("core_ideas", []):
-        elements = []
-        title = idea.get("title", "BIG IDEA")
-        quote = idea.get("quote", "")
-        commentary = idea.get("commentary", "")
-        elements.append(
-            Paragraph(
-                title.upper(),
-                ParagraphStyle(
-                    "IdeaTitle",
-                    parent=base["Heading2"],
-                    fontName=FONT_BOLD,
-                    fontSize=14,
-                    spaceBefore=6,
-                    textColor=colors.darkblue,
-                ),
-            )
-        )
-        if quote:
-            elements.append(Paragraph(f"<i>\u201c{quote}\u201d</i>", styles["quote"]))
-        if commentary:
-            elements.append(
-                Paragraph(
-                    "<b>\U0001f4a1 Key Insight:</b>",
-                    ParagraphStyle("AIHeader", parent=body, fontSize=10, textColor=colors.darkorange, spaceBefore=4),
-                )
-            )
-            elements.append(Paragraph(_markdown_to_xml(commentary), body))
-        elements.append(Spacer(1, 10))
-        elements.append(Paragraph("---", ParagraphStyle("Line", parent=body, alignment=TA_CENTER)))
-        elements.append(Spacer(1, 10))
-        story.append(KeepTogether(elements))
+    story.extend([_core_idea_block(idea, styles) for idea in data.get("core_ideas", [])])
     story.append(PageBreak())
 
     story.append(Paragraph("ABOUT THE AUTHOR (VỀ TÁC GIẢ)", styles["header"]))
@@ -409,25 +496,26 @@ def _build_standard_story(data: dict, styles: dict) -> list:
     story.append(Spacer(1, 20))
     story.append(Paragraph(title, styles["title"]))
     story.append(Spacer(1, 20))
-    story.append(Paragraph("---", ParagraphStyle("Line", parent=body, alignment=TA_CENTER)))
+    story.append(Paragraph("---", styles["line"]))
     story.append(Paragraph("TỔNG QUAN", styles["header"]))
-    story.append(Paragraph(_markdown_to_xml(data.get("overview", "")), body))
+    story.append(Paragraph(_markdown_to_xml_any(data.get("overview", "")), body))
     story.append(Spacer(1, 10))
     story.append(Paragraph("ĐIỂM CHÍNH", styles["header"]))
     for point in data.get("key_points", []):
         story.append(Paragraph(f"&bull; {_markdown_to_xml(str(point))}", body))
     story.append(Spacer(1, 10))
     story.append(Paragraph("KẾT LUẬN", styles["header"]))
-    story.append(Paragraph(_markdown_to_xml(data.get("conclusion", "")), body))
+    story.append(Paragraph(_markdown_to_xml_any(data.get("conclusion", "")), body))
     return story
 
 
 # ── Public API ───────────────────────────────────────────────────────────
 
 
-def save_summary_to_pdf(summary_data: dict, output_filename: str = "summary.pdf") -> str:
-    """Render *summary_data* to a PDF file and return the absolute path."""
-    register_fonts()
+def _build_pdf(summary_data: dict, target: str | BinaryIO) -> None:
+    """Render *summary_data* into *target* (a path or a binary file object)."""
+    if not _fonts_probed:
+        register_fonts()  # eager registration disabled via settings.pdf_eager_fonts
     styles = _create_pdf_styles(FONT_REGULAR, FONT_BOLD, FONT_ITALIC)
     mode = summary_data.get("mode", "standard")
 
@@ -442,7 +530,7 @@ def save_summary_to_pdf(summary_data: dict, output_filename: str = "summary.pdf"
         footer_label = "Document Summary"
 
     doc = SimpleDocTemplate(
-        output_filename,
+        target,
         pagesize=A4,
         rightMargin=50,
         leftMargin=50,
@@ -454,4 +542,41 @@ def save_summary_to_pdf(summary_data: dict, output_filename: str = "summary.pdf"
         doc.build(story, onFirstPage=footer, onLaterPages=footer)
     except Exception as exc:
         raise ValueError(f"Lỗi tạo PDF: {exc}") from exc
+
+
+def save_summary_to_pdf(summary_data: dict, output_filename: str = "summary.pdf") -> str:
+    """Render *summary_data* to a PDF file and return the absolute path.
+
+    For in-memory output use :func:`render_summary_pdf`.
+    """
+    _build_pdf(summary_data, output_filename)
     return os.path.abspath(output_filename)
+
+
+def render_summary_pdf(summary_data: dict) -> bytes:
+    """Render *summary_data* in memory and return the PDF bytes (no temp file)."""
+    buf = io.BytesIO()
+    _build_pdf(summary_data, buf)
+    return buf.getvalue()
+
+
+def _save_item(item: tuple[dict, str]) -> str:
+    return save_summary_to_pdf(*item)
+
+
+def save_summaries_batch(items: list[tuple[dict, str]]) -> list[str]:
+    """Render many ``(summary_data, output_filename)`` pairs in parallel.
+
+    ReportLab builds are pure-Python and hold the GIL, so the work is spread
+    over processes rather than threads.  Returns absolute paths in input order.
+    """
+    workers = min(len(items), os.cpu_count() or 1)
+    if workers <= 1:
+        return [_save_item(item) for item in items]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=register_fonts) as pool:
+        return list(pool.map(_save_item, items))
+
+
+# Register fonts once per process so individual renders never pay for it
+if settings.pdf_eager_fonts:
+    register_fonts()
@@ -1,6 +1,11 @@
 """PPTX rendering — generate PowerPoint from structured JSON data.
 
 All python-pptx layout logic lives here.
+
+A template's slides are stripped before use.  The stripped package is kept
+per template digest, so regenerating with the same template skips loading
+and dropping its slide parts again.  A parsed ``Presentation`` is mutated
+by every run and cannot be shared, so the cache holds bytes.
 """
 
 from __future__ import annotations
@@ -9,6 +14,7 @@ import contextlib
 import io
 import math
 import re
+import threading
 from typing import Any
 
 from pptx import Presentation
@@ -17,8 +23,20 @@ from pptx.enum.shapes import PP_PLACEHOLDER
 from pptx.enum.text import MSO_ANCHOR, MSO_AUTO_SIZE, PP_ALIGN
 from pptx.util import Cm, Pt
 
+from app.core.llm_cache import file_digest
 from app.core.log import safe_print
 
+_SLIDE_PREFIX_RE = re.compile(r"^Slide\s+\d+[:.]?\s*", re.IGNORECASE)
+_BOLD_SPLIT_RE = re.compile(r"(\*\*.*?\*\*)")
+
+_TITLE_PLACEHOLDERS = frozenset((PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.SUBTITLE))
+_BODY_PLACEHOLDERS = frozenset((PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT))
+_HIGHLIGHT_RGB = RGBColor(0, 112, 192)
+
+_TEMPLATE_CACHE_SIZE = 8
+_cleared_templates: dict[str, bytes] = {}
+_templates_lock = threading.Lock()
+
 
 def create_pptx(
     json_data: dict[str, Any],
@@ -31,15 +49,10 @@ def create_pptx(
     # ── Load / create presentation ──────────────────────────────────────
     if template_pptx_bytes:
         try:
-            prs = Presentation(io.BytesIO(template_pptx_bytes))
+            prs = _open_template(template_pptx_bytes)
         except Exception as exc:
             safe_print(f"Template PPTX lỗi, dùng mặc định: {exc}")
             prs = Presentation()
-        # Clear existing slides from template
-        xml_slides = prs.slides._sldIdLst
-        for s in list(xml_slides):
-            prs.part.drop_rel(s.rId)
-            xml_slides.remove(s)
         safe_print(f"Template loaded and cleared. Remaining slides: {len(prs.slides)}")
     else:
         prs = Presentation()
@@ -74,7 +87,7 @@ def create_pptx(
         # --- Title ---
         if slide.shapes.title:
             raw_title = slide_data.get("title", "")
-            clean_title = re.sub(r"^Slide\s+\d+[:.]?\s*", "", raw_title, flags=re.IGNORECASE)
+            clean_title = _SLIDE_PREFIX_RE.sub("", raw_title)
             slide.shapes.title.text = clean_title
 
             font_size_pt = 36
@@ -89,9 +102,8 @@ def create_pptx(
             slide.shapes.title.width = prs.slide_width - Cm(2.0)
             slide.shapes.title.top = Cm(0.5)
 
-            avg_char_width = font_size_pt * 0.55
-            chars_per_line = slide.shapes.title.width.pt / avg_char_width
-            estimated_lines = max(1, math.ceil(len(clean_title) / chars_per_line))
+            chars_per_line = max(1, int(slide.shapes.title.width.pt / (font_size_pt * 0.55)))
+            estimated_lines = max(1, (len(clean_title) + chars_per_line - 1) // chars_per_line)
             title_height = Pt(estimated_lines * font_size_pt * 1.1)
             slide.shapes.title.height = title_height
 
@@ -128,22 +140,51 @@ def create_pptx(
 # ── Internal helpers ─────────────────────────────────────────────────────
 
 
+def _open_template(template_pptx_bytes: bytes):
+    """Open *template_pptx_bytes* with its existing slides removed."""
+    key = file_digest(template_pptx_bytes)
+    with _templates_lock:
+        cleared = _cleared_templates.get(key)
+    if cleared is not None:
+        return Presentation(io.BytesIO(cleared))
+
+    prs = Presentation(io.BytesIO(template_pptx_bytes))
+    xml_slides = prs.slides._sldIdLst
+    for s in list(xml_slides):
+        prs.part.drop_rel(s.rId)
+        xml_slides.remove(s)
+    buf = io.BytesIO()
+    prs.save(buf)
+    with _templates_lock:
+        if len(_cleared_templates) >= _TEMPLATE_CACHE_SIZE:
+            _cleared_templates.clear()
+        _cleared_templates[key] = buf.getvalue()
+    return prs
+
+
 def _find_body_shape(slide):
-    """Locate the best body placeholder on *slide*."""
-    candidates = []
+    """Locate the best body placeholder on *slide*.
+
+    Preference: BODY/OBJECT (returned on first hit) → idx 1 → any other
+    non-title placeholder → anything that isn't the title shape.
+    """
+    idx1_shape = None
+    other_shape = None
     for shape in slide.placeholders:
         pht = shape.placeholder_format.type
-        if pht in (PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE, PP_PLACEHOLDER.SUBTITLE):
+        if pht in _TITLE_PLACEHOLDERS:
             continue
-        if pht in (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT):
-            candidates.append((0, shape))
-        elif shape.placeholder_format.idx == 1:
-            candidates.append((1, shape))
-        else:
-            candidates.append((2, shape))
-    if candidates:
-        candidates.sort(key=lambda x: x[0])
-        return candidates[0][1]
+        if pht in _BODY_PLACEHOLDERS:
+            return shape
+        if shape.placeholder_format.idx == 1:
+            if idx1_shape is None:
+                idx1_shape = shape
+        elif other_shape is None:
+            other_shape = shape
+    if idx1_shape is not None:
+        return idx1_shape
+    if other_shape is not None:
+        return other_shape
     # Fallback: anything that isn't the title
     if len(slide.placeholders) > 1:
         for shape in slide.placeholders:
@@ -172,7 +213,8 @@ def _fill_body(prs, slide, body_shape, slide_data, title_height):
     MIN_FONT_SIZE = 10
     BASE_CAPACITY_AT_24PT = 300
 
-    total_text_len = sum(len(str(c)) for c in slide_data.get("content", []))
+    content = [c if isinstance(c, str) else str(c) for c in slide_data.get("content", [])]
+    total_text_len = sum(map(len, content))
     if total_text_len <= BASE_CAPACITY_AT_24PT:
         font_size_pt = MAX_FONT_SIZE
     else:
@@ -180,13 +222,15 @@ def _fill_body(prs, slide, body_shape, slide_data, title_height):
         font_size_pt = max(min(MAX_FONT_SIZE * math.sqrt(ratio), MAX_FONT_SIZE), MIN_FONT_SIZE)
 
     tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
-    tf.clear()
+    tf.clear()  # leaves exactly one empty paragraph
 
-    content = slide_data.get("content", [])
+    font_size = Pt(font_size_pt)
+    spacing = Pt(max(3, font_size_pt * 0.3))
+    first_p = tf.paragraphs[0]
     for i, item in enumerate(content):
-        p = tf.paragraphs[0] if i == 0 and len(tf.paragraphs) == 1 else tf.add_paragraph()
+        p = first_p if i == 0 else tf.add_paragraph()
         p.level = 0
-        parts = re.split(r"(\*\*.*?\*\*)", str(item))
+        parts = _BOLD_SPLIT_RE.split(item)
         for part in parts:
             if not part:
                 continue
@@ -194,10 +238,9 @@ def _fill_body(prs, slide, body_shape, slide_data, title_height):
             if part.startswith("**") and part.endswith("**"):
                 run.text = part[2:-2]
                 run.font.bold = True
-                run.font.color.rgb = RGBColor(0, 112, 192)
+                run.font.color.rgb = _HIGHLIGHT_RGB
             else:
                 run.text = part
-            run.font.size = Pt(font_size_pt)
-        spacing = max(3, font_size_pt * 0.3)
-        p.space_before = Pt(spacing)
-        p.space_after = Pt(spacing)
+            run.font.size = font_size
+        p.space_before = spacing
+        p.space_after = spacing
@@ -2,28 +2,60 @@
 
 from __future__ import annotations
 
-import contextlib
+import concurrent.futures
+import importlib.util
 import io
 import os
-import tempfile
 import warnings
+from collections.abc import Iterator
 
-import docx
-import ebooklib
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-from ebooklib import epub
+try:
+    from selectolax.lexbor import LexborHTMLParser
 
-warnings.filterwarnings("ignore", category=UserWarning, module="ebooklib")
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
 
+# lxml is not a declared dependency; use the stdlib parser when it is missing
+_BS4_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF bytes using pypdf."""
+# docx / ebooklib / bs4 are imported on first use, like pypdf, so
+# single-format workloads never pay for the other parsers.
+_warnings_initialized = False
+
+
+def _init_epub_warnings() -> None:
+    """Silence the ebooklib / bs4 warnings once, on the first EPUB."""
+    global _warnings_initialized
+
+    if _warnings_initialized:
+        return
+    from bs4 import XMLParsedAsHTMLWarning
+
+    warnings.filterwarnings("ignore", category=UserWarning, module="ebooklib")
+    warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+    _warnings_initialized = True
+
+
+def iter_text_from_pdf(file_bytes: bytes) -> Iterator[str]:
+    """Yield the text of each non-empty PDF page, one page at a time."""
     from pypdf import PdfReader
 
     reader = PdfReader(io.BytesIO(file_bytes))
-    pages = [p.extract_text() for p in reader.pages if p.extract_text()]
-    result = "\n\n".join(pages)
+    for page in reader.pages:
+        text = page.extract_text()
+        if text:
+            yield text
+
+
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    """Extract text from PDF bytes using pypdf."""
+    buf = io.StringIO()
+    for i, text in enumerate(iter_text_from_pdf(file_bytes)):
+        if i:
+            buf.write("\n\n")
+        buf.write(text)
+    result = buf.getvalue()
     if not result.strip():
         raise ValueError("PDF không chứa text (có thể là PDF dạng ảnh/scan). Hãy dùng Gemini provider.")
     return result
@@ -31,6 +63,8 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
 
 def extract_text_from_docx(file_bytes: bytes) -> str:
     """Extract text from DOCX bytes."""
+    import docx
+
     doc = docx.Document(io.BytesIO(file_bytes))
     result = "\n".join(p.text for p in doc.paragraphs)
     if not result.strip():
@@ -38,50 +72,95 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
     return result
 
 
+# Never part of the chapter text (CSS / JS must not reach the prompt)
+_NON_TEXT_TAGS = ("script", "style")
+
+
+def _parse_chapter(content: bytes) -> str:
+    """Return the visible body text of one EPUB HTML/XHTML document.
+
+    Uses selectolax (lexbor) when installed, otherwise BeautifulSoup (lxml if
+    available).
+    Both read ``<body>`` (the whole tree when there is none) without
+    ``<script>`` / ``<style>``, so they return the same text.
+    """
+    if HAS_SELECTOLAX:
+        tree = LexborHTMLParser(content)
+        tree.strip_tags(list(_NON_TEXT_TAGS))
+        node = tree.body or tree.root
+        return " ".join(node.text(separator=" ").split()) if node is not None else ""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, _BS4_PARSER)
+    for tag in soup(_NON_TEXT_TAGS):
+        tag.decompose()
+    return " ".join((soup.body or soup).stripped_strings)
+
+
 def extract_text_from_epub(file_bytes: bytes) -> str:
-    """Extract text from EPUB bytes (via temp file)."""
-    tmp_path = ""
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".epub") as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
-
-        book = epub.read_epub(tmp_path)
-        chunks: list[str] = []
-        for item in book.get_items():
-            is_doc = item.get_type() == ebooklib.ITEM_DOCUMENT
-            is_html = item.media_type and ("html" in item.media_type or "xml" in item.media_type)
-            if not (is_doc or is_html):
-                continue
-            content = item.get_content()
-            if not content:
-                continue
-            soup = BeautifulSoup(content, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
-            if len(text) > 50:
-                chunks.append(text)
-
-        result = "\n\n".join(chunks)
-        if not result.strip():
-            raise ValueError("EPUB không chứa text có thể trích xuất.")
-        return result
-    finally:
-        if tmp_path:
-            with contextlib.suppress(OSError):
-                os.remove(tmp_path)
+    """Extract text from EPUB bytes (read in-memory, no temp file).
+
+    Chapters are parsed concurrently; output order follows the book.
+    """
+    _init_epub_warnings()
+    import ebooklib
+    from ebooklib import epub
+
+    book = epub.read_epub(io.BytesIO(file_bytes))
+    contents: list[bytes] = []
+    for item in book.get_items():
+        is_doc = item.get_type() == ebooklib.ITEM_DOCUMENT
+        is_html = item.media_type and ("html" in item.media_type or "xml" in item.media_type)
+        if not (is_doc or is_html):
+            continue
+        content = item.get_content()
+        if content:
+            contents.append(content)
+
+    # A private pool: this already runs inside the shared executor, so
+    # fanning out there could starve it of workers.
+    workers = min(len(contents), os.cpu_count() or 1)
+    if workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="epub") as ex:
+            texts = list(ex.map(_parse_chapter, contents))
+    else:
+        texts = [_parse_chapter(c) for c in contents]
+
+    result = "\n\n".join(t for t in texts if len(t) > 50)
+    if not result.strip():
+        raise ValueError("EPUB không chứa text có thể trích xuất.")
+    return result
+
+
+# Upload types the extractors below handle: extension → MIME type.  Used to
+# reject other uploads before they are stored, and to fill in the type when
+# the browser reports none (common for EPUB).
+MIME_BY_EXTENSION = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".epub": "application/epub+zip",
+}
 
 
 def load_document(file_bytes: bytes, mime_type: str) -> str:
-    """Dispatch to the correct extractor based on *mime_type*."""
+    """Dispatch to the correct extractor based on *mime_type*.
+
+    *file_bytes* must be ``bytes``: ``io.BytesIO`` shares an immutable bytes
+    buffer without copying, but copies a ``bytearray`` or ``memoryview``.
+    """
+    if not isinstance(file_bytes, bytes):
+        raise TypeError(f"load_document expects bytes, got {type(file_bytes).__name__}")
     if not file_bytes:
         raise ValueError("File rỗng, không có dữ liệu.")
 
-    extractors = {
-        "application/pdf": extract_text_from_pdf,
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_text_from_docx,
-        "application/epub+zip": extract_text_from_epub,
-    }
-    fn = extractors.get(mime_type)
+    fn = _EXTRACTORS.get(mime_type)
     if fn is None:
         raise ValueError(f"Định dạng file không được hỗ trợ: {mime_type}")
     return fn(file_bytes)
+
+
+_EXTRACTORS = {
+    MIME_BY_EXTENSION[".pdf"]: extract_text_from_pdf,
+    MIME_BY_EXTENSION[".docx"]: extract_text_from_docx,
+    MIME_BY_EXTENSION[".epub"]: extract_text_from_epub,
+}
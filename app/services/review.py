@@ -5,25 +5,48 @@ Steps:
   2. Analyst    — deep analysis (fiction vs non-fiction prompt).
   3. Editor     — synthesise into formatted Markdown review.
 
-Supports resume via ``resume_state`` dict.
+Supports resume via ``resume_state`` dict.  Steps 1-2 do not depend on the
+output language, so their results are also kept per document and provider;
+re-running the same file in another language only repeats Step 3.  Progress
+can also be written to ``REVIEW_CHECKPOINT_DIR`` (opt-in) after each step,
+so a review interrupted by a crash or restart picks up where it stopped.
 """
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import functools
 import json
+import os
+import tempfile
+import threading
 from collections.abc import Callable
 
+from app.config import settings
 from app.core.json_parser import robust_json_parse
+from app.core.llm_cache import file_digest
 from app.core.log import safe_print
+from app.prompts.common import with_document_text
 from app.prompts.review import (
     PROMPT_REVIEW_ANALYST_FICTION,
     PROMPT_REVIEW_ANALYST_NON_FICTION,
     PROMPT_REVIEW_EDITOR,
     PROMPT_REVIEW_LIBRARIAN,
 )
+from app.providers.base import LLMProvider
 from app.providers.registry import get_provider, resolve_provider_keys
 from app.services.document import load_document
 
+# Providers that cannot read the uploaded file natively
+_TEXT_PROVIDERS = frozenset({"openai", "ollama"})
+
+# Completed Librarian + Analyst checkpoints, keyed by (document hash, provider)
+_CHECKPOINT_KEYS = ("librarian_data", "model1_name", "analyst_output", "model2_name")
+_CHECKPOINT_CACHE_SIZE = 16
+_checkpoints: dict[tuple[str, str], dict] = {}
+_checkpoints_lock = threading.Lock()
+
 
 class PartialCompletionError(Exception):
     """Raised when some (but not all) review steps completed successfully."""
@@ -33,6 +56,96 @@ class PartialCompletionError(Exception):
         self.partial_data = partial_data
 
 
+def _as_is(prompt_text: str) -> str:
+    return prompt_text
+
+
+class _BranchAbandoned(BaseException):
+    """Stops a speculative branch that is no longer needed.
+
+    A ``BaseException`` (like ``asyncio.CancelledError``), so the provider's
+    retry loop neither retries it nor reports it as a user cancel.
+    """
+
+
+def _cancel_either(cancel_check: Callable[[], bool] | None, abandoned: Callable[[], bool]) -> Callable[[], bool]:
+    """Cancel check for a speculative branch; raises ``_BranchAbandoned`` once it is abandoned."""
+
+    def check() -> bool:
+        if abandoned():
+            raise _BranchAbandoned
+        return cancel_check() if cancel_check is not None else False
+
+    return check
+
+
+def _abandon(branches: dict[str, tuple[concurrent.futures.Future, threading.Event]]) -> None:
+    """Stop speculative branches that are no longer needed."""
+    if branches:
+        safe_print("-> Speculative Analyst result discarded.")
+    for future, abandoned in branches.values():
+        abandoned.set()
+        future.cancel()
+    branches.clear()
+
+
+def _load_checkpoint(key: tuple[str, str]) -> dict:
+    with _checkpoints_lock:
+        return dict(_checkpoints.get(key, {}))
+
+
+def _store_checkpoint(key: tuple[str, str], state: dict) -> None:
+    with _checkpoints_lock:
+        if len(_checkpoints) >= _CHECKPOINT_CACHE_SIZE and key not in _checkpoints:
+            _checkpoints.clear()
+        _checkpoints[key] = {k: state[k] for k in _CHECKPOINT_KEYS}
+
+
+def _progress_path(key: tuple[str, str]) -> str | None:
+    directory = settings.review_checkpoint_dir
+    if not directory:
+        return None
+    return os.path.join(os.path.expanduser(directory), f"{key[0]}-{key[1]}.json")
+
+
+def _save_progress(key: tuple[str, str], state: dict) -> None:
+    """Persist the steps completed so far; failures are ignored (best-effort)."""
+    path = _progress_path(key)
+    if path is None:
+        return
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a crash never leaves a truncated checkpoint
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({k: state[k] for k in _CHECKPOINT_KEYS if k in state}, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+
+
+def _load_progress(key: tuple[str, str]) -> dict:
+    path = _progress_path(key)
+    if path is None:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _clear_progress(key: tuple[str, str]) -> None:
+    path = _progress_path(key)
+    if path is not None:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
 def review_book_syntopic(
     file_bytes: bytes,
     mime_type: str,
@@ -43,87 +156,158 @@ def review_book_syntopic(
     cancel_check: Callable[[], bool] | None = None,
     resume_state: dict | None = None,
     provider: str = "gemini",
+    speculative: bool | None = None,
+    stream_callback: Callable[[str], None] | None = None,
+    refresh_cache: bool = False,
 ) -> dict:
     """Execute the 3-step Syntopic Layered Analysis.
 
+    With ``speculative=True`` both Analyst variants run in parallel with the
+    Librarian and the mismatched one is abandoned — lower latency for one
+    extra (discarded) LLM call.  ``None`` follows ``REVIEW_SPECULATIVE``.
+
+    Without ``resume_state``, Steps 1-2 are reused from an earlier run on the
+    same file and provider (in memory, or from an on-disk checkpoint left by
+    an interrupted run), so only the remaining steps run.  *refresh_cache*
+    skips that reuse and the Librarian's LLM cache entry.
+
+    *stream_callback* receives the Editor's Markdown as it is generated, on
+    providers that can stream.
+
     Returns dict with ``mode='syntopic_review'`` on success.
     Raises ``PartialCompletionError`` with checkpoint data if a step fails.
     """
     keys = resolve_provider_keys(provider, api_key, api_keys)
-    state = dict(resume_state) if resume_state else {}
+    doc_key = (file_digest(file_bytes), provider) if file_bytes else None
+    if resume_state:
+        state = dict(resume_state)
+    elif refresh_cache or not doc_key:
+        state = {}
+    else:
+        state = _load_checkpoint(doc_key) or _load_progress(doc_key)
+        if state:
+            safe_print("Reusing saved Librarian/Analyst results for this document.")
 
-    def _make_llm():
+    @functools.cache
+    def _make_llm() -> LLMProvider:
+        """One provider for all steps, so their calls share SDK clients."""
         return get_provider(
             provider,
             api_keys=keys,
             base_url=keys[0] if provider == "ollama" and keys and keys[0].startswith("http") else None,
         )
 
-    def _prepare_prompt(prompt_text: str) -> str:
-        """Prepend document text for text-only providers."""
-        if provider in ("openai", "ollama") and file_bytes and mime_type:
-            doc_text = load_document(file_bytes, mime_type)
-            return f"Nội dung tài liệu:\n{doc_text}\n\n{prompt_text}"
-        return prompt_text
+    @functools.cache
+    def _document_text() -> str:
+        """Extract the document once; Steps 1 and 2 share the result."""
+        return load_document(file_bytes, mime_type)
 
-    # ── Step 1: Librarian ───────────────────────────────────────────────
-    librarian_data = state.get("librarian_data")
-    model1 = state.get("model1_name", "skipped")
+    def _with_document(prompt_text: str) -> str:
+        return with_document_text(_document_text(), prompt_text)
+
+    # Text-only providers need the document inlined; decided once per review.
+    # Extraction itself stays lazy so a resume that skips Steps 1-2 never parses.
+    needs_doc_text = provider in _TEXT_PROVIDERS and bool(file_bytes) and bool(mime_type)
+    _prepare_prompt: Callable[[str], str] = _with_document if needs_doc_text else _as_is
 
-    if not librarian_data:
+    def _run_librarian() -> tuple[dict, str]:
+        resp, model = _make_llm().generate(
+            system="",
+            prompt=_prepare_prompt(PROMPT_REVIEW_LIBRARIAN),
+            cancel_check=cancel_check,
+            response_format_json=True,
+            temperature=0.3,
+            refresh_cache=refresh_cache,
+            file_bytes=file_bytes if provider == "gemini" else None,
+            mime_type=mime_type if provider == "gemini" else None,
+        )
         try:
-            safe_print("Step 1: Librarian Agent (Classifying)...")
-            llm = _make_llm()
-            resp, model1 = llm.generate(
-                system="",
-                prompt=_prepare_prompt(PROMPT_REVIEW_LIBRARIAN),
-                cancel_check=cancel_check,
-                response_format_json=True,
-                temperature=0.3,
-                file_bytes=file_bytes if provider == "gemini" else None,
-                mime_type=mime_type if provider == "gemini" else None,
-            )
-            try:
-                librarian_data = robust_json_parse(resp)
-            except Exception:
-                librarian_data = {"category": "Non-Fiction", "genre": "General"}
-                safe_print("-> Librarian JSON parse failed. Defaulting.")
-            state["librarian_data"] = librarian_data
-            state["model1_name"] = model1
-            safe_print(f"-> Classified: {librarian_data.get('category')} / {librarian_data.get('genre')}")
-        except Exception as exc:
-            raise PartialCompletionError(f"Lỗi ở Bước 1 (Librarian): {exc}", state) from exc
-    else:
-        safe_print("Skipping Step 1 (Already Done).")
+            parsed = robust_json_parse(resp)
+        except Exception:
+            parsed = None
+        if not isinstance(parsed, dict):
+            parsed = {"category": "Non-Fiction", "genre": "General"}
+            safe_print("-> Librarian JSON parse failed. Defaulting.")
+        return parsed, model
+
+    def _run_analyst(prompt: str, check: Callable[[], bool] | None) -> tuple[str, str]:
+        return _make_llm().generate(
+            system="",
+            prompt=prompt,
+            cancel_check=check,
+            response_format_json=False,
+            temperature=0.6,
+            file_bytes=file_bytes if provider == "gemini" else None,
+            mime_type=mime_type if provider == "gemini" else None,
+        )
 
-    # ── Step 2: Analyst ─────────────────────────────────────────────────
+    librarian_data = state.get("librarian_data")
+    model1 = state.get("model1_name", "skipped")
     analyst_output = state.get("analyst_output")
     model2 = state.get("model2_name", "skipped")
 
-    if not analyst_output:
-        try:
-            safe_print("Step 2: Analyst Agent (Deep Analysis)...")
-            prompt_analyst = (
-                PROMPT_REVIEW_ANALYST_FICTION
-                if librarian_data.get("category") == "Fiction"
-                else PROMPT_REVIEW_ANALYST_NON_FICTION
-            )
-            llm = _make_llm()
-            analyst_output, model2 = llm.generate(
-                system="",
-                prompt=_prepare_prompt(prompt_analyst),
-                cancel_check=cancel_check,
-                response_format_json=False,
-                temperature=0.6,
-                file_bytes=file_bytes if provider == "gemini" else None,
-                mime_type=mime_type if provider == "gemini" else None,
+    if speculative is None:
+        speculative = settings.review_speculative
+
+    # Speculation: start both Analyst variants alongside the Librarian and keep
+    # whichever matches the classification.  A private pool, because this
+    # function already runs on the shared executor.
+    pool: concurrent.futures.ThreadPoolExecutor | None = None
+    branches: dict[str, tuple[concurrent.futures.Future, threading.Event]] = {}
+    if speculative and not librarian_data and not analyst_output:
+        safe_print("Step 2: Analyst Agent (speculative, both variants)...")
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="review-analyst")
+        for prompt_analyst in (PROMPT_REVIEW_ANALYST_FICTION, PROMPT_REVIEW_ANALYST_NON_FICTION):
+            abandoned = threading.Event()
+            future = pool.submit(
+                _run_analyst, _prepare_prompt(prompt_analyst), _cancel_either(cancel_check, abandoned.is_set)
             )
-            state["analyst_output"] = analyst_output
-            state["model2_name"] = model2
-        except Exception as exc:
-            raise PartialCompletionError(f"Lỗi ở Bước 2 (Analyst): {exc}", state) from exc
-    else:
-        safe_print("Skipping Step 2 (Already Done).")
+            branches[prompt_analyst] = (future, abandoned)
+
+    try:
+        # ── Step 1: Librarian ───────────────────────────────────────────
+        if not librarian_data:
+            try:
+                safe_print("Step 1: Librarian Agent (Classifying)...")
+                librarian_data, model1 = _run_librarian()
+                state["librarian_data"] = librarian_data
+                state["model1_name"] = model1
+                if doc_key:
+                    _save_progress(doc_key, state)
+                safe_print(f"-> Classified: {librarian_data.get('category')} / {librarian_data.get('genre')}")
+            except Exception as exc:
+                raise PartialCompletionError(f"Lỗi ở Bước 1 (Librarian): {exc}", state) from exc
+        else:
+            safe_print("Skipping Step 1 (Already Done).")
+
+        # ── Step 2: Analyst ─────────────────────────────────────────────
+        if not analyst_output:
+            try:
+                prompt_analyst = (
+                    PROMPT_REVIEW_ANALYST_FICTION
+                    if librarian_data.get("category") == "Fiction"
+                    else PROMPT_REVIEW_ANALYST_NON_FICTION
+                )
+                if branches:
+                    future, _ = branches.pop(prompt_analyst)
+                    _abandon(branches)
+                    analyst_output, model2 = future.result()
+                else:
+                    safe_print("Step 2: Analyst Agent (Deep Analysis)...")
+                    analyst_output, model2 = _run_analyst(_prepare_prompt(prompt_analyst), cancel_check)
+                state["analyst_output"] = analyst_output
+                state["model2_name"] = model2
+                if doc_key:
+                    _store_checkpoint(doc_key, state)
+                    _save_progress(doc_key, state)
+            except Exception as exc:
+                raise PartialCompletionError(f"Lỗi ở Bước 2 (Analyst): {exc}", state) from exc
+        else:
+            safe_print("Skipping Step 2 (Already Done).")
+    finally:
+        if pool is not None:
+            _abandon(branches)
+            pool.shutdown(wait=False, cancel_futures=True)
 
     # ── Step 3: Editor ──────────────────────────────────────────────────
     safe_print(f"Step 3: Editor Agent (Writing Review in {language})...")
@@ -140,10 +324,13 @@ def review_book_syntopic(
             cancel_check=cancel_check,
             response_format_json=False,
             temperature=0.6,
+            stream_callback=stream_callback,
         )
     except Exception as exc:
         raise PartialCompletionError(f"Lỗi ở Bước 3 (Editor): {exc}", state) from exc
 
+    if doc_key:
+        _clear_progress(doc_key)
     safe_print("Syntopic Review Completed.")
     return {
         "mode": "syntopic_review",
@@ -1,14 +1,25 @@
 """Slide generation service — analyse document → JSON slide data.
 
 Orchestrates: provider.generate() + prompt assembly + JSON parsing.
+
+With ``SLIDE_RESULT_CACHE`` enabled, the parsed outline is memoised per
+(document digest, mime, provider, detail level, instructions), so pressing
+*Generate* again after changing only unrelated inputs skips the LLM call.
+The generation temperature (0.7) is above the LLM cache ceiling, so this is
+opt-in: a re-run otherwise yields a fresh variation.
 """
 
 from __future__ import annotations
 
+import copy
+import threading
 from collections.abc import Callable
 
+from app.config import settings
 from app.core.json_parser import robust_json_parse
+from app.core.llm_cache import file_digest
 from app.core.log import safe_print, timed
+from app.prompts.common import with_document_text
 from app.prompts.slide import (
     DETAIL_MODE_INSTRUCTION,
     OVERVIEW_MODE_INSTRUCTION,
@@ -18,6 +29,10 @@ from app.prompts.slide import (
 from app.providers.registry import get_provider, resolve_provider_keys
 from app.services.document import load_document
 
+_RESULT_CACHE_SIZE = 16
+_results: dict[tuple[str, str, str, str, str], dict] = {}
+_results_lock = threading.Lock()
+
 
 def analyze_document(
     file_bytes: bytes,
@@ -29,11 +44,24 @@ def analyze_document(
     user_instructions: str = "",
     cancel_check: Callable[[], bool] | None = None,
     provider: str = "gemini",
+    refresh_cache: bool = False,
 ) -> dict:
-    """Analyse a document and return structured slide JSON."""
+    """Analyse a document and return structured slide JSON.
+
+    *refresh_cache* ignores a memoised outline and stores the new one.
+    """
 
     keys = resolve_provider_keys(provider, api_key, api_keys)
 
+    cache_key = None
+    if settings.slide_result_cache:
+        cache_key = (file_digest(file_bytes), mime_type, provider, detail_level, user_instructions)
+        with _results_lock:
+            hit = None if refresh_cache else _results.get(cache_key)
+        if hit is not None:
+            safe_print("Reusing slide outline from an identical earlier run.")
+            return copy.deepcopy(hit)
+
     # Build final system instruction
     mode_block = DETAIL_MODE_INSTRUCTION if detail_level == "Chi tiết" else OVERVIEW_MODE_INSTRUCTION
     custom_block = build_custom_instruction_block(user_instructions)
@@ -43,11 +71,9 @@ def analyze_document(
 
     # For text-only providers, pre-extract document text
     full_prompt = f"Hãy phân tích tài liệu này và tạo cấu trúc bài thuyết trình ({detail_level})."
-    extra_text = ""
     if provider in ("openai", "ollama") and file_bytes and mime_type:
         try:
-            extra_text = load_document(file_bytes, mime_type)
-            full_prompt = f"Nội dung tài liệu:\n{extra_text}\n\n{full_prompt}"
+            full_prompt = with_document_text(load_document(file_bytes, mime_type), full_prompt)
         except Exception as exc:
             raise ValueError(f"Không thể đọc tài liệu: {exc}") from exc
 
@@ -88,4 +114,9 @@ def analyze_document(
             else:
                 slide["content"] = ["(Nội dung chưa được trích xuất)"]
 
+    if cache_key is not None:
+        with _results_lock:
+            if len(_results) >= _RESULT_CACHE_SIZE and cache_key not in _results:
+                _results.clear()
+            _results[cache_key] = copy.deepcopy(parsed)
     return parsed
@@ -10,6 +10,7 @@ from collections.abc import Callable
 
 from app.core.json_parser import robust_json_parse
 from app.core.log import request_context, safe_print, timed
+from app.prompts.common import with_document_text
 from app.prompts.summary import (
     PROMPT_DEEP_DIVE_FULL,
     PROMPT_SUMMARIZE_DOCUMENT,
@@ -28,20 +29,25 @@ def summarize_document(
     user_instructions: str = "",
     cancel_check: Callable[[], bool] | None = None,
     provider: str = "gemini",
+    refresh_cache: bool = False,
 ) -> dict:
-    """Standard document summarisation → dict with mode='standard'."""
+    """Standard document summarisation → dict with mode='standard'.
+
+    *refresh_cache* bypasses a cached answer for an identical request.
+    """
 
     keys = resolve_provider_keys(provider, api_key, api_keys)
 
     with request_context() as rid:
         safe_print(f"[{rid}] Starting standard summarisation (provider={provider})")
 
-    full_prompt = f"{PROMPT_SUMMARIZE_DOCUMENT}\n{user_instructions}"
+    prompt_parts = (PROMPT_SUMMARIZE_DOCUMENT, "\n", user_instructions)
 
     # Pre-extract text for text-only providers
     if provider in ("openai", "ollama") and file_bytes and mime_type:
-        doc_text = load_document(file_bytes, mime_type)
-        full_prompt = f"Nội dung tài liệu:\n{doc_text}\n\n{full_prompt}"
+        full_prompt = with_document_text(load_document(file_bytes, mime_type), *prompt_parts)
+    else:
+        full_prompt = "".join(prompt_parts)
 
     llm = get_provider(
         provider,
@@ -58,6 +64,7 @@ def summarize_document(
             temperature=0.4,
             file_bytes=file_bytes if provider == "gemini" else None,
             mime_type=mime_type if provider == "gemini" else None,
+            refresh_cache=refresh_cache,
         )
 
     data = robust_json_parse(response_text)
@@ -83,6 +90,7 @@ def summarize_book_deep_dive(
     api_keys: list[str] | None = None,
     cancel_check: Callable[[], bool] | None = None,
     provider: str = "gemini",
+    refresh_cache: bool = False,
 ) -> dict:
     """Deep-dive 'Big Ideas' summarisation → dict with mode='deep_dive'."""
 
@@ -90,8 +98,7 @@ def summarize_book_deep_dive(
 
     prompt = PROMPT_DEEP_DIVE_FULL
     if provider in ("openai", "ollama") and file_bytes and mime_type:
-        doc_text = load_document(file_bytes, mime_type)
-        prompt = f"Nội dung tài liệu:\n{doc_text}\n\n{prompt}"
+        prompt = with_document_text(load_document(file_bytes, mime_type), prompt)
 
     llm = get_provider(
         provider,
@@ -108,6 +115,7 @@ def summarize_book_deep_dive(
             temperature=0.4,
             file_bytes=file_bytes if provider == "gemini" else None,
             mime_type=mime_type if provider == "gemini" else None,
+            refresh_cache=refresh_cache,
         )
 
     data = robust_json_parse(response_text)
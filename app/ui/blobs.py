@@ -0,0 +1,174 @@
+"""Server-side store for uploaded and generated file bytes.
+
+Mesop serialises every ``State`` field to the browser on each update, so
+megabyte uploads and outputs kept in state are shipped back and forth with
+every render.  The bytes live here instead and ``State`` only carries a
+short token.  The store is per process, which matches the single-process
+``mesop`` server.
+
+Blobs larger than ``_SPILL_BYTES`` are written to a temp file and read back
+on demand, so idle sessions holding big uploads do not pin them in memory
+for the whole TTL.  Expired blobs are swept on every store access, and any
+files still spilled are removed when the process exits.
+
+Generated files are served as base64 ``data:`` URIs.  :func:`encode_blob`
+lets the worker thread that produced a file encode it too, so the page
+render only picks the text up with :func:`get_blob_b64`.  The text stays
+with its blob and is freed together with it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import secrets
+import tempfile
+import threading
+import time
+
+try:
+    # SIMD (SSSE3/AVX2) kernels; returns str directly, skipping the ASCII decode copy
+    from pybase64 import b64encode_as_string
+
+    HAS_PYBASE64 = True
+except ImportError:
+    from base64 import b64encode
+
+    HAS_PYBASE64 = False
+
+    def b64encode_as_string(data: bytes) -> str:
+        # Encoding in chunks and joining would not lower the peak: the str
+        # parts plus the joined result are as large as bytes plus str here.
+        return b64encode(data).decode("ascii")
+
+
+_BLOB_TTL = 6 * 3600.0
+# Upload, template, deck and PDF.  The cap is per session so one busy
+# session never evicts another session's live upload.
+_MAX_BLOBS_PER_SESSION = 4
+_SPILL_BYTES = 8 * 1024 * 1024
+
+# token → (data, spill path, stored_at, session); data is b"" once spilled.
+# Insertion order doubles as age order.
+_blobs: dict[str, tuple[bytes, str, float, str]] = {}
+# token → base64 text of the blob, dropped with it
+_encoded: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def put_blob(data: bytes, session: str = "") -> str:
+    """Store *data* for *session* and return the token that retrieves it.
+
+    Blobs expire after ``_BLOB_TTL``; beyond that only *session*'s own
+    oldest blob is dropped when it exceeds ``_MAX_BLOBS_PER_SESSION``.
+    """
+    token = secrets.token_urlsafe(16)
+    path = _spill(data) if len(data) > _SPILL_BYTES else ""
+    now = time.monotonic()
+    with _lock:
+        _evict(now)
+        if session:
+            owned = [t for t, entry in _blobs.items() if entry[3] == session]
+            for old in owned[: max(0, len(owned) - _MAX_BLOBS_PER_SESSION + 1)]:
+                _drop(old)
+        _blobs[token] = (b"" if path else data, path, now, session)
+    return token
+
+
+def get_blob(token: str) -> bytes:
+    """Return the bytes for *token*, or ``b""`` if unknown or expired."""
+    if not token:
+        return b""
+    with _lock:
+        _evict(time.monotonic())
+        entry = _blobs.get(token)
+    if entry is None:
+        return b""
+    data, path = entry[0], entry[1]
+    if not path:
+        return data
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return b""
+
+
+def discard_blob(token: str) -> None:
+    """Drop *token*'s bytes early (e.g. when the user replaces the file)."""
+    with _lock:
+        _evict(time.monotonic())
+        _drop(token)
+
+
+def encode_blob(token: str) -> None:
+    """Base64-encode *token*'s bytes now; meant for a worker thread."""
+    data = get_blob(token)
+    if not data:
+        return
+    text = b64encode_as_string(data)
+    with _lock:
+        if token in _blobs:  # not discarded meanwhile
+            _encoded[token] = text
+
+
+def get_blob_b64(token: str) -> str:
+    """Return *token*'s bytes as base64, encoding them on first use.
+
+    The text is kept with the blob, so later renders reuse it until the blob
+    is discarded or expires.
+    """
+    with _lock:
+        text = _encoded.get(token)
+    if text is None:
+        encode_blob(token)
+        with _lock:
+            text = _encoded.get(token)
+    return text or ""
+
+
+def _spill(data: bytes) -> str:
+    """Write *data* to a private temp file; ``""`` keeps it in memory on failure."""
+    try:
+        fd, path = tempfile.mkstemp(prefix="createslide-blob-")
+    except OSError:
+        return ""
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        return ""
+    return path
+
+
+def _remove_file(entry: tuple[bytes, str, float, str]) -> None:
+    if entry[1]:
+        with contextlib.suppress(OSError):
+            os.remove(entry[1])
+
+
+def _drop(token: str) -> None:
+    # Called with _lock held
+    _encoded.pop(token, None)
+    entry = _blobs.pop(token, None)
+    if entry is not None:
+        _remove_file(entry)
+
+
+def _evict(now: float) -> None:
+    # Called with _lock held
+    for token in [t for t, entry in _blobs.items() if now - entry[2] > _BLOB_TTL]:
+        _drop(token)
+
+
+def _drop_all() -> None:
+    """Remove every blob, deleting spilled files; registered to run at exit."""
+    with _lock:
+        for token in list(_blobs):
+            _drop(token)
+
+
+atexit.register(_drop_all)
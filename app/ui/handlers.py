@@ -6,32 +6,43 @@ v2.1 — Async optimisations:
   • Shared ``ThreadPoolExecutor`` (bounded, reused across requests)
   • Per-request ``CancelToken`` (safe under concurrent users)
   • ``run_in_executor`` helper for clean ``await`` syntax
+  • ``await_cancellable`` — event-driven wait on jobs and cancel, no polling
+  • Streamed review text shown live (``streaming_preview``) on Ollama
+  • Uploads and generated files kept server-side (``app.ui.blobs``);
+    state holds only tokens
   • PDF/PPTX rendering offloaded to thread pool
+  • One pipeline (``_run_ai_job``) behind all four generation buttons
 """
 
 from __future__ import annotations
 
 import asyncio
-import base64
-import contextlib
+import functools
 import logging
 import os
 import re
-import tempfile
+import uuid
+from collections.abc import Callable
 
 import mesop as me
 
 from app.config import settings
-from app.core.cancellation import CancelToken, clear_cancel_signal, set_cancel_signal
-from app.core.executor import get_executor, run_in_executor
+from app.core.cancellation import CancelToken
+from app.core.executor import CANCELLED, await_cancellable, get_executor, run_in_executor
 from app.core.log import safe_print
+from app.providers import clear_provider_cache
 from app.providers.ollama import OllamaProvider
-from app.rendering.pdf import save_summary_to_pdf
-from app.rendering.pptx import create_pptx
+from app.rendering.pdf import render_summary_pdf
+from app.services.document import MIME_BY_EXTENSION
 from app.services.review import PartialCompletionError, review_book_syntopic
 from app.services.slide import analyze_document
 from app.services.summary import summarize_book_deep_dive, summarize_document
-from app.ui.state import State
+from app.ui.blobs import discard_blob, encode_blob, get_blob, put_blob
+from app.ui.state import ProcStatus, State
+
+_SUPPORTED_MIME_TYPES = frozenset(MIME_BY_EXTENSION.values())
+_KEY_SPLIT_RE = re.compile(r"[,\n\r]+")
+_SAFE_NAME_RE = re.compile(r"[^\w\s\-.]")
 
 # ── Lifecycle ────────────────────────────────────────────────────────────
 
@@ -40,10 +51,10 @@ def on_load(e: me.LoadEvent) -> None:
     me.set_theme_mode("system")
     state = me.state(State)
     state.error_message = ""
-    state.processing_status = "idle"
+    state.processing_status = ProcStatus.IDLE
     if state.logs is None:
         state.logs = []
-    state.logs.append("Hệ thống đã khởi động. Sẵn sàng xử lý.")
+    _log(state, "Hệ thống đã khởi động. Sẵn sàng xử lý.")
 
     # Auto-detect provider
     if not state.ai_provider:
@@ -52,21 +63,54 @@ def on_load(e: me.LoadEvent) -> None:
             ollama = OllamaProvider(base_url=ollama_url)
             if ollama.check_connectivity():
                 state.ai_provider = "ollama"
-                state.logs.append("🟢 Auto-detected Ollama server. Sử dụng Local LLM (miễn phí).")
+                _log(state, "🟢 Auto-detected Ollama server. Sử dụng Local LLM (miễn phí).")
             elif os.environ.get("GOOGLE_API_KEY"):
                 state.ai_provider = "gemini"
             else:
                 state.ai_provider = "ollama"
-                state.logs.append("⚠️ Ollama server không phản hồi. Kiểm tra server đang chạy chưa.")
+                _log(state, "⚠️ Ollama server không phản hồi. Kiểm tra server đang chạy chưa.")
         elif os.environ.get("GOOGLE_API_KEY"):
             state.ai_provider = "gemini"
-            state.logs.append("🔑 Sử dụng Google Gemini API.")
+            _log(state, "🔑 Sử dụng Google Gemini API.")
         elif os.environ.get("OPENAI_API_KEY"):
             state.ai_provider = "openai"
-            state.logs.append("🔑 Sử dụng OpenAI API.")
+            _log(state, "🔑 Sử dụng OpenAI API.")
         else:
             state.ai_provider = "ollama"
-            state.logs.append("⚠️ Không tìm thấy API Key. Mặc định dùng Ollama (Local LLM).")
+            _log(state, "⚠️ Không tìm thấy API Key. Mặc định dùng Ollama (Local LLM).")
+
+
+# Older lines are dropped so each re-render serialises a bounded list
+_MAX_LOG_LINES = 200
+
+
+def _log(state: State, *lines: str) -> None:
+    """Append *lines* to the on-screen log, keeping only the newest entries.
+
+    Mutate ``state.logs`` in place rather than reassigning it: Mesop diffs
+    state against the previous render, so an append reaches the browser as
+    an ``iterable_item_added`` delta, not the whole list.
+    """
+    state.logs.extend(lines)
+    if len(state.logs) > _MAX_LOG_LINES:
+        del state.logs[:-_MAX_LOG_LINES]
+
+
+# Seconds between preview re-renders while a streamed step runs
+_PREVIEW_INTERVAL = 0.5
+
+
+async def _stream_preview(state: State, waiter: asyncio.Future, chunks: list[str]):
+    """Yield a re-render whenever new streamed text arrived, until *waiter* finishes."""
+    shown = 0
+    while not waiter.done():
+        await asyncio.wait({waiter}, timeout=_PREVIEW_INTERVAL)
+        # *chunks* is appended from the worker thread; read a stable prefix
+        count = len(chunks)
+        if count != shown:
+            shown = count
+            state.streaming_preview = "".join(chunks[:count])
+            yield
 
 
 # ── Simple input handlers ────────────────────────────────────────────────
@@ -75,16 +119,25 @@ def on_load(e: me.LoadEvent) -> None:
 def handle_upload(event: me.UploadEvent) -> None:
     state = me.state(State)
     file = event.file
-    file_bytes = file.read()
-    size_mb = len(file_bytes) / (1024 * 1024)
+    # Reject on the reported type and size before touching the payload
+    mime_type = file.mime_type
+    if mime_type not in _SUPPORTED_MIME_TYPES:
+        mime_type = MIME_BY_EXTENSION.get(os.path.splitext(file.name)[1].lower(), "")
+    if not mime_type:
+        state.error_message = f"Định dạng file không được hỗ trợ: {file.name}. Chỉ nhận PDF, DOCX, EPUB."
+        return
+    size_mb = (file.size or len(file.getvalue())) / (1024 * 1024)
     if size_mb > settings.max_upload_size_mb:
         state.error_message = f"File quá lớn ({size_mb:.1f} MB). Giới hạn: {settings.max_upload_size_mb} MB."
         return
-    state.uploaded_file_bytes = file_bytes
-    state.uploaded_mime_type = file.mime_type
+    # A full read of a fresh BytesIO returns its own bytes object, not a copy;
+    # keep it as bytes so every extractor can wrap it zero-copy.
+    discard_blob(state.uploaded_file_token)
+    state.uploaded_file_token = put_blob(file.read(), _session_id(state))
+    state.uploaded_mime_type = mime_type
     state.uploaded_filename = file.name
     state.logs = [f"Đã tải lên: {file.name}", "System: Console Output Suppressed (v3)"]
-    state.processing_status = "ready"
+    state.processing_status = ProcStatus.READY
     state.error_message = ""
 
 
@@ -94,19 +147,45 @@ def handle_topic_input(e: me.InputEvent) -> None:
 
 def handle_template_upload(event: me.UploadEvent) -> None:
     state = me.state(State)
-    state.template_file_bytes = event.file.read()
+    discard_blob(state.template_file_token)
+    state.template_file_token = put_blob(event.file.read(), _session_id(state))
     state.template_filename = event.file.name
-    state.logs.append(f"Đã tải lên mẫu: {event.file.name}")
+    _log(state, f"Đã tải lên mẫu: {event.file.name}")
 
 
 def on_detail_change(e: me.CheckboxChangeEvent) -> None:
     me.state(State).is_detailed = e.checked
 
 
+def on_force_refresh_change(e: me.CheckboxChangeEvent) -> None:
+    me.state(State).force_refresh = e.checked
+
+
 def on_multi_key_change(e: me.CheckboxChangeEvent) -> None:
     me.state(State).use_multi_key = e.checked
 
 
+def toggle_full_logs(e: me.ClickEvent) -> None:
+    state = me.state(State)
+    state.show_full_logs = not state.show_full_logs
+
+
+def reset_status(e: me.ClickEvent) -> None:
+    """Leave the result view ("Create Another" / "Start Over").
+
+    The finished file is only reachable from that view, so its bytes are
+    dropped now instead of waiting out the blob TTL.  Memoized providers go
+    too, so no SDK client outlives the session that last used it.
+    """
+    state = me.state(State)
+    state.processing_status = ProcStatus.IDLE
+    discard_blob(state.pptx_token)
+    discard_blob(state.pdf_token)
+    state.pptx_token = ""
+    state.pdf_token = ""
+    clear_provider_cache()
+
+
 def on_language_change(e: me.SelectSelectionChangeEvent) -> None:
     me.state(State).review_language = e.value
 
@@ -115,8 +194,15 @@ def on_provider_change(e: me.SelectSelectionChangeEvent) -> None:
     me.state(State).ai_provider = e.value
 
 
+def _parse_keys(text: str) -> list[str]:
+    """Split a comma/newline separated key list, dropping blanks."""
+    return [k for k in (k.strip() for k in _KEY_SPLIT_RE.split(text)) if k]
+
+
 def handle_openai_keys_input(e: me.InputEvent) -> None:
-    me.state(State).openai_api_keys_input = e.value
+    state = me.state(State)
+    state.openai_api_keys_input = e.value
+    state.openai_api_keys = _parse_keys(e.value)
 
 
 def handle_ollama_url_input(e: me.InputEvent) -> None:
@@ -124,7 +210,9 @@ def handle_ollama_url_input(e: me.InputEvent) -> None:
 
 
 def handle_api_keys_input(e: me.InputEvent) -> None:
-    me.state(State).user_api_keys_input = e.value
+    state = me.state(State)
+    state.user_api_keys_input = e.value
+    state.user_api_keys = _parse_keys(e.value)
 
 
 def handle_user_instruction(e: me.InputEvent) -> None:
@@ -148,31 +236,53 @@ def dismiss_cancel(e: me.ClickEvent) -> None:
     me.state(State).show_cancel_dialog = False
 
 
-# ── Active cancel token (per-request, set from generation flows) ──────────
-_active_token: CancelToken | None = None
+# ── Active cancel tokens (one per UI session, set from generation flows) ─
+# Keyed by State.session_id, so Cancel only stops that session's own job
+_active_tokens: dict[str, CancelToken] = {}
+
+
+def _session_id(state: State) -> str:
+    """This UI session's id, assigned on first use."""
+    if not state.session_id:
+        state.session_id = uuid.uuid4().hex
+    return state.session_id
+
+
+def _start_job(state: State) -> CancelToken:
+    """Register a fresh token for this session's new job."""
+    token = CancelToken()
+    _active_tokens[_session_id(state)] = token
+    return token
+
+
+def _end_job(state: State, token: CancelToken) -> None:
+    # Leave a newer job's token in place
+    if _active_tokens.get(state.session_id) is token:
+        del _active_tokens[state.session_id]
 
 
 def confirm_cancel(e: me.ClickEvent) -> None:
     state = me.state(State)
     state.show_cancel_dialog = False
     state.cancel_requested = True
-    set_cancel_signal()
-    if _active_token is not None:
-        _active_token.cancel()
-    state.logs.append("⚠️ Đang yêu cầu hủy bỏ... Vui lòng đợi bước hiện tại hoàn tất.")
+    token = _active_tokens.get(state.session_id)
+    if token is not None:
+        token.cancel()
+    _log(state, "⚠️ Đang yêu cầu hủy bỏ... Vui lòng đợi bước hiện tại hoàn tất.")
 
 
 # ── Key resolution helper ────────────────────────────────────────────────
 
 
 def _resolve_api_keys(state: State) -> tuple[list[str], str]:
-    """Return ``(api_keys_list, provider_name)`` derived from state."""
+    """Return ``(api_keys_list, provider_name)`` derived from state.
+
+    Key inputs are parsed once when they lose focus, not on every click.
+    """
     provider = state.ai_provider or "gemini"
 
     if provider == "openai":
-        keys: list[str] = []
-        if state.openai_api_keys_input:
-            keys = [k.strip() for k in re.split(r"[,\n\r]+", state.openai_api_keys_input) if k.strip()]
+        keys = list(state.openai_api_keys)
         env = os.environ.get("OPENAI_API_KEY")
         if env and env not in keys:
             keys.append(env)
@@ -183,332 +293,268 @@ def _resolve_api_keys(state: State) -> tuple[list[str], str]:
         return [base_url], provider
 
     # Gemini
-    keys = []
+    keys = list(state.user_api_keys) if state.use_multi_key else []
     env = os.environ.get("GOOGLE_API_KEY")
-    if state.use_multi_key and state.user_api_keys_input:
-        keys = [k.strip() for k in re.split(r"[,\n\r]+", state.user_api_keys_input) if k.strip()]
     if env and env not in keys:
         keys.append(env)
     return keys, provider
 
 
+def _safe_stem(filename: str) -> str:
+    """Upload name without extension, reduced to filesystem-safe characters."""
+    return _SAFE_NAME_RE.sub("", filename.rsplit(".", 1)[0])
+
+
 def _generate_pdf_and_store(state: State, data: dict, suffix: str) -> None:
-    """Render PDF, encode to base64, store on *state*.
+    """Render PDF in memory and keep it in the blob store for the download link.
 
     Called from within the thread pool, so all I/O is non-blocking to the UI.
     """
-    name_no_ext = state.uploaded_filename.rsplit(".", 1)[0]
-    safe_name = re.sub(r"[^\w\s\-.]", "", name_no_ext)
-    pdf_out_name = f"{safe_name}_{suffix}.pdf"
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp_path = tmp.name
-
-    final_path = save_summary_to_pdf(data, tmp_path)
-    with open(final_path, "rb") as f:
-        state.pdf_content_base64 = base64.b64encode(f.read()).decode("utf-8")
-    state.pdf_filename = pdf_out_name
-    with contextlib.suppress(Exception):
-        os.remove(final_path)
-    state.logs.append(f"Đã tạo xong file: {state.pdf_filename}")
+    discard_blob(state.pdf_token)
+    state.pdf_token = put_blob(render_summary_pdf(data), state.session_id)
+    encode_blob(state.pdf_token)  # for the download link, off the render path
+    state.pdf_filename = f"{_safe_stem(state.uploaded_filename)}_{suffix}.pdf"
+    _log(state, f"Đã tạo xong file: {state.pdf_filename}")
 
 
-async def _poll_future(future, token: CancelToken, state: State):
-    """Poll a future with cancel checks, yielding for Mesop UI updates.
+def _generate_pptx_and_store(state: State, slide_json: dict) -> None:
+    """Render the deck in memory and keep it in the blob store for the download link.
 
-    Returns the future result, or None if cancelled.
+    Called from within the thread pool.  A process pool was not worth it: a
+    20-slide deck renders in ~0.15 s, less than worker start-up plus
+    pickling the template and the returned deck.
     """
-    while not future.done():
-        if token.is_set() or me.state(State).cancel_requested:
-            state.processing_status = "idle"
-            state.logs.append("❌ Đã hủy bỏ lệnh.")
-            future.cancel()
-            yield None
-            return
-        yield  # let Mesop re-render
-        await asyncio.sleep(0.3)
-    yield future.result()
+    # python-pptx is only needed once a deck is generated; keep it off
+    # the page's import path
+    from app.rendering.pptx import create_pptx
+
+    pptx_io = create_pptx(slide_json, template_pptx_bytes=get_blob(state.template_file_token) or None)
+    discard_blob(state.pptx_token)
+    # getvalue() hands over the BytesIO's own buffer without copying;
+    # getbuffer() would need a bytes() copy to outlive pptx_io
+    state.pptx_token = put_blob(pptx_io.getvalue(), state.session_id)
+    encode_blob(state.pptx_token)
+    state.pptx_filename = f"{_safe_stem(state.uploaded_filename)}_presentation.pptx"
+    _log(state, f"Đã tạo xong file: {state.pptx_filename}")
 
 
 # ── Async generation flows ──────────────────────────────────────────────
 
+_PROVIDER_LABELS = {"openai": "OpenAI", "ollama": "Ollama (Local)"}
 
-async def generate_summary(e: me.ClickEvent):
-    global _active_token
-    state = me.state(State)
+
+def _source_line(state: State, provider: str) -> str:
+    return f"Source: {state.uploaded_filename} | Provider: {_PROVIDER_LABELS.get(provider, 'Gemini')}"
+
+
+def _begin(state: State) -> bytes:
+    """Reset per-run UI state; return the upload, or ``b""`` with an error shown."""
     state.error_message = ""
     state.cancel_requested = False
-    token = CancelToken()
-    _active_token = token
-    clear_cancel_signal()
-    yield
-
-    if not state.uploaded_file_bytes:
+    file_bytes = get_blob(state.uploaded_file_token)
+    if not file_bytes:
         state.error_message = "Vui lòng tải lên file tài liệu trước."
-        yield
-        return
-
-    state.processing_status = "analyzing_summary"
-    api_keys_list, provider = _resolve_api_keys(state)
-    label = {"openai": "OpenAI", "ollama": "Ollama (Local)"}.get(provider, "Gemini")
-    state.logs.append(f"Source: {state.uploaded_filename} | Provider: {label}")
-    state.logs.append(f"Đang tóm tắt tài liệu với {label}...")
+    return file_bytes
+
+
+def _cancelled(state: State) -> None:
+    state.processing_status = ProcStatus.IDLE
+    _log(state, "❌ Đã hủy bỏ lệnh.")
+
+
+async def _run_ai_job(
+    state: State,
+    job_fn: Callable[..., dict],
+    job_kwargs: dict,
+    *,
+    intro: list[str],
+    status_analyze: ProcStatus,
+    status_generate: ProcStatus,
+    status_done: ProcStatus,
+    done_message: str,
+    artifact_fn: Callable[[State, dict], None],
+    empty_error: str = "AI không trả về dữ liệu.",
+    resumable: bool = False,
+    partial_message: str = "⚠️ Lỗi một phần: {}. Dữ liệu đã lưu để tiếp tục.",
+):
+    """Drive one generation run: *job_fn* in the pool, then *artifact_fn* on its result.
+
+    Yields whenever the page should re-render.  *job_kwargs* gets the run's
+    ``cancel_check`` added.  A *resumable* run (the review) streams its text
+    into ``streaming_preview`` and keeps ``PartialCompletionError`` data in
+    ``resume_data`` for the Resume button, logging *partial_message* (a
+    ``str.format`` template for the error).
+    """
+    token = _start_job(state)
+    state.processing_status = status_analyze
+    _log(state, *intro)
     yield
 
-    if token.is_set():
-        state.processing_status = "idle"
-        state.logs.append("❌ Đã hủy bỏ lệnh.")
-        yield
-        return
-
     try:
-        executor = get_executor()
-        if state.is_detailed:
-            state.logs.append("Đang chạy chế độ Deep Dive...")
+        if token.is_set():
+            _cancelled(state)
             yield
-            future = executor.submit(
-                summarize_book_deep_dive,
-                state.uploaded_file_bytes,
-                state.uploaded_mime_type,
-                api_keys=api_keys_list,
-                cancel_check=token.is_set,
-                provider=provider,
-            )
-        else:
-            future = executor.submit(
-                summarize_document,
-                state.uploaded_file_bytes,
-                state.uploaded_mime_type,
-                api_keys=api_keys_list,
-                user_instructions=state.user_instructions,
-                cancel_check=token.is_set,
-                provider=provider,
-            )
-
-        while not future.done():
-            if token.is_set() or me.state(State).cancel_requested:
-                state.processing_status = "idle"
-                state.logs.append("❌ Đã hủy bỏ lệnh.")
-                future.cancel()
+            return
+
+        chunks: list[str] = []
+        if resumable:
+            job_kwargs["stream_callback"] = chunks.append
+        future = get_executor().submit(job_fn, cancel_check=token.is_set, **job_kwargs)
+        waiter = asyncio.ensure_future(await_cancellable(future, token=token))
+        if resumable:
+            async for _ in _stream_preview(state, waiter, chunks):
                 yield
-                return
+        result = await waiter
+        if result is CANCELLED:
+            _cancelled(state)
             yield
-            await asyncio.sleep(0.3)
-
-        summary_data = future.result()
+            return
 
-        if not summary_data:
-            raise Exception("Empty result from executor")
+        if not result:
+            raise Exception(empty_error)
 
-        if "used_model" in summary_data:
-            state.logs.append(f"Model used: {summary_data['used_model']}")
+        if "used_model" in result:
+            _log(state, f"Model used: {result['used_model']}")
 
-        state.logs.append("Tóm tắt hoàn tất. Đang tạo PDF...")
-        state.processing_status = "generating_pdf"
+        _log(state, done_message)
+        state.processing_status = status_generate
+        if resumable:
+            state.streaming_preview = ""
+            state.resume_data = {}
         yield
 
         if token.is_set():
-            state.processing_status = "idle"
-            state.logs.append("❌ Đã hủy bỏ lệnh.")
+            _cancelled(state)
             yield
             return
 
-        # Offload PDF rendering to thread pool
-        await run_in_executor(_generate_pdf_and_store, state, summary_data, "summary")
-        state.processing_status = "summary_done"
+        await run_in_executor(artifact_fn, state, result)
+        state.processing_status = status_done
+        yield
+
+    except PartialCompletionError as partial_ex:
+        safe_print(f"PARTIAL ERROR: {partial_ex}", logging.WARNING)
+        state.processing_status = ProcStatus.ERROR
+        state.error_message = f"{partial_ex} (Có thể tiếp tục)"
+        state.resume_data = partial_ex.partial_data
+        _log(state, partial_message.format(partial_ex))
         yield
     except Exception as ex:
         safe_print(f"MAIN EXCEPTION: {ex}", logging.ERROR)
-        state.processing_status = "error"
+        state.processing_status = ProcStatus.ERROR
         state.error_message = str(ex)
-        state.logs.append(f"Lỗi: {ex}")
+        _log(state, f"{'Lỗi Review' if resumable else 'Lỗi'}: {ex}")
         yield
     finally:
-        _active_token = None
+        _end_job(state, token)
 
 
-async def generate_slides(e: me.ClickEvent):
-    global _active_token
+async def generate_summary(e: me.ClickEvent):
     state = me.state(State)
-    state.error_message = ""
-    state.cancel_requested = False
-    token = CancelToken()
-    _active_token = token
-    clear_cancel_signal()
-    yield
-
-    if not state.uploaded_file_bytes:
-        state.error_message = "Vui lòng tải lên file tài liệu trước."
+    file_bytes = _begin(state)
+    if not file_bytes:
         yield
         return
 
-    state.processing_status = "analyzing"
     api_keys_list, provider = _resolve_api_keys(state)
-    label = {"openai": "OpenAI", "ollama": "Ollama (Local)"}.get(provider, "Gemini")
-    state.logs.append(f"Source: {state.uploaded_filename} | Provider: {label}")
-    if state.template_filename:
-        state.logs.append(f"Template: {state.template_filename}")
-    detail_mode = "Chi tiết" if state.is_detailed else "Tóm tắt"
-    state.logs.append(f"Đang phân tích tài liệu ({detail_mode})...")
-    yield
-
-    if token.is_set():
-        state.processing_status = "idle"
-        state.logs.append("❌ Đã hủy bỏ lệnh.")
+    intro = [_source_line(state, provider), f"Đang tóm tắt tài liệu với {_PROVIDER_LABELS.get(provider, 'Gemini')}..."]
+    job_kwargs = {"api_keys": api_keys_list, "provider": provider, "refresh_cache": state.force_refresh}
+    if state.is_detailed:
+        intro.append("Đang chạy chế độ Deep Dive...")
+        job_fn = summarize_book_deep_dive
+    else:
+        job_fn = summarize_document
+        job_kwargs["user_instructions"] = state.user_instructions
+
+    async for _ in _run_ai_job(
+        state,
+        functools.partial(job_fn, file_bytes, state.uploaded_mime_type),
+        job_kwargs,
+        intro=intro,
+        status_analyze=ProcStatus.ANALYZING_SUMMARY,
+        status_generate=ProcStatus.GENERATING_PDF,
+        status_done=ProcStatus.SUMMARY_DONE,
+        done_message="Tóm tắt hoàn tất. Đang tạo PDF...",
+        artifact_fn=functools.partial(_generate_pdf_and_store, suffix="summary"),
+        empty_error="Empty result from executor",
+    ):
         yield
-        return
 
-    try:
-        executor = get_executor()
-        future = executor.submit(
-            analyze_document,
-            state.uploaded_file_bytes,
-            state.uploaded_mime_type,
-            api_keys=api_keys_list,
-            detail_level=detail_mode,
-            user_instructions=state.user_instructions,
-            cancel_check=token.is_set,
-            provider=provider,
-        )
-
-        while not future.done():
-            if token.is_set() or me.state(State).cancel_requested:
-                state.processing_status = "idle"
-                state.logs.append("❌ Đã hủy bỏ lệnh.")
-                future.cancel()
-                yield
-                return
-            yield
-            await asyncio.sleep(0.3)
-
-        slide_json = future.result()
-
-        if not slide_json:
-            raise Exception("AI không trả về dữ liệu slide.")
-
-        state.logs.append("Phân tích hoàn tất. Đang tạo slide...")
-        state.processing_status = "generating"
-        yield
 
-        if token.is_set():
-            state.processing_status = "idle"
-            state.logs.append("❌ Đã hủy bỏ lệnh.")
-            yield
-            return
-
-        # Offload PPTX rendering to thread pool
-        pptx_io = await run_in_executor(
-            create_pptx,
-            slide_json,
-            template_pptx_bytes=state.template_file_bytes if state.template_file_bytes else None,
-        )
-        pptx_bytes = pptx_io.read()
-        name_no_ext = state.uploaded_filename.rsplit(".", 1)[0]
-        safe_name = re.sub(r"[^\w\s\-.]", "", name_no_ext)
-        state.pptx_filename = f"{safe_name}_presentation.pptx"
-        state.pptx_content_base64 = base64.b64encode(pptx_bytes).decode("utf-8")
-        state.logs.append(f"Đã tạo xong file: {state.pptx_filename}")
-        state.processing_status = "done"
-        yield
-    except Exception as ex:
-        safe_print(f"MAIN EXCEPTION: {ex}", logging.ERROR)
-        state.processing_status = "error"
-        state.error_message = str(ex)
-        state.logs.append(f"Lỗi: {ex}")
-        yield
-    finally:
-        _active_token = None
-
-
-async def generate_review(e: me.ClickEvent):
-    global _active_token
+async def generate_slides(e: me.ClickEvent):
     state = me.state(State)
-    state.error_message = ""
-    state.cancel_requested = False
-    state.resume_data = {}
-    token = CancelToken()
-    _active_token = token
-    clear_cancel_signal()
-    yield
-
-    if not state.uploaded_file_bytes:
-        state.error_message = "Vui lòng tải lên file tài liệu trước."
+    file_bytes = _begin(state)
+    if not file_bytes:
         yield
         return
 
-    state.processing_status = "analyzing_review"
     api_keys_list, provider = _resolve_api_keys(state)
-    label = {"openai": "OpenAI", "ollama": "Ollama (Local)"}.get(provider, "Gemini")
-    state.logs.append(f"Source: {state.uploaded_filename} | Provider: {label}")
-    state.logs.append("Đang chạy Syntopic Book Review (3 Agents)...")
-    yield
-
-    if token.is_set():
-        state.processing_status = "idle"
-        state.logs.append("❌ Đã hủy bỏ lệnh.")
+    detail_mode = "Chi tiết" if state.is_detailed else "Tóm tắt"
+    intro = [_source_line(state, provider)]
+    if state.template_filename:
+        intro.append(f"Template: {state.template_filename}")
+    intro.append(f"Đang phân tích tài liệu ({detail_mode})...")
+
+    async for _ in _run_ai_job(
+        state,
+        functools.partial(analyze_document, file_bytes, state.uploaded_mime_type),
+        {
+            "api_keys": api_keys_list,
+            "detail_level": detail_mode,
+            "user_instructions": state.user_instructions,
+            "provider": provider,
+            "refresh_cache": state.force_refresh,
+        },
+        intro=intro,
+        status_analyze=ProcStatus.ANALYZING,
+        status_generate=ProcStatus.GENERATING,
+        status_done=ProcStatus.DONE,
+        done_message="Phân tích hoàn tất. Đang tạo slide...",
+        artifact_fn=_generate_pptx_and_store,
+        empty_error="AI không trả về dữ liệu slide.",
+    ):
         yield
-        return
 
-    try:
-        executor = get_executor()
-        future = executor.submit(
-            review_book_syntopic,
-            state.uploaded_file_bytes,
-            state.uploaded_mime_type,
-            api_keys=api_keys_list,
-            language=state.review_language,
-            cancel_check=token.is_set,
-            provider=provider,
-        )
-
-        while not future.done():
-            if token.is_set() or me.state(State).cancel_requested:
-                state.processing_status = "idle"
-                state.logs.append("❌ Đã hủy bỏ lệnh.")
-                future.cancel()
-                yield
-                return
-            yield
-            await asyncio.sleep(0.3)
-
-        review_data = future.result()
-
-        if "used_model" in review_data:
-            state.logs.append(f"Model used: {review_data['used_model']}")
 
-        state.logs.append("Review hoàn tất. Đang tạo PDF...")
-        state.processing_status = "generating_pdf"
-        yield
+def _review_job(state: State, file_bytes: bytes, resume_state: dict | None) -> tuple[Callable[..., dict], dict, str]:
+    """Return ``(job_fn, job_kwargs, provider)`` for a review run."""
+    api_keys_list, provider = _resolve_api_keys(state)
+    job_kwargs = {
+        "api_keys": api_keys_list,
+        "language": state.review_language,
+        "resume_state": resume_state,
+        "provider": provider,
+        "refresh_cache": state.force_refresh,
+    }
+    return functools.partial(review_book_syntopic, file_bytes, state.uploaded_mime_type), job_kwargs, provider
 
-        if token.is_set():
-            state.processing_status = "idle"
-            yield
-            return
 
-        # Offload PDF rendering to thread pool
-        await run_in_executor(_generate_pdf_and_store, state, review_data, "expert_review")
-        state.processing_status = "review_done"
+async def generate_review(e: me.ClickEvent):
+    state = me.state(State)
+    state.resume_data = {}
+    state.streaming_preview = ""
+    file_bytes = _begin(state)
+    if not file_bytes:
         yield
+        return
 
-    except PartialCompletionError as partial_ex:
-        safe_print(f"PARTIAL ERROR: {partial_ex}", logging.WARNING)
-        state.processing_status = "error"
-        state.error_message = f"{partial_ex} (Có thể tiếp tục)"
-        state.resume_data = partial_ex.partial_data
-        state.logs.append(f"⚠️ Lỗi một phần: {partial_ex}. Dữ liệu đã lưu để tiếp tục.")
+    job_fn, job_kwargs, provider = _review_job(state, file_bytes, None)
+    async for _ in _run_ai_job(
+        state,
+        job_fn,
+        job_kwargs,
+        intro=[_source_line(state, provider), "Đang chạy Syntopic Book Review (3 Agents)..."],
+        status_analyze=ProcStatus.ANALYZING_REVIEW,
+        status_generate=ProcStatus.GENERATING_PDF,
+        status_done=ProcStatus.REVIEW_DONE,
+        done_message="Review hoàn tất. Đang tạo PDF...",
+        artifact_fn=functools.partial(_generate_pdf_and_store, suffix="expert_review"),
+        resumable=True,
+    ):
         yield
-    except Exception as ex:
-        safe_print(f"MAIN EXCEPTION: {ex}", logging.ERROR)
-        state.processing_status = "error"
-        state.error_message = str(ex)
-        state.logs.append(f"Lỗi Review: {ex}")
-        yield
-    finally:
-        _active_token = None
 
 
 async def resume_review(e: me.ClickEvent):
-    global _active_token
     state = me.state(State)
     if not state.resume_data:
         state.error_message = "Không có dữ liệu để tiếp tục."
@@ -517,76 +563,25 @@ async def resume_review(e: me.ClickEvent):
 
     state.error_message = ""
     state.cancel_requested = False
-    token = CancelToken()
-    _active_token = token
-    clear_cancel_signal()
-    yield
-
-    state.processing_status = "analyzing_review"
-    state.logs.append("🔄 Đang tiếp tục xử lý (Resume)...")
-    yield
-
-    if token.is_set():
-        state.processing_status = "idle"
-        state.logs.append("❌ Đã hủy bỏ lệnh.")
+    state.streaming_preview = ""
+    file_bytes = get_blob(state.uploaded_file_token)
+    if not file_bytes:
+        state.error_message = "Vui lòng tải lên file tài liệu trước."
         yield
         return
 
-    try:
-        api_keys_list, provider = _resolve_api_keys(state)
-        executor = get_executor()
-        future = executor.submit(
-            review_book_syntopic,
-            state.uploaded_file_bytes,
-            state.uploaded_mime_type,
-            api_keys=api_keys_list,
-            language=state.review_language,
-            cancel_check=token.is_set,
-            resume_state=state.resume_data,
-            provider=provider,
-        )
-
-        while not future.done():
-            if token.is_set() or me.state(State).cancel_requested:
-                state.processing_status = "idle"
-                state.logs.append("❌ Đã hủy bỏ lệnh.")
-                future.cancel()
-                yield
-                return
-            yield
-            await asyncio.sleep(0.3)
-
-        review_data = future.result()
-
-        if "used_model" in review_data:
-            state.logs.append(f"Model used: {review_data['used_model']}")
-
-        state.logs.append("Review hoàn tất. Đang tạo PDF...")
-        state.processing_status = "generating_pdf"
-        state.resume_data = {}
-        yield
-
-        if token.is_set():
-            state.processing_status = "idle"
-            yield
-            return
-
-        await run_in_executor(_generate_pdf_and_store, state, review_data, "expert_review")
-        state.processing_status = "review_done"
+    job_fn, job_kwargs, _provider = _review_job(state, file_bytes, state.resume_data)
+    async for _ in _run_ai_job(
+        state,
+        job_fn,
+        job_kwargs,
+        intro=["🔄 Đang tiếp tục xử lý (Resume)..."],
+        status_analyze=ProcStatus.ANALYZING_REVIEW,
+        status_generate=ProcStatus.GENERATING_PDF,
+        status_done=ProcStatus.REVIEW_DONE,
+        done_message="Review hoàn tất. Đang tạo PDF...",
+        artifact_fn=functools.partial(_generate_pdf_and_store, suffix="expert_review"),
+        resumable=True,
+        partial_message="⚠️ Lại gặp lỗi: {}. Đã cập nhật điểm dừng.",
+    ):
         yield
-
-    except PartialCompletionError as partial_ex:
-        safe_print(f"PARTIAL ERROR (RESUME): {partial_ex}", logging.WARNING)
-        state.processing_status = "error"
-        state.error_message = f"{partial_ex} (Có thể tiếp tục)"
-        state.resume_data = partial_ex.partial_data
-        state.logs.append(f"⚠️ Lại gặp lỗi: {partial_ex}. Đã cập nhật điểm dừng.")
-        yield
-    except Exception as ex:
-        safe_print(f"MAIN EXCEPTION: {ex}", logging.ERROR)
-        state.processing_status = "error"
-        state.error_message = str(ex)
-        state.logs.append(f"Lỗi Review: {ex}")
-        yield
-    finally:
-        _active_token = None
@@ -12,9 +12,13 @@ v2.1 — UI polish:
 
 from __future__ import annotations
 
+import functools
+import html
+
 import mesop as me
 
 from app import __version__
+from app.ui.blobs import get_blob_b64
 from app.ui.handlers import (
     confirm_cancel,
     dismiss_cancel,
@@ -29,67 +33,185 @@ from app.ui.handlers import (
     handle_upload,
     handle_user_instruction,
     on_detail_change,
+    on_force_refresh_change,
     on_language_change,
     on_multi_key_change,
     on_provider_change,
     request_cancel,
+    reset_status,
     resume_review,
     set_topic,
+    toggle_full_logs,
+)
+from app.ui.state import ProcStatus, State
+
+# ── Static styles ────────────────────────────────────────────────────────
+# Mesop re-runs main_page() on every state change; styles that never depend
+# on state are built once here instead of on each render.
+
+_ROOT_STYLE = me.Style(
+    background="#f8fafc",
+    height="100vh",
+    display="flex",
+    flex_direction="column",
+    font_family="Inter, sans-serif",
+    padding=me.Padding.all(0),
+)
+_HEADER_STYLE = me.Style(
+    background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
+    padding=me.Padding.symmetric(vertical=16, horizontal=32),
+    border=me.Border(bottom=me.BorderSide(width=2, color="#e2e8f0")),
+    display="flex",
+    justify_content="space-between",
+    align_items="center",
+)
+_HEADER_BRAND_STYLE = me.Style(display="flex", align_items="center", gap=12)
+_HEADER_ICON_STYLE = me.Style(color="#2563eb", font_size=28)
+_HEADER_TITLE_STYLE = me.Style(font_size=24, font_weight=700, color="#0f172a")
+_VERSION_BADGE_STYLE = me.Style(
+    background="#dbeafe",
+    padding=me.Padding.symmetric(vertical=2, horizontal=10),
+    border_radius=12,
+)
+_VERSION_TEXT_STYLE = me.Style(font_size=11, color="#2563eb", font_weight=600)
+_TAGLINE_STYLE = me.Style(color="#64748b", font_size=13)
+_GRID_STYLE = me.Style(
+    display="grid",
+    grid_template_columns="1fr 1fr",
+    gap=32,
+    padding=me.Padding.all(32),
+    height="calc(100vh - 80px)",
+    box_sizing="border-box",
+)
+_CARD_STYLE = me.Style(
+    background="#ffffff",
+    padding=me.Padding.all(24),
+    border_radius=16,
+    box_shadow="0 4px 6px -1px rgb(0 0 0 / 0.1)",
+    display="flex",
+    flex_direction="column",
+    gap=24,
+)
+_CARD_TITLE_STYLE = me.Style(font_size=18, font_weight=600, color="#1e293b")
+_FULL_WIDTH_STYLE = me.Style(width="100%")
+_SECTION_STYLE = me.Style(width="100%", margin=me.Margin(top=24))
+_SECTION_LABEL_STYLE = me.Style(font_size=14, color="#475569", margin=me.Margin(bottom=8))
+_UPLOADER_STYLE = me.Style(font_weight="500")
+_UPLOADED_FILE_STYLE = me.Style(
+    background="#f0f9ff",
+    padding=me.Padding.all(12),
+    border_radius=8,
+    display="flex",
+    align_items="center",
+    gap=8,
+)
+_TEMPLATE_FILE_STYLE = me.Style(
+    background="#faf5ff",
+    padding=me.Padding.all(12),
+    border_radius=8,
+    display="flex",
+    align_items="center",
+    gap=8,
+)
+_UPLOADED_ICON_STYLE = me.Style(color="#0284c7")
+_UPLOADED_NAME_STYLE = me.Style(font_size=14, color="#0c4a6e")
+_TEMPLATE_ICON_STYLE = me.Style(color="#9333ea")
+_TEMPLATE_NAME_STYLE = me.Style(font_size=14, color="#6b21a8")
+_SUGGESTION_LABEL_STYLE = me.Style(font_size=12, color="#94a3b8", margin=me.Margin(top=12, bottom=8), font_weight=500)
+_DETAIL_HINT_STYLE = me.Style(font_size=12, color="#64748b", margin=me.Margin(top=4, left=32))
+_CHIP_ROW_STYLE = me.Style(display="flex", flex_wrap="wrap", gap=8)
+_PROVIDER_BOX_STYLE = me.Style(
+    width="100%",
+    margin=me.Margin(top=24),
+    padding=me.Padding.all(16),
+    background="#f8fafc",
+    border_radius=8,
+    border=me.Border.all(me.BorderSide(width=1, color="#e2e8f0")),
+)
+_PROVIDER_TITLE_STYLE = me.Style(font_size=14, font_weight=600, color="#1e293b", margin=me.Margin(bottom=8))
+_PROVIDER_SELECT_STYLE = me.Style(width="100%", margin=me.Margin(bottom=16))
+_PROVIDER_INPUT_STYLE = me.Style(width="100%", margin=me.Margin(bottom=12))
+_OPENAI_NOTE_BOX_STYLE = me.Style(
+    background="#fef3c7", padding=me.Padding.all(12), border_radius=8, margin=me.Margin(bottom=12)
+)
+_OPENAI_NOTE_STYLE = me.Style(font_size=12, color="#92400e")
+_OLLAMA_NOTE_BOX_STYLE = me.Style(
+    background="#d1fae5", padding=me.Padding.all(12), border_radius=8, margin=me.Margin(bottom=12)
+)
+_OLLAMA_NOTE_STYLE = me.Style(font_size=12, color="#065f46")
+_OLLAMA_MODELS_STYLE = me.Style(font_size=11, color="#047857", margin=me.Margin(top=4))
+_MULTI_KEY_HINT_STYLE = me.Style(font_size=12, color="#64748b", margin=me.Margin(top=8, bottom=8))
+_LOG_BOX_STYLE = me.Style(
+    background="#f1f5f9",
+    flex_grow=1,
+    border_radius=8,
+    padding=me.Padding.all(16),
+    overflow_y="auto",
+    font_family="'JetBrains Mono', 'Fira Code', monospace",
+)
+_LOG_PLACEHOLDER_STYLE = me.Style(color="#94a3b8", font_style="italic")
+_LOG_TEXT_STYLE = me.Style(color="#334155", font_size=12, line_height="1.8", white_space="pre-wrap")
+_PREVIEW_STYLE = me.Style(color="#475569", font_size=12, white_space="pre-wrap", margin=me.Margin(top=8))
+_PROGRESS_BOX_STYLE = me.Style(
+    display="flex",
+    align_items="center",
+    gap=12,
+    margin=me.Margin(top=16),
+    background="#f0f9ff",
+    padding=me.Padding.all(12),
+    border_radius=8,
+    border=me.Border.all(me.BorderSide(width=1, color="#bfdbfe")),
+)
+_CANCEL_BUTTON_ROW_STYLE = me.Style(margin=me.Margin(left=16, top=8))
+_CANCEL_OVERLAY_STYLE = me.Style(
+    position="fixed",
+    top=0,
+    left=0,
+    right=0,
+    bottom=0,
+    background="rgba(0,0,0,0.5)",
+    z_index=1000,
+    display="flex",
+    justify_content="center",
+    align_items="center",
+)
+_CANCEL_DIALOG_STYLE = me.Style(
+    background="white",
+    padding=me.Padding.all(24),
+    border_radius=12,
+    width="400px",
+    box_shadow="0 10px 15px -3px rgba(0, 0, 0, 0.1)",
 )
-from app.ui.state import State
+_CANCEL_TITLE_STYLE = me.Style(font_size=20, font_weight="bold", margin=me.Margin(bottom=16))
+_CANCEL_TEXT_STYLE = me.Style(margin=me.Margin(bottom=24), color="#4b5563")
+_CANCEL_ACTIONS_STYLE = me.Style(display="flex", justify_content="flex-end", gap=16)
+_ERROR_BOX_STYLE = me.Style(
+    background="#fef2f2",
+    padding=me.Padding.all(12),
+    border_radius=8,
+    border=me.Border.all(me.BorderSide(width=1, color="#fecaca")),
+)
+_ERROR_TEXT_STYLE = me.Style(color="#991b1b", font_size=14)
+_RESUME_ROW_STYLE = me.Style(margin=me.Margin(top=12), display="flex", align_items="center", gap=12)
+_RESUME_BUTTON_STYLE = me.Style(font_weight="bold")
+_RESUME_HINT_STYLE = me.Style(font_size=12, color="#7f1d1d", font_style="italic")
 
 
 def main_page() -> None:
     state = me.state(State)
 
-    with me.box(
-        style=me.Style(
-            background="#f8fafc",
-            height="100vh",
-            display="flex",
-            flex_direction="column",
-            font_family="Inter, sans-serif",
-            padding=me.Padding.all(0),
-        )
-    ):
+    with me.box(style=_ROOT_STYLE):
         # ── Header ──────────────────────────────────────────────────────
-        with me.box(
-            style=me.Style(
-                background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
-                padding=me.Padding.symmetric(vertical=16, horizontal=32),
-                border=me.Border(bottom=me.BorderSide(width=2, color="#e2e8f0")),
-                display="flex",
-                justify_content="space-between",
-                align_items="center",
-            )
-        ):
-            with me.box(style=me.Style(display="flex", align_items="center", gap=12)):
-                me.icon("auto_awesome", style=me.Style(color="#2563eb", font_size=28))
-                me.text("SlideGenius", style=me.Style(font_size=24, font_weight=700, color="#0f172a"))
-                with me.box(
-                    style=me.Style(
-                        background="#dbeafe",
-                        padding=me.Padding.symmetric(vertical=2, horizontal=10),
-                        border_radius=12,
-                    )
-                ):
-                    me.text(f"v{__version__}", style=me.Style(font_size=11, color="#2563eb", font_weight=600))
-            me.text(
-                "AI-Powered Presentation & Document Intelligence",
-                style=me.Style(color="#64748b", font_size=13),
-            )
+        with me.box(style=_HEADER_STYLE):
+            with me.box(style=_HEADER_BRAND_STYLE):
+                me.icon("auto_awesome", style=_HEADER_ICON_STYLE)
+                me.text("SlideGenius", style=_HEADER_TITLE_STYLE)
+                with me.box(style=_VERSION_BADGE_STYLE):
+                    me.text(f"v{__version__}", style=_VERSION_TEXT_STYLE)
+            me.text("AI-Powered Presentation & Document Intelligence", style=_TAGLINE_STYLE)
 
         # ── 2-Column layout ─────────────────────────────────────────────
-        with me.box(
-            style=me.Style(
-                display="grid",
-                grid_template_columns="1fr 1fr",
-                gap=32,
-                padding=me.Padding.all(32),
-                height="calc(100vh - 80px)",
-                box_sizing="border-box",
-            )
-        ):
+        with me.box(style=_GRID_STYLE):
             _left_column(state)
             _right_column(state)
 
@@ -98,106 +220,73 @@ def main_page() -> None:
 
 
 def _left_column(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            background="#ffffff",
-            padding=me.Padding.all(24),
-            border_radius=16,
-            box_shadow="0 4px 6px -1px rgb(0 0 0 / 0.1)",
-            display="flex",
-            flex_direction="column",
-            gap=24,
-        )
-    ):
-        me.text("Input Documents", style=me.Style(font_size=18, font_weight=600, color="#1e293b"))
+    with me.box(style=_CARD_STYLE):
+        me.text("Input Documents", style=_CARD_TITLE_STYLE)
 
         # File upload
-        with me.box(style=me.Style(width="100%")):
-            me.text(
-                "Upload Document (PDF/DOCX/EPUB)",
-                style=me.Style(font_size=14, color="#475569", margin=me.Margin(bottom=8)),
-            )
+        with me.box(style=_FULL_WIDTH_STYLE):
+            me.text("Upload Document (PDF/DOCX/EPUB)", style=_SECTION_LABEL_STYLE)
             me.uploader(
                 label="Choose File",
                 accepted_file_types=["application/pdf", ".docx", ".epub"],
                 on_upload=handle_upload,
                 type="flat",
-                style=me.Style(font_weight="500"),
+                style=_UPLOADER_STYLE,
             )
 
         if state.uploaded_filename:
-            with me.box(
-                style=me.Style(
-                    background="#f0f9ff",
-                    padding=me.Padding.all(12),
-                    border_radius=8,
-                    display="flex",
-                    align_items="center",
-                    gap=8,
-                )
-            ):
-                me.icon("description", style=me.Style(color="#0284c7"))
-                me.text(state.uploaded_filename, style=me.Style(font_size=14, color="#0c4a6e"))
+            with me.box(style=_UPLOADED_FILE_STYLE):
+                me.icon("description", style=_UPLOADED_ICON_STYLE)
+                me.text(state.uploaded_filename, style=_UPLOADED_NAME_STYLE)
 
         # Template upload
-        with me.box(style=me.Style(width="100%")):
-            me.text(
-                "Slide Template (Optional .pptx)",
-                style=me.Style(font_size=14, color="#475569", margin=me.Margin(bottom=8)),
-            )
+        with me.box(style=_FULL_WIDTH_STYLE):
+            me.text("Slide Template (Optional .pptx)", style=_SECTION_LABEL_STYLE)
             me.uploader(
                 label="Upload Template",
                 accepted_file_types=[".pptx"],
                 on_upload=handle_template_upload,
                 type="stroked",
-                style=me.Style(font_weight="500"),
+                style=_UPLOADER_STYLE,
             )
 
         if state.template_filename:
-            with me.box(
-                style=me.Style(
-                    background="#faf5ff",
-                    padding=me.Padding.all(12),
-                    border_radius=8,
-                    display="flex",
-                    align_items="center",
-                    gap=8,
-                )
-            ):
-                me.icon("slideshow", style=me.Style(color="#9333ea"))
-                me.text(state.template_filename, style=me.Style(font_size=14, color="#6b21a8"))
-
-        # Topic input + suggestions
-        with me.box(style=me.Style(width="100%")):
+            with me.box(style=_TEMPLATE_FILE_STYLE):
+                me.icon("slideshow", style=_TEMPLATE_ICON_STYLE)
+                me.text(state.template_filename, style=_TEMPLATE_NAME_STYLE)
+
+        # Topic input + suggestions.  Text fields report on_blur, not on_input:
+        # each one costs a single server round trip and page replay per edit,
+        # never one per keystroke, so no debounce is needed.
+        with me.box(style=_FULL_WIDTH_STYLE):
             me.input(
                 label="Chủ đề mong muốn (Tùy chọn)",
                 on_blur=handle_topic_input,
-                style=me.Style(width="100%"),
+                style=_FULL_WIDTH_STYLE,
                 value=state.user_topic,
             )
-            me.text(
-                "Gợi ý chủ đề:",
-                style=me.Style(font_size=12, color="#94a3b8", margin=me.Margin(top=12, bottom=8), font_weight=500),
-            )
+            me.text("Gợi ý chủ đề:", style=_SUGGESTION_LABEL_STYLE)
             _topic_suggestions(state)
 
         # Custom instructions
-        with me.box(style=me.Style(width="100%", margin=me.Margin(top=24))):
+        with me.box(style=_SECTION_STYLE):
             me.textarea(
                 label="Hướng dẫn đặc biệt cho AI (Tùy chọn)",
                 placeholder="Ví dụ: Chỉ tập trung vào chương 2...",
                 on_blur=handle_user_instruction,
                 value=state.user_instructions,
                 rows=3,
-                style=me.Style(width="100%"),
+                style=_FULL_WIDTH_STYLE,
             )
 
         # Detail checkbox
-        with me.box(style=me.Style(width="100%", margin=me.Margin(top=24))):
+        with me.box(style=_SECTION_STYLE):
             me.checkbox(label="Chế độ Chi tiết (Deep Dive)", checked=state.is_detailed, on_change=on_detail_change)
-            me.text(
-                "Deep Dive: tạo nhiều slide / phân tích sâu hơn.",
-                style=me.Style(font_size=12, color="#64748b", margin=me.Margin(top=4, left=32)),
+            me.text("Deep Dive: tạo nhiều slide / phân tích sâu hơn.", style=_DETAIL_HINT_STYLE)
+            me.checkbox(
+                label="Bỏ qua kết quả đã lưu (chạy lại AI)",
+                checked=state.force_refresh,
+                on_change=on_force_refresh_change,
             )
 
         # Provider config panel
@@ -207,17 +296,32 @@ def _left_column(state: State) -> None:
         _action_buttons(state)
 
 
+_TOPIC_SUGGESTIONS = (
+    "Kế hoạch kinh doanh",
+    "Báo cáo thị trường",
+    "Giáo án điện tử",
+    "Hồ sơ năng lực",
+    "Startup Pitch",
+    "Phân tích tài chính",
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _chip_style(selected: bool) -> me.Style:
+    """Style of a topic chip; only the selected / unselected variants exist."""
+    return me.Style(
+        font_size=12,
+        border_radius=20,
+        color="#2563eb" if selected else "#64748b",
+        border=me.Border.all(me.BorderSide(width=1, color="#2563eb" if selected else "#cbd5e1")),
+        background="#eff6ff" if selected else "#ffffff",
+        padding=me.Padding.symmetric(vertical=4, horizontal=12),
+    )
+
+
 def _topic_suggestions(state: State) -> None:
-    suggestions = [
-        "Kế hoạch kinh doanh",
-        "Báo cáo thị trường",
-        "Giáo án điện tử",
-        "Hồ sơ năng lực",
-        "Startup Pitch",
-        "Phân tích tài chính",
-    ]
-    with me.box(style=me.Style(display="flex", flex_wrap="wrap", gap=8)):
-        for topic in suggestions:
+    with me.box(style=_CHIP_ROW_STYLE):
+        for topic in _TOPIC_SUGGESTIONS:
             sel = state.user_topic == topic
             me.button(
                 topic,
@@ -225,76 +329,53 @@ def _topic_suggestions(state: State) -> None:
                 on_click=set_topic,
                 type="stroked" if not sel else "flat",
                 color="primary" if sel else "warn",
-                style=me.Style(
-                    font_size=12,
-                    border_radius=20,
-                    color="#2563eb" if sel else "#64748b",
-                    border=me.Border.all(me.BorderSide(width=1, color="#2563eb" if sel else "#cbd5e1")),
-                    background="#eff6ff" if sel else "#ffffff",
-                    padding=me.Padding.symmetric(vertical=4, horizontal=12),
-                ),
+                style=_chip_style(sel),
             )
 
 
+_PROVIDER_OPTIONS = (
+    me.SelectOption(label="Google Gemini (Mặc định)", value="gemini"),
+    me.SelectOption(label="OpenAI (GPT-4o, o4-mini, ...)", value="openai"),
+    me.SelectOption(label="Anthropic (Claude Sonnet/Haiku)", value="anthropic"),
+    me.SelectOption(label="Local LLM - Ollama (Miễn phí)", value="ollama"),
+    me.SelectOption(label="LiteLLM (100+ providers)", value="litellm"),
+)
+
+
 def _provider_config(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            width="100%",
-            margin=me.Margin(top=24),
-            padding=me.Padding.all(16),
-            background="#f8fafc",
-            border_radius=8,
-            border=me.Border.all(me.BorderSide(width=1, color="#e2e8f0")),
-        )
-    ):
-        me.text(
-            "AI Provider", style=me.Style(font_size=14, font_weight=600, color="#1e293b", margin=me.Margin(bottom=8))
-        )
+    with me.box(style=_PROVIDER_BOX_STYLE):
+        me.text("AI Provider", style=_PROVIDER_TITLE_STYLE)
         me.select(
             label="Chọn AI Provider",
-            options=[
-                me.SelectOption(label="Google Gemini (Mặc định)", value="gemini"),
-                me.SelectOption(label="OpenAI (GPT-4o, o4-mini, ...)", value="openai"),
-                me.SelectOption(label="Anthropic (Claude Sonnet/Haiku)", value="anthropic"),
-                me.SelectOption(label="Local LLM - Ollama (Miễn phí)", value="ollama"),
-                me.SelectOption(label="LiteLLM (100+ providers)", value="litellm"),
-            ],
+            options=_PROVIDER_OPTIONS,
             value=state.ai_provider,
             on_selection_change=on_provider_change,
-            style=me.Style(width="100%", margin=me.Margin(bottom=16)),
+            style=_PROVIDER_SELECT_STYLE,
         )
 
         if state.ai_provider == "openai":
-            with me.box(
-                style=me.Style(
-                    background="#fef3c7", padding=me.Padding.all(12), border_radius=8, margin=me.Margin(bottom=12)
-                )
-            ):
-                me.text("OpenAI yêu cầu API Key có billing.", style=me.Style(font_size=12, color="#92400e"))
+            with me.box(style=_OPENAI_NOTE_BOX_STYLE):
+                me.text("OpenAI yêu cầu API Key có billing.", style=_OPENAI_NOTE_STYLE)
             me.input(
                 label="OpenAI API Key(s) (cách nhau dấu phẩy)",
                 value=state.openai_api_keys_input,
                 on_blur=handle_openai_keys_input,
                 type="password",
-                style=me.Style(width="100%", margin=me.Margin(bottom=12)),
+                style=_PROVIDER_INPUT_STYLE,
             )
 
         if state.ai_provider == "ollama":
-            with me.box(
-                style=me.Style(
-                    background="#d1fae5", padding=me.Padding.all(12), border_radius=8, margin=me.Margin(bottom=12)
-                )
-            ):
-                me.text("🟢 Ollama chạy local, hoàn toàn miễn phí.", style=me.Style(font_size=12, color="#065f46"))
+            with me.box(style=_OLLAMA_NOTE_BOX_STYLE):
+                me.text("🟢 Ollama chạy local, hoàn toàn miễn phí.", style=_OLLAMA_NOTE_STYLE)
                 me.text(
                     "Models: qwen2.5:72b, gemma3:27b, qwen2.5-coder:32b, deepseek-coder-v2, qwen2.5:14b",
-                    style=me.Style(font_size=11, color="#047857", margin=me.Margin(top=4)),
+                    style=_OLLAMA_MODELS_STYLE,
                 )
             me.input(
                 label="Ollama Base URL",
                 value=state.ollama_base_url,
                 on_blur=handle_ollama_url_input,
-                style=me.Style(width="100%", margin=me.Margin(bottom=12)),
+                style=_PROVIDER_INPUT_STYLE,
             )
 
         if state.ai_provider == "gemini":
@@ -302,80 +383,33 @@ def _provider_config(state: State) -> None:
                 label="Sử dụng nhiều API Key (Dự phòng)", checked=state.use_multi_key, on_change=on_multi_key_change
             )
             if state.use_multi_key:
-                me.text(
-                    "Mỗi key một dòng hoặc cách nhau dấu phẩy",
-                    style=me.Style(font_size=12, color="#64748b", margin=me.Margin(top=8, bottom=8)),
-                )
+                me.text("Mỗi key một dòng hoặc cách nhau dấu phẩy", style=_MULTI_KEY_HINT_STYLE)
                 me.input(
                     label="Paste Gemini API Keys",
                     value=state.user_api_keys_input,
                     on_blur=handle_api_keys_input,
                     type="password",
-                    style=me.Style(width="100%"),
+                    style=_FULL_WIDTH_STYLE,
                 )
 
 
-def _action_buttons(state: State) -> None:
-    is_loading = state.processing_status in (
-        "analyzing",
-        "generating",
-        "analyzing_summary",
-        "analyzing_review",
-        "generating_pdf",
-    )
-    is_disabled = is_loading or not state.uploaded_filename
-
-    # Generate Slides
-    _action_box(
-        generate_slides if not is_disabled else None,
-        "Generate Slides",
-        bg="#e2e8f0" if is_disabled else "#2563eb",
-        color="#94a3b8" if is_disabled else "#000000",
-        disabled=is_disabled,
-        margin_top=32,
-    )
-
-    # Generate Summary
-    border_c = "#ea580c" if not is_disabled else "#fed7aa"
-    _action_box(
-        generate_summary if not is_disabled else None,
-        "Generate Summary (PDF)",
-        bg="transparent",
-        color=border_c,
-        border_color=border_c,
-        disabled=is_disabled,
-        margin_top=16,
-    )
-
-    # Language selector + Expert Review
-    with me.box(style=me.Style(margin=me.Margin(top=16))):
-        me.text("Ngôn ngữ Review:", style=me.Style(font_size=12, color="#64748b", margin=me.Margin(bottom=4)))
-        me.select(
-            label="Chọn ngôn ngữ",
-            options=[
-                me.SelectOption(label="Tiếng Việt (Vietnamese)", value="Tiếng Việt"),
-                me.SelectOption(label="Tiếng Anh (English)", value="English"),
-            ],
-            value=state.review_language,
-            on_selection_change=on_language_change,
-            style=me.Style(width="100%"),
-        )
-
-    rev_c = "#7c3aed" if not is_disabled else "#ddd6fe"
-    _action_box(
-        generate_review if not is_disabled else None,
-        "Generate Expert Review",
-        bg="transparent",
-        color=rev_c,
-        border_color=rev_c,
-        disabled=is_disabled,
-        margin_top=12,
+# Bit i set ⇔ ProcStatus(i) is a running job; tested with one shift and AND
+_LOADING_MASK = sum(
+    1 << status
+    for status in (
+        ProcStatus.ANALYZING,
+        ProcStatus.GENERATING,
+        ProcStatus.ANALYZING_SUMMARY,
+        ProcStatus.ANALYZING_REVIEW,
+        ProcStatus.GENERATING_PDF,
     )
+)
 
 
-def _action_box(
-    on_click, text: str, *, bg: str, color: str, border_color: str | None = None, disabled: bool, margin_top: int
-) -> None:
+def _action_styles(
+    *, bg: str, color: str, border_color: str | None = None, disabled: bool, margin_top: int
+) -> tuple[me.Style, me.Style]:
+    """Box and label style of one action button."""
     style_kwargs: dict = dict(
         width="100%",
         padding=me.Padding.symmetric(vertical=16),
@@ -391,27 +425,77 @@ def _action_box(
         style_kwargs["border"] = me.Border.all(me.BorderSide(width=1, color=border_color))
     if not disabled and not border_color:
         style_kwargs["box_shadow"] = "0 2px 4px rgba(0,0,0,0.1)"
+    label = me.Style(color=color, font_size=16, font_weight="bold", text_align="center", z_index=10)
+    return me.Style(**style_kwargs), label
+
+
+# disabled → (slides, summary, review) button styles; built once, looked up per render
+_ACTION_STYLES: dict[bool, tuple[tuple[me.Style, me.Style], ...]] = {
+    disabled: (
+        _action_styles(
+            bg="#e2e8f0" if disabled else "#2563eb",
+            color="#94a3b8" if disabled else "#000000",
+            disabled=disabled,
+            margin_top=32,
+        ),
+        _action_styles(
+            bg="transparent",
+            color="#fed7aa" if disabled else "#ea580c",
+            border_color="#fed7aa" if disabled else "#ea580c",
+            disabled=disabled,
+            margin_top=16,
+        ),
+        _action_styles(
+            bg="transparent",
+            color="#ddd6fe" if disabled else "#7c3aed",
+            border_color="#ddd6fe" if disabled else "#7c3aed",
+            disabled=disabled,
+            margin_top=12,
+        ),
+    )
+    for disabled in (False, True)
+}
+_LANGUAGE_BOX_STYLE = me.Style(margin=me.Margin(top=16))
+_LANGUAGE_LABEL_STYLE = me.Style(font_size=12, color="#64748b", margin=me.Margin(bottom=4))
+_LANGUAGE_OPTIONS = (
+    me.SelectOption(label="Tiếng Việt (Vietnamese)", value="Tiếng Việt"),
+    me.SelectOption(label="Tiếng Anh (English)", value="English"),
+)
+
+
+def _action_buttons(state: State) -> None:
+    is_disabled = bool(_LOADING_MASK >> state.processing_status & 1) or not state.uploaded_filename
+    slides_styles, summary_styles, review_styles = _ACTION_STYLES[is_disabled]
+
+    _action_box(None if is_disabled else generate_slides, "Generate Slides", slides_styles)
+    _action_box(None if is_disabled else generate_summary, "Generate Summary (PDF)", summary_styles)
+
+    # Language selector + Expert Review
+    with me.box(style=_LANGUAGE_BOX_STYLE):
+        me.text("Ngôn ngữ Review:", style=_LANGUAGE_LABEL_STYLE)
+        me.select(
+            label="Chọn ngôn ngữ",
+            options=_LANGUAGE_OPTIONS,
+            value=state.review_language,
+            on_selection_change=on_language_change,
+            style=_FULL_WIDTH_STYLE,
+        )
 
-    with me.box(on_click=on_click, style=me.Style(**style_kwargs)):
-        me.text(text, style=me.Style(color=color, font_size=16, font_weight="bold", text_align="center", z_index=10))
+    _action_box(None if is_disabled else generate_review, "Generate Expert Review", review_styles)
+
+
+def _action_box(on_click, text: str, styles: tuple[me.Style, me.Style]) -> None:
+    box_style, label_style = styles
+    with me.box(on_click=on_click, style=box_style):
+        me.text(text, style=label_style)
 
 
 # ── Right Column: Output ────────────────────────────────────────────────
 
 
 def _right_column(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            background="#ffffff",
-            padding=me.Padding.all(24),
-            border_radius=16,
-            box_shadow="0 4px 6px -1px rgb(0 0 0 / 0.1)",
-            display="flex",
-            flex_direction="column",
-            gap=24,
-        )
-    ):
-        me.text("Status & Output", style=me.Style(font_size=18, font_weight=600, color="#1e293b"))
+    with me.box(style=_CARD_STYLE):
+        me.text("Status & Output", style=_CARD_TITLE_STYLE)
         _logs_area(state)
 
         if state.show_cancel_dialog:
@@ -420,194 +504,174 @@ def _right_column(state: State) -> None:
         if state.error_message:
             _error_box(state)
 
-        if state.processing_status == "done":
+        if state.processing_status == ProcStatus.DONE:
             _download_pptx(state)
-        if state.processing_status == "summary_done":
+        if state.processing_status == ProcStatus.SUMMARY_DONE:
             _download_pdf(state, "Summary", "#fff7ed", "#fdba74", "#ea580c", "#9a3412", "description")
-        if state.processing_status == "review_done":
+        if state.processing_status == ProcStatus.REVIEW_DONE:
             _download_pdf(state, "Expert Review", "#f5f3ff", "#c4b5fd", "#7c3aed", "#5b21b6", "auto_stories")
 
 
+# Older lines stay in state.logs but are only rendered on request
+_VISIBLE_LOG_LINES = 50
+_LOG_TOGGLE_STYLE = me.Style(font_size=12, margin=me.Margin(bottom=8))
+
+
 def _logs_area(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            background="#f1f5f9",
-            flex_grow=1,
-            border_radius=8,
-            padding=me.Padding.all(16),
-            overflow_y="auto",
-            font_family="'JetBrains Mono', 'Fira Code', monospace",
-        )
-    ):
+    with me.box(style=_LOG_BOX_STYLE):
         if not state.logs:
-            me.text("Waiting for input...", style=me.Style(color="#94a3b8", font_style="italic"))
-        for log in state.logs:
-            colour = _log_colour(log)
-            me.text(f"> {log}", style=me.Style(color=colour, font_size=12, margin=me.Margin(bottom=6)))
+            me.text("Waiting for input...", style=_LOG_PLACEHOLDER_STYLE)
+        hidden = 0 if state.show_full_logs else max(0, len(state.logs) - _VISIBLE_LOG_LINES)
+        if len(state.logs) > _VISIBLE_LOG_LINES:
+            me.button(
+                f"Hiện {hidden} dòng cũ hơn" if hidden else "Thu gọn nhật ký",
+                on_click=toggle_full_logs,
+                type="stroked",
+                style=_LOG_TOGGLE_STYLE,
+            )
+        if state.logs:
+            me.text(_log_text(tuple(state.logs[hidden:])), style=_LOG_TEXT_STYLE)
+
+        if state.streaming_preview:
+            me.text(state.streaming_preview, style=_PREVIEW_STYLE)
 
         _progress_indicator(state)
 
 
-def _log_colour(text: str) -> str:
-    """Return a colour based on log content for visual scanning."""
-    if "❌" in text or "Lỗi" in text or "ERROR" in text:
-        return "#dc2626"
-    if "⚠️" in text or "WARNING" in text:
-        return "#d97706"
-    if "✅" in text or "hoàn tất" in text.lower() or "completed" in text.lower():
-        return "#059669"
-    if "🟢" in text or "🔑" in text:
-        return "#2563eb"
-    if "🔄" in text:
-        return "#7c3aed"
-    if text.startswith("> Source:") or text.startswith("> Model"):
-        return "#6366f1"
-    return "#334155"
+@functools.lru_cache(maxsize=4)
+def _log_text(logs: tuple[str, ...]) -> str:
+    """The visible log lines as one preformatted block.
+
+    Rendered as a single component, so a long run adds one node to the page
+    rather than one per line; unchanged logs (typing, toggles, progress
+    ticks) reuse the joined text.
+    """
+    return "\n".join([f"> {log}" for log in logs])
+
+
+def _progress_item(label: str, colour: str, icon_name: str) -> tuple[str, str, me.Style, me.Style]:
+    return label, icon_name, me.Style(color=colour, font_size=20), me.Style(color=colour, font_weight=600, font_size=14)
+
+
+# status → (label, icon, icon style, label style), only for running jobs
+_PROGRESS_ITEMS = {
+    ProcStatus.ANALYZING: _progress_item("Reading & Analyzing Document...", "#2563eb", "auto_stories"),
+    ProcStatus.GENERATING: _progress_item("Designing Slides...", "#7c3aed", "slideshow"),
+    ProcStatus.ANALYZING_SUMMARY: _progress_item("Summarizing Content...", "#ea580c", "summarize"),
+    ProcStatus.ANALYZING_REVIEW: _progress_item(
+        "Expert Review in Progress (3-Step Agent Pipeline)...", "#7c3aed", "psychology"
+    ),
+    ProcStatus.GENERATING_PDF: _progress_item("Rendering PDF...", "#db2777", "picture_as_pdf"),
+}
+# Indexed by ProcStatus value; None where no spinner is shown
+_PROGRESS_STATUS_TUPLE: tuple[tuple[str, str, me.Style, me.Style] | None, ...] = tuple(
+    _PROGRESS_ITEMS.get(status) for status in ProcStatus
+)
 
 
 def _progress_indicator(state: State) -> None:
-    status_map = {
-        "analyzing": ("Reading & Analyzing Document...", "#2563eb", "auto_stories"),
-        "generating": ("Designing Slides...", "#7c3aed", "slideshow"),
-        "analyzing_summary": ("Summarizing Content...", "#ea580c", "summarize"),
-        "analyzing_review": ("Expert Review in Progress (3-Step Agent Pipeline)...", "#7c3aed", "psychology"),
-        "generating_pdf": ("Rendering PDF...", "#db2777", "picture_as_pdf"),
-    }
-    item = status_map.get(state.processing_status)
-    if item:
-        label, colour, icon_name = item
-        with me.box(
-            style=me.Style(
-                display="flex",
-                align_items="center",
-                gap=12,
-                margin=me.Margin(top=16),
-                background="#f0f9ff",
-                padding=me.Padding.all(12),
-                border_radius=8,
-                border=me.Border.all(me.BorderSide(width=1, color="#bfdbfe")),
-            )
-        ):
-            me.progress_spinner(diameter=20, stroke_width=2)
-            me.icon(icon_name, style=me.Style(color=colour, font_size=20))
-            me.text(label, style=me.Style(color=colour, font_weight=600, font_size=14))
-        with me.box(style=me.Style(margin=me.Margin(left=16, top=8))):
-            me.button("Hủy lệnh", on_click=request_cancel, color="warn", type="stroked")
+    item = _PROGRESS_STATUS_TUPLE[state.processing_status]
+    if item is None:
+        return
+    label, icon_name, icon_style, label_style = item
+    with me.box(style=_PROGRESS_BOX_STYLE):
+        me.progress_spinner(diameter=20, stroke_width=2)
+        me.icon(icon_name, style=icon_style)
+        me.text(label, style=label_style)
+    with me.box(style=_CANCEL_BUTTON_ROW_STYLE):
+        me.button("Hủy lệnh", on_click=request_cancel, color="warn", type="stroked")
 
 
 def _cancel_dialog() -> None:
-    with (
-        me.box(
-            style=me.Style(
-                position="fixed",
-                top=0,
-                left=0,
-                right=0,
-                bottom=0,
-                background="rgba(0,0,0,0.5)",
-                z_index=1000,
-                display="flex",
-                justify_content="center",
-                align_items="center",
-            )
-        ),
-        me.box(
-            style=me.Style(
-                background="white",
-                padding=me.Padding.all(24),
-                border_radius=12,
-                width="400px",
-                box_shadow="0 10px 15px -3px rgba(0, 0, 0, 0.1)",
-            )
-        ),
-    ):
-        me.text("Xác nhận hủy", style=me.Style(font_size=20, font_weight="bold", margin=me.Margin(bottom=16)))
-        me.text("Bạn có chắc muốn hủy lệnh đang chạy?", style=me.Style(margin=me.Margin(bottom=24), color="#4b5563"))
-        with me.box(style=me.Style(display="flex", justify_content="flex-end", gap=16)):
+    with me.box(style=_CANCEL_OVERLAY_STYLE), me.box(style=_CANCEL_DIALOG_STYLE):
+        me.text("Xác nhận hủy", style=_CANCEL_TITLE_STYLE)
+        me.text("Bạn có chắc muốn hủy lệnh đang chạy?", style=_CANCEL_TEXT_STYLE)
+        with me.box(style=_CANCEL_ACTIONS_STYLE):
             me.button("Không, quay lại", on_click=dismiss_cancel)
             me.button("Có, Hủy ngay", on_click=confirm_cancel, color="warn")
 
 
 def _error_box(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            background="#fef2f2",
-            padding=me.Padding.all(12),
-            border_radius=8,
-            border=me.Border.all(me.BorderSide(width=1, color="#fecaca")),
-        )
-    ):
-        me.text(f"Error: {state.error_message}", style=me.Style(color="#991b1b", font_size=14))
+    with me.box(style=_ERROR_BOX_STYLE):
+        me.text(f"Error: {state.error_message}", style=_ERROR_TEXT_STYLE)
         if state.resume_data:
-            with me.box(style=me.Style(margin=me.Margin(top=12), display="flex", align_items="center", gap=12)):
+            with me.box(style=_RESUME_ROW_STYLE):
                 me.button(
                     "🔄 Chạy tiếp (Resume)",
                     on_click=resume_review,
                     color="primary",
                     type="flat",
-                    style=me.Style(font_weight="bold"),
-                )
-                me.text(
-                    "Giữ lại tiến độ, chỉ chạy lại phần lỗi.",
-                    style=me.Style(font_size=12, color="#7f1d1d", font_style="italic"),
+                    style=_RESUME_BUTTON_STYLE,
                 )
+                me.text("Giữ lại tiến độ, chỉ chạy lại phần lỗi.", style=_RESUME_HINT_STYLE)
+
+
+_PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+# Files are delivered as data: URIs.  The ``mesop`` CLI server exposes no hook
+# for extra HTTP routes, so bytes cannot be streamed from app.ui.blobs; the
+# encoding (pybase64 when installed) runs once per file, normally on the
+# worker thread that produced it (app.ui.blobs.encode_blob), and the text is
+# kept with the blob.  State holds only the blob token, and reset_status
+# frees the blob along with its text.
+_DOWNLOAD_ANCHOR_TPL = (
+    '<a href="data:%s;base64,%s" download="%s" '
+    'style="display:inline-block;background:%s;color:white;padding:12px 24px;'
+    'text-decoration:none;border-radius:8px;font-weight:600;font-family:Inter,sans-serif;">'
+    "%s</a>"
+)
+
+
+def _download_anchor(token: str, mime: str, filename: str, colour: str, label: str) -> str:
+    """Download link for a stored file; the payload is encoded once per file, not per render."""
+    payload = get_blob_b64(token)
+    return _DOWNLOAD_ANCHOR_TPL % (mime, payload, html.escape(filename), colour, label)
+
+
+_RESTART_BUTTON_STYLE = me.Style(margin=me.Margin(top=16))
+
+
+@functools.lru_cache(maxsize=4)
+def _download_card_styles(bg: str, border_c: str, icon_c: str, txt_c: str) -> tuple[me.Style, me.Style, me.Style]:
+    """Box, icon and title styles of a download card; one set per colour scheme."""
+    box = me.Style(
+        background=bg,
+        padding=me.Padding.all(24),
+        border_radius=12,
+        border=me.Border.all(me.BorderSide(width=1, color=border_c)),
+        display="flex",
+        flex_direction="column",
+        align_items="center",
+        gap=16,
+        text_align="center",
+    )
+    return box, me.Style(color=icon_c, font_size=48), me.Style(font_size=20, font_weight=600, color=txt_c)
 
 
 def _download_pptx(state: State) -> None:
-    with me.box(
-        style=me.Style(
-            background="#ecfdf5",
-            padding=me.Padding.all(24),
-            border_radius=12,
-            border=me.Border.all(me.BorderSide(width=1, color="#6ee7b7")),
-            display="flex",
-            flex_direction="column",
-            align_items="center",
-            gap=16,
-            text_align="center",
-        )
-    ):
-        me.icon("check_circle", style=me.Style(color="#059669", font_size=48))
-        me.text("Presentation Ready!", style=me.Style(font_size=20, font_weight=600, color="#065f46"))
-        data_uri = f"data:application/vnd.openxmlformats-officedocument.presentationml.presentation;base64,{state.pptx_content_base64}"
-        me.html(
-            f'<a href="{data_uri}" download="{state.pptx_filename}" '
-            'style="display:inline-block;background:#0284c7;color:white;padding:12px 24px;'
-            'text-decoration:none;border-radius:8px;font-weight:600;font-family:Inter,sans-serif;">'
-            "Download PowerPoint</a>"
-        )
+    box_style, icon_style, title_style = _download_card_styles("#ecfdf5", "#6ee7b7", "#059669", "#065f46")
+    with me.box(style=box_style):
+        me.icon("check_circle", style=icon_style)
+        me.text("Presentation Ready!", style=title_style)
+        me.html(_download_anchor(state.pptx_token, _PPTX_MIME, state.pptx_filename, "#0284c7", "Download PowerPoint"))
         me.button(
             "Create Another",
-            on_click=lambda e: setattr(state, "processing_status", "idle"),
-            style=me.Style(margin=me.Margin(top=16)),
+            on_click=reset_status,
+            style=_RESTART_BUTTON_STYLE,
         )
 
 
 def _download_pdf(state: State, label: str, bg: str, border_c: str, btn_c: str, txt_c: str, icon_name: str) -> None:
-    with me.box(
-        style=me.Style(
-            background=bg,
-            padding=me.Padding.all(24),
-            border_radius=12,
-            border=me.Border.all(me.BorderSide(width=1, color=border_c)),
-            display="flex",
-            flex_direction="column",
-            align_items="center",
-            gap=16,
-            text_align="center",
-        )
-    ):
-        me.icon(icon_name, style=me.Style(color=btn_c, font_size=48))
-        me.text(f"{label} Ready!", style=me.Style(font_size=20, font_weight=600, color=txt_c))
-        data_uri = f"data:application/pdf;base64,{state.pdf_content_base64}"
+    box_style, icon_style, title_style = _download_card_styles(bg, border_c, btn_c, txt_c)
+    with me.box(style=box_style):
+        me.icon(icon_name, style=icon_style)
+        me.text(f"{label} Ready!", style=title_style)
         me.html(
-            f'<a href="{data_uri}" download="{state.pdf_filename}" '
-            f'style="display:inline-block;background:{btn_c};color:white;padding:12px 24px;'
-            'text-decoration:none;border-radius:8px;font-weight:600;font-family:Inter,sans-serif;">'
-            f"Download {label} PDF</a>"
+            _download_anchor(state.pdf_token, "application/pdf", state.pdf_filename, btn_c, f"Download {label} PDF")
         )
         me.button(
             "Start Over",
-            on_click=lambda e: setattr(state, "processing_status", "idle"),
-            style=me.Style(margin=me.Margin(top=16)),
+            on_click=reset_status,
+            style=_RESTART_BUTTON_STYLE,
         )
@@ -1,58 +1,94 @@
 """Mesop UI state definition.
 
 Single ``@me.stateclass`` holding all reactive fields for the Mesop page.
+
+Fields are deliberately flat.  Mesop diffs state with DeepDiff, which
+recurses into nested dataclasses, and rebuilds state from JSON on every
+request, so grouping fields adds diff work without giving renders a
+stable object identity to memoise on.  Bulk data lives in ``app.ui.blobs``.
+
+``__slots__`` is not used: ``me.stateclass`` forwards its keyword arguments
+to Mesop's own dataclass wrapper, which rejects ``slots=True``, and there
+are no nested containers to slot instead.
 """
 
 from __future__ import annotations
 
 from dataclasses import field
+from enum import IntEnum
 
 import mesop as me
 
 from app.config import settings
 
 
+class ProcStatus(IntEnum):
+    """``processing_status`` values.
+
+    State round-trips through JSON as a plain ``int``; IntEnum members compare
+    equal to it, so checks work on either form.
+    """
+
+    IDLE = 0
+    READY = 1
+    ANALYZING = 2
+    GENERATING = 3
+    ANALYZING_SUMMARY = 4
+    ANALYZING_REVIEW = 5
+    GENERATING_PDF = 6
+    DONE = 7
+    SUMMARY_DONE = 8
+    REVIEW_DONE = 9
+    ERROR = 10
+
+
 @me.stateclass
 class State:
     # ── Processing ──────────────────────────────────────────────────────
-    processing_status: str = "idle"
+    processing_status: ProcStatus = ProcStatus.IDLE
     logs: list[str] = field(default_factory=list)
+    show_full_logs: bool = False
     error_message: str = ""
 
     # ── Input ───────────────────────────────────────────────────────────
-    uploaded_file_bytes: bytes = b""
+    uploaded_file_token: str = ""  # Key into app.ui.blobs; bytes stay server-side
     uploaded_mime_type: str = ""
     uploaded_filename: str = ""
     user_topic: str = ""
 
     # ── Template ────────────────────────────────────────────────────────
-    template_file_bytes: bytes = b""
+    template_file_token: str = ""
     template_filename: str = ""
 
     # ── Slide output ────────────────────────────────────────────────────
     pptx_filename: str = ""
-    pptx_content_base64: str = ""
+    pptx_token: str = ""  # Key into app.ui.blobs
 
     # ── Summary/Review output ───────────────────────────────────────────
     pdf_filename: str = ""
-    pdf_content_base64: str = ""
+    pdf_token: str = ""  # Key into app.ui.blobs
+    streaming_preview: str = ""  # Editor text streamed so far (Ollama only)
 
     # ── Config toggles ──────────────────────────────────────────────────
     is_detailed: bool = False
+    force_refresh: bool = False  # Bypass cached results for identical requests
     user_instructions: str = ""
 
     # ── Cancellation ────────────────────────────────────────────────────
+    session_id: str = ""  # Keys this session's running job in the handlers
     show_cancel_dialog: bool = False
     cancel_requested: bool = False
 
     # ── Advanced ────────────────────────────────────────────────────────
     use_multi_key: bool = False
     user_api_keys_input: str = ""
+    user_api_keys: list[str] = field(default_factory=list)  # Parsed on blur
     review_language: str = "Tiếng Việt"
 
     # ── AI Provider (auto-detected in on_load) ──────────────────────────
     ai_provider: str = ""
     openai_api_keys_input: str = ""
+    openai_api_keys: list[str] = field(default_factory=list)  # Parsed on blur
     ollama_base_url: str = settings.ollama_base_url
 
     # ── Resume state for review pipeline ────────────────────────────────
@@ -24,13 +24,15 @@ def _isolated_env(monkeypatch, tmp_path):
     monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11444/v1")
     monkeypatch.setenv("OLLAMA_API_KEY", "test-key")
     monkeypatch.setenv("DEFAULT_PROVIDER", "ollama")
-    # Use a temp cancel signal file so tests don't pollute the workspace
-    monkeypatch.setenv("CANCEL_SIGNAL_FILE", str(tmp_path / "cancel.flag"))
 
     # Clear the cached settings singleton so each test picks up monkeypatched env
     from app.config import get_settings
 
     get_settings.cache_clear()
+    # Keep review crash-resume checkpoints out of the real home directory
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "review_checkpoint_dir", str(tmp_path / "checkpoints"))
     yield
     get_settings.cache_clear()
 
@@ -0,0 +1,126 @@
+"""Tests for app.ui.blobs — server-side upload store."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.ui import blobs
+from app.ui.blobs import discard_blob, encode_blob, get_blob, get_blob_b64, put_blob
+
+
+@pytest.fixture(autouse=True)
+def _empty_store():
+    blobs._blobs.clear()
+    blobs._encoded.clear()
+    yield
+    blobs._blobs.clear()
+    blobs._encoded.clear()
+
+
+class TestBlobStore:
+    def test_round_trip_returns_same_object(self):
+        data = b"%PDF-1.4 payload"
+        token = put_blob(data)
+        assert get_blob(token) is data
+
+    def test_unknown_and_empty_token(self):
+        assert get_blob("nope") == b""
+        assert get_blob("") == b""
+
+    def test_discard(self):
+        token = put_blob(b"x")
+        discard_blob(token)
+        assert get_blob(token) == b""
+        discard_blob(token)  # idempotent
+
+    def test_session_oldest_evicted_when_full(self, monkeypatch):
+        monkeypatch.setattr(blobs, "_MAX_BLOBS_PER_SESSION", 2)
+        first = put_blob(b"1", "a")
+        second = put_blob(b"2", "a")
+        third = put_blob(b"3", "a")
+        assert get_blob(first) == b""
+        assert get_blob(second) == b"2"
+        assert get_blob(third) == b"3"
+
+    def test_other_sessions_never_evicted(self, monkeypatch):
+        monkeypatch.setattr(blobs, "_MAX_BLOBS_PER_SESSION", 1)
+        upload = put_blob(b"upload", "a")
+        for i in range(10):
+            put_blob(b"%d" % i, "b")
+        assert get_blob(upload) == b"upload"
+
+    def test_expired_entries_are_ignored(self, monkeypatch):
+        token = put_blob(b"old")
+        monkeypatch.setattr(blobs, "_BLOB_TTL", -1.0)
+        assert get_blob(token) == b""
+
+
+class TestBlobSpill:
+    """Blobs above the spill threshold live in a temp file, not in memory."""
+
+    @pytest.fixture(autouse=True)
+    def _small_threshold(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(blobs, "_SPILL_BYTES", 4)
+        monkeypatch.setattr(blobs.tempfile, "tempdir", str(tmp_path))
+
+    def test_large_blob_round_trips_from_disk(self, tmp_path):
+        token = put_blob(b"large payload")
+        data, path, _, _ = blobs._blobs[token]
+        assert data == b""
+        assert path.startswith(str(tmp_path))
+        assert get_blob(token) == b"large payload"
+
+    def test_small_blob_stays_in_memory(self):
+        token = put_blob(b"tiny")
+        assert blobs._blobs[token][1] == ""
+
+    def test_discard_and_eviction_remove_file(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(blobs, "_MAX_BLOBS_PER_SESSION", 1)
+        first = put_blob(b"first payload", "a")
+        second = put_blob(b"second payload", "a")
+        assert get_blob(first) == b""
+        discard_blob(second)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_expired_file_removed_on_lookup(self, monkeypatch, tmp_path):
+        token = put_blob(b"large payload")
+        monkeypatch.setattr(blobs, "_BLOB_TTL", -1.0)
+        assert get_blob("other") == b""
+        assert token not in blobs._blobs
+        assert list(tmp_path.iterdir()) == []
+
+    def test_exit_cleanup_removes_files(self, tmp_path):
+        put_blob(b"first payload")
+        put_blob(b"second payload")
+        blobs._drop_all()
+        assert blobs._blobs == {}
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestBlobBase64:
+    """Download payloads can be encoded ahead of the render that shows them."""
+
+    def test_prefetched_text_is_reused(self):
+        token = put_blob(b"%PDF-1.4")
+        encode_blob(token)
+        text = get_blob_b64(token)
+        assert text == "JVBERi0xLjQ="
+        assert get_blob_b64(token) is text
+
+    def test_encoded_on_demand_and_kept(self):
+        token = put_blob(b"%PDF-1.4")
+        assert get_blob_b64(token) == "JVBERi0xLjQ="
+        assert blobs._encoded[token] == "JVBERi0xLjQ="
+
+    def test_unknown_token_is_empty(self):
+        assert get_blob_b64("nope") == ""
+
+    def test_discard_drops_prefetched_text(self):
+        token = put_blob(b"x")
+        encode_blob(token)
+        discard_blob(token)
+        assert blobs._encoded == {}
+
+    def test_unknown_token_is_not_encoded(self):
+        encode_blob("nope")
+        assert blobs._encoded == {}
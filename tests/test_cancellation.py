@@ -1,87 +1,63 @@
-"""Tests for app.core.cancellation — thread-safe cancel signal."""
+"""Tests for app.core.cancellation — per-request CancelToken."""
 
 from __future__ import annotations
 
-import os
+import asyncio
+import threading
+import time
 
-from app.core.cancellation import (
-    check_cancel_signal,
-    clear_cancel_signal,
-    set_cancel_signal,
-)
+import pytest
 
+from app.core.cancellation import CancelToken
 
-class TestCancellation:
-    """Test the cancel signal mechanism."""
 
-    def test_initial_state_is_clear(self):
-        clear_cancel_signal()
-        assert check_cancel_signal() is False
+class TestCancelToken:
+    """CancelToken provides per-request cancellation."""
 
-    def test_set_then_check(self):
-        clear_cancel_signal()
-        set_cancel_signal()
-        assert check_cancel_signal() is True
+    def test_initial_state(self):
+        token = CancelToken()
+        assert not token.is_set()
 
-    def test_set_then_clear_then_check(self):
-        set_cancel_signal()
-        clear_cancel_signal()
-        assert check_cancel_signal() is False
+    def test_cancel(self):
+        token = CancelToken()
+        token.cancel()
+        assert token.is_set()
 
-    def test_flag_file_created(self, tmp_path):
-        """set_cancel_signal creates a file; clear removes it.
+    def test_reset(self):
+        token = CancelToken()
+        token.cancel()
+        token.reset()
+        assert not token.is_set()
 
-        The cancellation module uses the module-level `settings` import,
-        so we test by checking the actual file it writes to.
-        """
-        import importlib
+    def test_thread_safe(self):
+        """Multiple threads can check/set the token safely."""
+        token = CancelToken()
+        results = []
 
-        import app.config
-        import app.core.cancellation as cancel_mod
+        def worker():
+            time.sleep(0.05)
+            results.append(token.is_set())
 
-        # Force config.py to recreate settings with monkeypatched env
-        app.config.get_settings.cache_clear()
-        app.config.settings = app.config.get_settings()
-        importlib.reload(cancel_mod)
-        cfg = app.config.settings
-
-        cancel_mod.clear_cancel_signal()
-        cancel_mod.set_cancel_signal()
-        assert os.path.exists(cfg.cancel_signal_file)
-
-        cancel_mod.clear_cancel_signal()
-        assert not os.path.exists(cfg.cancel_signal_file)
-
-    def test_multiple_sets_idempotent(self):
-        clear_cancel_signal()
-        set_cancel_signal()
-        set_cancel_signal()
-        set_cancel_signal()
-        assert check_cancel_signal() is True
-        clear_cancel_signal()
-        assert check_cancel_signal() is False
-
-    def test_thread_safety(self):
-        """Concurrent set/clear should not raise."""
-        import threading
-
-        clear_cancel_signal()
-        errors: list[Exception] = []
-
-        def toggle(n: int):
-            try:
-                for _ in range(n):
-                    set_cancel_signal()
-                    check_cancel_signal()
-                    clear_cancel_signal()
-            except Exception as e:
-                errors.append(e)
-
-        threads = [threading.Thread(target=toggle, args=(50,)) for _ in range(4)]
+        threads = [threading.Thread(target=worker) for _ in range(5)]
         for t in threads:
             t.start()
+        token.cancel()
         for t in threads:
             t.join()
 
-        assert len(errors) == 0
-        clear_cancel_signal()
+        # All threads should have seen the cancellation (set before they check)
+        assert all(results)
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_when_already_cancelled(self):
+        token = CancelToken()
+        token.cancel()
+        await token.wait()
+
+    @pytest.mark.asyncio
+    async def test_wait_woken_from_other_thread(self):
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+        await asyncio.wait_for(token.wait(), timeout=2)
+        assert token.is_set()
+        assert token._waiters == []
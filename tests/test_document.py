@@ -11,6 +11,7 @@ from app.services.document import (
     extract_text_from_docx,
     extract_text_from_epub,
     extract_text_from_pdf,
+    iter_text_from_pdf,
     load_document,
 )
 
@@ -26,6 +27,11 @@ class TestLoadDocument:
         with pytest.raises(ValueError, match="rỗng"):
             load_document(b"", "application/pdf")
 
+    def test_non_bytes_buffer_rejected(self, sample_pdf_bytes):
+        # BytesIO would silently copy these; callers must pass bytes
+        with pytest.raises(TypeError, match="memoryview"):
+            load_document(memoryview(sample_pdf_bytes), "application/pdf")
+
     def test_load_pdf(self, sample_pdf_bytes):
         text = load_document(sample_pdf_bytes, "application/pdf")
         assert "Artificial Intelligence" in text or "test document" in text.lower()
@@ -39,6 +45,11 @@ class TestLoadDocument:
         text = load_document(sample_epub_bytes, "application/epub+zip")
         assert "artificial intelligence" in text.lower() or len(text) > 10
 
+    def test_extension_map_matches_extractors(self):
+        from app.services.document import _EXTRACTORS, MIME_BY_EXTENSION
+
+        assert set(MIME_BY_EXTENSION.values()) == set(_EXTRACTORS)
+
     def test_all_supported_mimes(self):
         """Verify all three MIME types are recognized (no crash on dispatch)."""
         supported = [
@@ -84,6 +95,12 @@ class TestExtractPdf:
         text = extract_text_from_pdf(buf.getvalue())
         assert "science" in text.lower()
         assert "technology" in text.lower()
+        assert "\n\n" in text
+
+    def test_iter_pages(self, sample_pdf_bytes):
+        pages = list(iter_text_from_pdf(sample_pdf_bytes))
+        assert len(pages) == 1
+        assert "Artificial Intelligence" in pages[0]
 
 
 class TestExtractDocx:
@@ -124,6 +141,68 @@ class TestExtractEpub:
         with pytest.raises(Exception):
             extract_text_from_epub(b"not an epub file")
 
+    def test_multi_chapter_order_preserved(self):
+        """Chapters parsed in parallel must still come back in book order."""
+        from ebooklib import epub
+
+        book = epub.EpubBook()
+        book.set_identifier("multi")
+        book.set_title("Multi")
+        chapters = []
+        for i in range(6):
+            ch = epub.EpubHtml(title=f"Ch {i}", file_name=f"ch{i}.xhtml")
+            ch.content = f"<h1>Chapter {i}</h1><p>{'Lorem ipsum dolor sit amet. ' * 3}marker-{i}</p>"
+            book.add_item(ch)
+            chapters.append(ch)
+        book.toc = chapters
+        book.add_item(epub.EpubNcx())
+        book.add_item(epub.EpubNav())
+        book.spine = chapters
+        buf = io.BytesIO()
+        epub.write_epub(buf, book)
+
+        text = extract_text_from_epub(buf.getvalue())
+        positions = [text.index(f"marker-{i}") for i in range(6)]
+        assert positions == sorted(positions)
+
+    def test_chapter_parsers_agree(self, monkeypatch):
+        """selectolax and the BeautifulSoup fallback extract the same text."""
+        import app.services.document as document
+
+        pytest.importorskip("selectolax")
+        html = (
+            b'<?xml version="1.0" encoding="utf-8"?><html xmlns="http://www.w3.org/1999/xhtml">'
+            b"<head><title>T</title></head><body><h1>Ti\xc3\xaau \xc4\x91\xe1\xbb\x81</h1>"
+            b"<p>Some <b>bold</b> text &amp; more</p>\n  <p>  tail </p></body></html>"
+        )
+        fast = document._parse_chapter(html)
+        monkeypatch.setattr(document, "HAS_SELECTOLAX", False)
+        assert fast == document._parse_chapter(html)
+
+    def test_stdlib_parser_fallback(self, monkeypatch):
+        """Without lxml, BeautifulSoup's html.parser gives the same text."""
+        import app.services.document as document
+
+        monkeypatch.setattr(document, "HAS_SELECTOLAX", False)
+        html = b"<html><body><h1>Heading</h1><p>Some <i>body</i> text</p></body></html>"
+        expected = document._parse_chapter(html)
+        monkeypatch.setattr(document, "_BS4_PARSER", "html.parser")
+        assert document._parse_chapter(html) == expected == "Heading Some body text"
+
+    @pytest.mark.parametrize("selectolax", [True, False])
+    def test_chapter_head_script_and_style_skipped(self, monkeypatch, selectolax):
+        """Only body text is kept; title, CSS and JS never reach the prompt."""
+        import app.services.document as document
+
+        if selectolax:
+            pytest.importorskip("selectolax")
+        monkeypatch.setattr(document, "HAS_SELECTOLAX", selectolax)
+        html = (
+            b"<html><head><title>Chapter title</title><style>p { color: red; }</style></head>"
+            b"<body><script>var tracker = 1;</script><p>Body <b>text</b> only</p></body></html>"
+        )
+        assert document._parse_chapter(html) == "Body text only"
+
     def test_epub_temp_file_cleanup(self, sample_epub_bytes):
         """After extraction, temp file should be cleaned up."""
         import os
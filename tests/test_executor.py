@@ -7,7 +7,7 @@ import time
 
 import pytest
 
-from app.core.executor import get_executor, run_in_executor, shutdown_executor
+from app.core.executor import CANCELLED, await_cancellable, get_executor, run_in_executor, shutdown_executor
 
 
 class TestGetExecutor:
@@ -30,6 +30,15 @@ class TestGetExecutor:
         new = get_executor()
         assert new is not old
 
+    def test_size_read_when_created(self, monkeypatch):
+        """SLIDEGENIUS_MAX_WORKERS set after import (e.g. from .env) applies."""
+        shutdown_executor(wait=True)
+        monkeypatch.setenv("SLIDEGENIUS_MAX_WORKERS", "2")
+        try:
+            assert get_executor()._max_workers == 2
+        finally:
+            shutdown_executor(wait=True)
+
     def test_submit_and_result(self):
         """Can submit work and get a result."""
         ex = get_executor()
@@ -83,65 +92,79 @@ class TestRunInExecutor:
         assert worker_thread != main_thread
 
 
-class TestShutdownExecutor:
-    """shutdown_executor() cleans up the pool."""
-
-    def test_shutdown_clears_reference(self):
-        get_executor()  # ensure one exists
-        shutdown_executor(wait=True)
-        # After shutdown, get_executor creates a new one
-        new = get_executor()
-        assert new is not None
+class TestAwaitCancellable:
+    """await_cancellable() waits on a pool future without polling for completion."""
 
-    def test_double_shutdown_safe(self):
-        """Calling shutdown twice doesn't raise."""
-        shutdown_executor(wait=True)
-        shutdown_executor(wait=True)  # no-op
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        future = get_executor().submit(lambda: 42)
+        assert await await_cancellable(future, lambda: False) == 42
 
+    @pytest.mark.asyncio
+    async def test_result_not_delayed_by_poll_interval(self):
+        future = get_executor().submit(time.sleep, 0.05)
+        start = time.monotonic()
+        await await_cancellable(future, lambda: False, poll_interval=5.0)
+        assert time.monotonic() - start < 1.0
 
-class TestCancelToken:
-    """CancelToken provides per-request cancellation."""
+    @pytest.mark.asyncio
+    async def test_propagates_exception(self):
+        def boom():
+            raise ValueError("worker failed")
 
-    def test_initial_state(self):
-        from app.core.cancellation import CancelToken
+        future = get_executor().submit(boom)
+        with pytest.raises(ValueError, match="worker failed"):
+            await await_cancellable(future, lambda: False)
 
-        token = CancelToken()
-        assert not token.is_set()
+    @pytest.mark.asyncio
+    async def test_token_cancel_is_immediate(self):
+        import threading
 
-    def test_cancel(self):
         from app.core.cancellation import CancelToken
 
         token = CancelToken()
-        token.cancel()
-        assert token.is_set()
+        release = threading.Event()
+        future = get_executor().submit(release.wait, 5)
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        try:
+            result = await await_cancellable(future, lambda: False, poll_interval=5.0, token=token)
+        finally:
+            release.set()
+        assert result is CANCELLED
+        assert time.monotonic() - start < 1.0
 
-    def test_reset(self):
+    @pytest.mark.asyncio
+    async def test_token_only_returns_result(self):
         from app.core.cancellation import CancelToken
 
-        token = CancelToken()
-        token.cancel()
-        token.reset()
-        assert not token.is_set()
+        future = get_executor().submit(lambda: 42)
+        assert await await_cancellable(future, token=CancelToken()) == 42
 
-    def test_thread_safe(self):
-        """Multiple threads can check/set the token safely."""
-        from app.core.cancellation import CancelToken
+    @pytest.mark.asyncio
+    async def test_cancel_wins(self):
+        import threading
 
-        token = CancelToken()
-        results = []
+        release = threading.Event()
+        future = get_executor().submit(release.wait, 5)
+        try:
+            result = await await_cancellable(future, lambda: True, poll_interval=0.01)
+        finally:
+            release.set()
+        assert result is CANCELLED
 
-        def worker():
-            time.sleep(0.05)
-            results.append(token.is_set())
 
-        import threading
+class TestShutdownExecutor:
+    """shutdown_executor() cleans up the pool."""
 
-        threads = [threading.Thread(target=worker) for _ in range(5)]
-        for t in threads:
-            t.start()
-        token.cancel()
-        for t in threads:
-            t.join()
+    def test_shutdown_clears_reference(self):
+        get_executor()  # ensure one exists
+        shutdown_executor(wait=True)
+        # After shutdown, get_executor creates a new one
+        new = get_executor()
+        assert new is not None
 
-        # All threads should have seen the cancellation (set before they check)
-        assert all(results)
+    def test_double_shutdown_safe(self):
+        """Calling shutdown twice doesn't raise."""
+        shutdown_executor(wait=True)
+        shutdown_executor(wait=True)  # no-op
@@ -28,6 +28,122 @@ class TestGeminiProvider:
         p = GeminiProvider()
         assert p._resolve_env_keys() == ["my-api-key"]
 
+    def test_generation_config_reused(self):
+        p = GeminiProvider(api_keys=["test-key"])
+        first = p._generation_config("sys", True, 0.4)
+        assert p._generation_config("sys", True, 0.4) is first
+        assert first.response_mime_type == "application/json"
+        assert first.system_instruction == "sys"
+
+    def test_generation_config_varies_by_params(self):
+        p = GeminiProvider(api_keys=["test-key"])
+        json_cfg = p._generation_config("", True, 0.4)
+        text_cfg = p._generation_config("", False, 0.4)
+        assert json_cfg is not text_cfg
+        assert text_cfg.response_mime_type == "text/plain"
+        assert text_cfg.system_instruction is None
+
+
+class TestGeminiFileUpload:
+    """PDFs go through the File API once and are then referenced by URI."""
+
+    def _client(self):
+        from unittest.mock import MagicMock
+
+        client = MagicMock()
+        uploaded = MagicMock(uri="https://files/abc", mime_type="application/pdf")
+        uploaded.name = "files/abc"
+        client.files.upload.return_value = uploaded
+        return client
+
+    @pytest.fixture(autouse=True)
+    def _deleted(self, monkeypatch):
+        """Record remote deletions instead of calling the File API."""
+        from app.providers import gemini
+
+        deleted: list[tuple[str, str]] = []
+        monkeypatch.setattr(gemini, "_uploads", {})
+        monkeypatch.setattr(gemini, "_delete_remote", deleted.extend)
+        return deleted
+
+    def test_upload_reused_across_calls(self, monkeypatch):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        client = self._client()
+        first = GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        second = GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        assert client.files.upload.call_count == 1
+        assert first.file_data.file_uri == second.file_data.file_uri == "https://files/abc"
+
+    def test_upload_per_key(self, monkeypatch):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        client = self._client()
+        GeminiProvider._file_part(client, "k1", b"%PDF-1", "application/pdf")
+        GeminiProvider._file_part(client, "k2", b"%PDF-1", "application/pdf")
+        assert client.files.upload.call_count == 2
+
+    def test_upload_failure_falls_back_inline(self, monkeypatch):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        client = self._client()
+        client.files.upload.side_effect = RuntimeError("quota")
+        part = GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        assert part.inline_data.data == b"%PDF-1"
+        assert gemini._uploads == {}
+
+    def test_least_recently_used_evicted_and_deleted(self, monkeypatch, _deleted):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini, "_UPLOAD_CACHE_SIZE", 2)
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        client = self._client()
+        GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        GeminiProvider._file_part(client, "k", b"%PDF-2", "application/pdf")
+        GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")  # now most recent
+        GeminiProvider._file_part(client, "k", b"%PDF-3", "application/pdf")
+        assert _deleted == [("k", "files/abc")]
+        assert len(gemini._uploads) == 2
+        GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        assert client.files.upload.call_count == 3  # %PDF-1 was kept
+
+    def test_expired_upload_deleted_and_replaced(self, monkeypatch, _deleted):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        client = self._client()
+        GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        monkeypatch.setattr(gemini, "_UPLOAD_TTL", -1.0)
+        GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        assert client.files.upload.call_count == 2
+        assert _deleted == [("k", "files/abc")]
+
+    def test_exit_cleanup_deletes_uploads(self, monkeypatch, _deleted):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", True)
+        GeminiProvider._file_part(self._client(), "k", b"%PDF-1", "application/pdf")
+        gemini._delete_all_uploads()
+        assert _deleted == [("k", "files/abc")]
+        assert gemini._uploads == {}
+
+    def test_disabled_by_default(self):
+        from app.config import AppConfig
+
+        assert AppConfig.model_fields["gemini_file_api"].default is False
+
+    def test_disabled_sends_inline(self, monkeypatch):
+        from app.providers import gemini
+
+        monkeypatch.setattr(gemini.settings, "gemini_file_api", False)
+        client = self._client()
+        part = GeminiProvider._file_part(client, "k", b"%PDF-1", "application/pdf")
+        assert part.inline_data.data == b"%PDF-1"
+        client.files.upload.assert_not_called()
+
 
 class TestGeminiErrorClassification:
     """Test _classify_error maps exceptions to correct sentinel types."""
@@ -113,3 +113,17 @@ class TestRobustJsonParse:
         result = robust_json_parse(raw)
         assert result["title"] == "Trí tuệ nhân tạo"
         assert len(result["slides"]) == 2
+
+    # ── Memoised fallback path ──────────────────────────────────────────
+
+    def test_repeated_repair_is_memoised_but_copied(self):
+        from app.core.json_parser import _lenient_parse
+
+        raw = "{'items': [1, 2,],}"
+        _lenient_parse.cache_clear()
+        first = robust_json_parse(raw)
+        first["items"].append(3)
+        second = robust_json_parse(raw)
+
+        assert second == {"items": [1, 2]}
+        assert _lenient_parse.cache_info().hits == 1
@@ -0,0 +1,81 @@
+"""Tests for app.core.llm_cache — on-disk LLM response cache."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from app.core import llm_cache
+from app.core.llm_cache import LLMCache, file_digest, get_llm_cache
+
+
+class TestLLMCache:
+    """Key derivation, round trip and expiry."""
+
+    def test_round_trip(self, tmp_path):
+        cache = LLMCache(str(tmp_path / "c"), ttl=60)
+        key = cache.make_key(prompt="hi", temperature=0.3)
+        assert cache.get(key) is None
+        cache.set(key, ("answer", "model-a"))
+        assert cache.get(key) == ("answer", "model-a")
+
+    def test_key_is_order_independent_and_sensitive(self):
+        a = LLMCache.make_key(prompt="hi", temperature=0.3)
+        assert a == LLMCache.make_key(temperature=0.3, prompt="hi")
+        assert a != LLMCache.make_key(prompt="hi", temperature=0.4)
+
+    def test_expired_entry_is_dropped(self, tmp_path):
+        cache = LLMCache(str(tmp_path), ttl=10)
+        key = cache.make_key(prompt="old")
+        cache.set(key, ("stale", "m"))
+        path = os.path.join(str(tmp_path), f"{key}.json")
+        past = time.time() - 60
+        os.utime(path, (past, past))
+        assert cache.get(key) is None
+        assert not os.path.exists(path)
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = LLMCache(str(tmp_path), ttl=60)
+        key = cache.make_key(prompt="x")
+        with open(os.path.join(str(tmp_path), f"{key}.json"), "w") as fh:
+            fh.write("{not json")
+        assert cache.get(key) is None
+
+    def test_file_digest(self):
+        assert file_digest(None) == ""
+        assert file_digest(b"abc") == file_digest(b"abc") != file_digest(b"abd")
+
+    def test_file_digest_memoised_per_object(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "_digest_memo", {})
+        calls = []
+        real = llm_cache.hashlib.blake2b
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(llm_cache.hashlib, "blake2b", counting)
+        data = b"%PDF" * 1000
+        assert file_digest(data) == file_digest(data)
+        assert len(calls) == 1
+        buf = bytearray(b"mutable")
+        file_digest(buf)
+        file_digest(buf)
+        assert len(calls) == 3
+
+
+class TestGetLLMCache:
+    """The shared instance follows settings.llm_cache_enabled."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_enabled", False)
+        assert get_llm_cache() is None
+
+    def test_enabled_uses_configured_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_enabled", True)
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_dir", str(tmp_path))
+        cache = get_llm_cache()
+        assert cache is not None
+        assert cache.directory == str(tmp_path)
+        assert get_llm_cache() is cache
@@ -28,6 +28,12 @@ class TestOpenAIProvider:
         p = OpenAIProvider()
         assert p._resolve_env_keys() == ["sk-my-key"]
 
+    def test_client_reused_per_key(self):
+        p = OpenAIProvider(api_keys=["sk-a", "sk-b"])
+        a = p._client("sk-a")
+        assert p._client("sk-a") is a
+        assert p._client("sk-b") is not a
+
 
 class TestOpenAIErrorClassification:
     """Test _classify_openai_error maps exceptions to correct sentinel types."""
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 import os
 
-from app.rendering.pdf import _markdown_to_xml, save_summary_to_pdf
+import pytest
+
+from app.rendering.pdf import (
+    _markdown_to_xml,
+    _markdown_to_xml_any,
+    render_summary_pdf,
+    save_summaries_batch,
+    save_summary_to_pdf,
+)
 
 
 class TestMarkdownToXml:
@@ -37,6 +45,16 @@ class TestMarkdownToXml:
         assert "&lt;" in result
         assert "&gt;" in result
 
+    def test_escape_is_single_pass(self):
+        """Existing entities are escaped once, not double-processed."""
+        assert _markdown_to_xml("a &lt; b") == "a &amp;lt; b"
+
+    def test_any_serialises_non_strings(self):
+        assert _markdown_to_xml_any(["**x**"]) == '["<b>x</b>"]'
+
+    def test_any_passes_strings_through(self):
+        assert _markdown_to_xml_any("**x**") == _markdown_to_xml("**x**")
+
 
 class TestSaveSummaryToPdf:
     """Test PDF generation — save_summary_to_pdf expects a dict, returns a filepath."""
@@ -98,3 +116,138 @@ class TestSaveSummaryToPdf:
         }
         result = save_summary_to_pdf(data, out)
         assert os.path.isfile(result)
+
+
+class TestRenderSummaryPdf:
+    """In-memory rendering for the UI (no temp file)."""
+
+    def test_returns_pdf_bytes(self):
+        data = {"overview": "In memory", "key_points": ["a"], "conclusion": ""}
+        pdf = render_summary_pdf(data)
+        assert pdf.startswith(b"%PDF-")
+
+    def test_no_file_written(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        render_summary_pdf({"overview": "x", "key_points": [], "conclusion": ""})
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSaveSummariesBatch:
+    """Batch rendering across worker processes."""
+
+    def test_batch_preserves_order(self, tmp_path):
+        items = [
+            ({"overview": f"Part {i}", "key_points": [], "conclusion": ""}, str(tmp_path / f"part{i}.pdf"))
+            for i in range(3)
+        ]
+        paths = save_summaries_batch(items)
+        assert paths == [os.path.abspath(out) for _, out in items]
+        for path in paths:
+            with open(path, "rb") as f:
+                assert f.read(5) == b"%PDF-"
+
+    def test_empty_batch(self):
+        assert save_summaries_batch([]) == []
+
+
+class TestPdfStyles:
+    """Derived paragraph styles are built once per stylesheet, not per line."""
+
+    def test_derived_styles_present(self):
+        from app.rendering.pdf import _create_pdf_styles
+
+        styles = _create_pdf_styles("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+        for name in ("line", "line_muted", "brand", "sub_brand", "author", "quote_author", "idea_title", "ai_header"):
+            assert name in styles
+        assert styles["idea_title"].fontName == "Helvetica-Bold"
+
+    def test_styles_cached_per_font_triple(self):
+        from app.rendering.pdf import _create_pdf_styles
+
+        fonts = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+        assert _create_pdf_styles(*fonts) is _create_pdf_styles(*fonts)
+        assert _create_pdf_styles("Times-Roman", "Times-Bold", "Times-Italic") is not _create_pdf_styles(*fonts)
+
+    def test_markdown_lines_reuse_shared_style(self):
+        from app.rendering.pdf import _create_pdf_styles, _parse_markdown_lines
+
+        styles = _create_pdf_styles("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+        story: list = []
+        _parse_markdown_lines(["# One", "---", "# Two"], story, styles)
+        rule_styles = [p.style for p in story if getattr(p, "text", None) == "---"]
+        assert len(rule_styles) == 3
+        assert all(s is styles["line_muted"] for s in rule_styles)
+
+
+class TestFontManifest:
+    """register_fonts() caches the winning font paths in a JSON manifest."""
+
+    def test_manifest_round_trip(self, tmp_path, monkeypatch):
+        from app.rendering import pdf
+
+        font = tmp_path / "Font.ttf"
+        font.write_bytes(b"")
+        # The cache directory is created on first save
+        monkeypatch.setattr(pdf, "_FONT_MANIFEST_PATH", str(tmp_path / "cache" / "fonts.json"))
+
+        entry = {"family": "Test", "regular": str(font), "bold": "", "italic": str(font)}
+        pdf._save_font_manifest(entry)
+        assert pdf._load_font_manifest() == entry
+
+    def test_manifest_with_missing_font_ignored(self, tmp_path, monkeypatch):
+        from app.rendering import pdf
+
+        monkeypatch.setattr(pdf, "_FONT_MANIFEST_PATH", str(tmp_path / "fonts.json"))
+        pdf._save_font_manifest({"family": "Test", "regular": str(tmp_path / "gone.ttf"), "bold": "", "italic": ""})
+        assert pdf._load_font_manifest() is None
+
+    def test_register_fonts_uses_manifest(self, tmp_path, monkeypatch):
+        from app.rendering import pdf
+
+        font = tmp_path / "Font.ttf"
+        font.write_bytes(b"")
+        monkeypatch.setattr(pdf, "_FONT_MANIFEST_PATH", str(tmp_path / "fonts.json"))
+        monkeypatch.setattr(pdf, "HAS_UNICODE_FONT", False)
+        monkeypatch.setattr(pdf, "_fonts_probed", False)
+        pdf._save_font_manifest({"family": "Test", "regular": str(font), "bold": "", "italic": ""})
+
+        calls = []
+        monkeypatch.setattr(pdf, "_register_family", lambda **kw: calls.append(kw))
+        monkeypatch.setattr(pdf, "_first_existing", lambda paths: pytest.fail("candidate scan should be skipped"))
+        pdf.register_fonts()
+        assert calls == [{"family": "Test", "regular": str(font), "bold": "", "italic": ""}]
+
+    def test_register_fonts_probes_once(self, monkeypatch):
+        from app.rendering import pdf
+
+        monkeypatch.setattr(pdf, "HAS_UNICODE_FONT", False)
+        monkeypatch.setattr(pdf, "_fonts_probed", True)
+        monkeypatch.setattr(pdf, "_load_font_manifest", lambda: pytest.fail("already probed"))
+        pdf.register_fonts()
+
+
+class TestParseMarkdownLines:
+    """_parse_markdown_lines dispatches each line on its first character."""
+
+    def _styles_for(self, lines):
+        from app.rendering.pdf import _create_pdf_styles, _parse_markdown_lines
+
+        styles = _create_pdf_styles("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+        story: list = []
+        _parse_markdown_lines(lines, story, styles)
+        return [(getattr(f, "text", None), getattr(getattr(f, "style", None), "name", None)) for f in story]
+
+    def test_headings(self):
+        out = self._styles_for(["## Header", "### Sub"])
+        assert out == [("Header", "CustomHeader"), ("Sub", "CustomSubHeader")]
+
+    def test_prefix_lookalikes_are_paragraphs(self):
+        out = self._styles_for(["#tag", ">note", "-dash", "*it* word"])
+        assert [style for _, style in out] == ["CustomBody"] * 4
+        assert out[3][0] == "<i>it</i> word"
+
+    def test_bullets_and_quote(self):
+        out = self._styles_for(["- **a**", "* b", '> "wise"'])
+        assert out[0] == ("&bull; <b>a</b>", "CustomBody")
+        assert out[1] == ("&bull; b", "CustomBody")
+        assert out[2] == ("<i>“wise”</i>", "CustomQuote")
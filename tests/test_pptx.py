@@ -97,3 +97,51 @@ class TestCreatePptx:
         }
         result = create_pptx(data)
         assert isinstance(result, io.BytesIO)
+
+
+class TestFindBodyShape:
+    """_find_body_shape picks the body placeholder on standard layouts."""
+
+    def test_title_and_content_layout(self):
+        from pptx.enum.shapes import PP_PLACEHOLDER
+
+        from app.rendering.pptx import _find_body_shape
+
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        shape = _find_body_shape(slide)
+        assert shape is not None
+        assert shape.placeholder_format.type in (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT)
+
+    def test_title_only_layout_has_no_body(self):
+        from app.rendering.pptx import _find_body_shape
+
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[5])  # "Title Only"
+        assert _find_body_shape(slide) is None
+
+
+class TestTemplateReuse:
+    """A template's slides are stripped once and the result reused."""
+
+    def test_template_slides_replaced_and_cached(self, monkeypatch):
+        from app.rendering import pptx
+
+        monkeypatch.setattr(pptx, "_cleared_templates", {})
+        template = create_pptx(TestCreatePptx.SAMPLE_SLIDES).getvalue()
+        deck = {"title": "New", "slides": [{"title": "Only", "content": ["x"]}]}
+
+        first = Presentation(create_pptx(deck, template_pptx_bytes=template))
+        assert len(pptx._cleared_templates) == 1
+        second = Presentation(create_pptx(deck, template_pptx_bytes=template))
+
+        assert len(first.slides) == len(second.slides) == 2
+        assert second.slides[1].shapes.title.text == "Only"
+
+    def test_invalid_template_falls_back(self, monkeypatch):
+        from app.rendering import pptx
+
+        monkeypatch.setattr(pptx, "_cleared_templates", {})
+        prs = Presentation(create_pptx(TestCreatePptx.SAMPLE_SLIDES, template_pptx_bytes=b"not a zip"))
+        assert len(prs.slides) == 3
+        assert pptx._cleared_templates == {}
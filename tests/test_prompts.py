@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from app.prompts.common import DOCUMENT_CONTEXT_PREFIX, with_document_text
 from app.prompts.review import (
     PROMPT_REVIEW_ANALYST_FICTION,
     PROMPT_REVIEW_ANALYST_NON_FICTION,
@@ -21,6 +22,16 @@ from app.prompts.summary import (
 )
 
 
+class TestCommonPrompts:
+    """Shared document-context helper."""
+
+    def test_with_document_text_layout(self):
+        assert with_document_text("DOC", "ask") == f"{DOCUMENT_CONTEXT_PREFIX}DOC\n\nask"
+
+    def test_with_document_text_joins_parts(self):
+        assert with_document_text("DOC", "a", "\n", "b").endswith("DOC\n\na\nb")
+
+
 class TestSlidePrompts:
     """Validate slide prompt templates."""
 
@@ -5,7 +5,13 @@ from __future__ import annotations
 import pytest
 
 from app.providers.base import LLMProvider, _AbortAllError, _PermanentModelError, _SkipModelError
-from app.providers.registry import get_provider, list_providers, register_provider, resolve_provider_keys
+from app.providers.registry import (
+    clear_provider_cache,
+    get_provider,
+    list_providers,
+    register_provider,
+    resolve_provider_keys,
+)
 
 # ── Registry tests ──────────────────────────────────────────────────────
 
@@ -59,6 +65,27 @@ class TestRegistry:
         p = get_provider("dummy", api_keys=["key"])
         assert p.name == "dummy"
 
+    def test_get_provider_memoized(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-server")
+        a = get_provider("openai", api_keys=["sk-server"])
+        assert get_provider("openai", api_keys=["sk-server"]) is a
+        assert get_provider("ollama", base_url="http://a:1/v1") is not get_provider("ollama", base_url="http://b:1/v1")
+
+    def test_user_keys_not_memoized(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-server")
+        from app.providers import registry
+
+        clear_provider_cache()
+        a = get_provider("openai", api_keys=["sk-user", "sk-server"])
+        assert get_provider("openai", api_keys=["sk-user", "sk-server"]) is not a
+        assert registry._cached_provider.cache_info().currsize == 0
+
+    def test_clear_provider_cache(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-server")
+        a = get_provider("openai", api_keys=["sk-server"])
+        clear_provider_cache()
+        assert get_provider("openai", api_keys=["sk-server"]) is not a
+
 
 # ── resolve_provider_keys tests ─────────────────────────────────────────
 
@@ -135,6 +162,12 @@ class TestBaseProviderRetry:
         assert text == "Hello!"
         assert model == "model-a"
 
+    def test_stream_callback_ignored_without_streaming_support(self):
+        # StubProvider._call_model has no stream_callback parameter
+        p = self.StubProvider(responses={"model-a": "Hello!"})
+        text, _model = p.generate(system="sys", prompt="hi", stream_callback=lambda chunk: None)
+        assert text == "Hello!"
+
     def test_fallback_to_second_model(self):
         p = self.StubProvider(
             responses={
@@ -188,6 +221,48 @@ class TestBaseProviderRetry:
         _text, model = p.generate(system="sys", prompt="hi")
         assert model == "model-b"
 
+    def test_response_whitespace_stripped_once(self):
+        p = self.StubProvider(responses={"model-a": "  \n padded \n "})
+        text, _model = p.generate(system="sys", prompt="hi")
+        assert text == "padded"
+
+    def test_whitespace_only_response_skipped(self):
+        p = self.StubProvider(responses={"model-a": "   \n", "model-b": "valid"})
+        _text, model = p.generate(system="sys", prompt="hi")
+        assert model == "model-b"
+
+    def test_low_temperature_response_cached(self, monkeypatch, tmp_path):
+        from app.core import llm_cache
+
+        monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(str(tmp_path), ttl=60))
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_enabled", True)
+        p = self.StubProvider(responses={"model-a": "cached!"})
+        first = p.generate(system="sys", prompt="hi", temperature=0.3)
+        second = p.generate(system="sys", prompt="hi", temperature=0.3)
+        assert first == second == ("cached!", "model-a")
+        assert p._call_log == ["model-a"]
+
+    def test_refresh_cache_skips_lookup_and_stores(self, monkeypatch, tmp_path):
+        from app.core import llm_cache
+
+        monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(str(tmp_path), ttl=60))
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_enabled", True)
+        p = self.StubProvider(responses={"model-a": "fresh"})
+        p.generate(system="sys", prompt="hi", temperature=0.3)
+        p.generate(system="sys", prompt="hi", temperature=0.3, refresh_cache=True)
+        p.generate(system="sys", prompt="hi", temperature=0.3)
+        assert p._call_log == ["model-a", "model-a"]
+
+    def test_high_temperature_bypasses_cache(self, monkeypatch, tmp_path):
+        from app.core import llm_cache
+
+        monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(str(tmp_path), ttl=60))
+        monkeypatch.setattr(llm_cache.settings, "llm_cache_enabled", True)
+        p = self.StubProvider(responses={"model-a": "fresh"})
+        p.generate(system="sys", prompt="hi", temperature=0.9)
+        p.generate(system="sys", prompt="hi", temperature=0.9)
+        assert p._call_log == ["model-a", "model-a"]
+
     def test_abort_all_error_stops_immediately(self, monkeypatch):
         monkeypatch.setenv("AI_RETRY_CYCLES", "5")
         from app.config import get_settings
@@ -228,3 +303,99 @@ class TestOllamaProvider:
 
         p = OllamaProvider()
         assert len(p.default_model_list) > 0
+
+    def test_http_client_is_reused(self):
+        from app.providers.ollama import OllamaProvider
+
+        p = OllamaProvider()
+        try:
+            assert p._http_client() is p._http_client()
+        finally:
+            p.close()
+        assert p._http is None
+
+    def test_list_models_uses_shared_client(self):
+        from unittest.mock import MagicMock
+
+        from app.providers.ollama import OllamaProvider
+
+        p = OllamaProvider(base_url="http://ollama.test:11434/v1")
+        client = MagicMock()
+        client.get.return_value.json.return_value = {"models": [{"name": "llama3:8b"}]}
+        p._http = client
+
+        assert p.list_models() == ["llama3:8b"]
+        assert client.get.call_args.args[0] == "http://ollama.test:11434/api/tags"
+
+    def test_list_models_cached_per_server(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from app.providers import ollama
+        from app.providers.ollama import OllamaProvider
+
+        monkeypatch.setattr(ollama, "_model_lists", {})
+        client = MagicMock()
+        client.get.return_value.json.return_value = {"models": [{"name": "llama3:8b"}]}
+        first = OllamaProvider(base_url="http://cache.test:11434/v1")
+        first._http = client
+        second = OllamaProvider(base_url="http://cache.test:11434/v1")
+        second._http = client
+
+        assert first.list_models() == ["llama3:8b"]
+        assert second.list_models() == ["llama3:8b"]
+        assert client.get.call_count == 1
+
+    def test_list_models_falls_back_when_unreachable(self):
+        from unittest.mock import MagicMock
+
+        from app.providers.ollama import OllamaProvider
+
+        p = OllamaProvider()
+        client = MagicMock()
+        client.get.side_effect = OSError("connection refused")
+        p._http = client
+
+        assert p.list_models() == p.default_model_list
+        assert p.check_connectivity() is False
+
+    def test_streams_free_text_chunks(self):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        from app.providers.ollama import OllamaProvider
+
+        def _chunk(text):
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+        p = OllamaProvider(base_url="http://ollama.test:11434/v1")
+        client = MagicMock()
+        client.chat.completions.create.return_value = iter([_chunk("Hel"), _chunk(None), _chunk("lo")])
+        p._clients[("http://ollama.test:11434/v1", "test-key")] = client
+
+        seen: list[str] = []
+        text, _model = p.generate(system="", prompt="hi", model_list=["m"], stream_callback=seen.append)
+
+        assert text == "Hello"
+        assert seen == ["Hel", "lo"]
+        assert client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    def test_json_calls_are_not_streamed(self):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        from app.providers.ollama import OllamaProvider
+
+        p = OllamaProvider(base_url="http://ollama.test:11434/v1")
+        client = MagicMock()
+        message = SimpleNamespace(content='{"a": 1}')
+        client.chat.completions.create.return_value = SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        p._clients[("http://ollama.test:11434/v1", "test-key")] = client
+
+        seen: list[str] = []
+        text, _model = p.generate(
+            system="", prompt="hi", model_list=["m"], response_format_json=True, stream_callback=seen.append
+        )
+
+        assert text == '{"a": 1}'
+        assert seen == []
+        assert "stream" not in client.chat.completions.create.call_args.kwargs
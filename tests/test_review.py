@@ -6,9 +6,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.services import review
 from app.services.review import PartialCompletionError, review_book_syntopic
 
 
+@pytest.fixture(autouse=True)
+def _clear_checkpoints():
+    review._checkpoints.clear()
+    yield
+    review._checkpoints.clear()
+
+
 class TestPartialCompletionError:
     """Test the PartialCompletionError exception."""
 
@@ -292,3 +300,210 @@ class TestReviewBookSyntopic:
         # First call (librarian) should include file_bytes for gemini
         call_kwargs = mock_provider.generate.call_args_list[0][1]
         assert call_kwargs.get("file_bytes") is not None
+
+    @patch("app.services.review.load_document", return_value="Extracted text")
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_text_provider_parses_document_once(self, mock_keys, mock_get_prov, mock_load, sample_pdf_bytes):
+        """Steps 1 and 2 reuse a single extraction for text-only providers."""
+        mock_keys.return_value = ["http://localhost:11434/v1"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            (self.LIBRARIAN_JSON, "m1"),
+            (self.ANALYST_OUTPUT, "m2"),
+            (self.EDITOR_OUTPUT, "m3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="ollama")
+
+        mock_load.assert_called_once_with(sample_pdf_bytes, "application/pdf")
+        for call in mock_provider.generate.call_args_list[:2]:
+            assert "Extracted text" in call[1]["prompt"]
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_speculative_keeps_matching_analyst(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        """Both analyst variants start up front; the one matching the category wins."""
+        from app.prompts.review import (
+            PROMPT_REVIEW_ANALYST_FICTION,
+            PROMPT_REVIEW_ANALYST_NON_FICTION,
+            PROMPT_REVIEW_LIBRARIAN,
+        )
+
+        mock_keys.return_value = ["test-key"]
+        replies = {
+            PROMPT_REVIEW_LIBRARIAN: ('{"category": "Fiction", "genre": "Novel"}', "m1"),
+            PROMPT_REVIEW_ANALYST_FICTION: ("fiction analysis", "m2-fic"),
+            PROMPT_REVIEW_ANALYST_NON_FICTION: ("non-fiction analysis", "m2-non"),
+        }
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = lambda **kw: replies.get(kw["prompt"], (self.EDITOR_OUTPUT, "m3"))
+        mock_get_prov.return_value = mock_provider
+
+        result = review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini", speculative=True)
+
+        prompts = [c[1]["prompt"] for c in mock_provider.generate.call_args_list]
+        # The losing branch may be cancelled before it ever reaches the provider
+        assert PROMPT_REVIEW_ANALYST_FICTION in prompts
+        assert result["used_model"] == "m1->m2-fic->m3"
+        editor_prompt = prompts[-1]
+        assert "fiction analysis" in editor_prompt
+        assert "non-fiction analysis" not in editor_prompt
+
+    def test_abandoned_branch_stops_without_user_cancel(self):
+        """An abandoned branch escapes the provider's retry loop without a "Cancel requested" log."""
+        from app.providers.base import LLMProvider
+
+        class Provider(LLMProvider):
+            name = "stub"
+            default_model_list = ["m"]
+
+            def _call_model(self, **kwargs):
+                return "never"
+
+            def _resolve_env_keys(self):
+                return ["k1", "k2"]
+
+        logged = []
+        check = review._cancel_either(lambda: False, lambda: True)
+        with (
+            patch("app.providers.base.safe_print", side_effect=logged.append),
+            pytest.raises(review._BranchAbandoned),
+        ):
+            Provider().generate(system="", prompt="p", cancel_check=check)
+        assert not any("Cancel" in line or "failed" in line for line in logged)
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_stream_callback_reaches_editor_only(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            (self.LIBRARIAN_JSON, "model-1"),
+            (self.ANALYST_OUTPUT, "model-2"),
+            (self.EDITOR_OUTPUT, "model-3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+        callback = MagicMock()
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="ollama", stream_callback=callback)
+
+        calls = mock_provider.generate.call_args_list
+        assert [c.kwargs.get("stream_callback") for c in calls] == [None, None, callback]
+
+
+class TestReviewCheckpointReuse:
+    """Steps 1-2 are reused across runs of the same document."""
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_language_change_only_reruns_editor(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            ('{"category": "Non-Fiction", "genre": "Science"}', "model-1"),
+            ("Analysis", "model-2"),
+            ("# Review VI", "model-3"),
+            ("# Review EN", "model-3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+        result = review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini", language="English")
+
+        assert mock_provider.generate.call_count == 4
+        assert "English" in mock_provider.generate.call_args.kwargs["prompt"]
+        assert "Analysis" in mock_provider.generate.call_args.kwargs["prompt"]
+        assert result["review_markdown"] == "# Review EN"
+        assert result["used_model"] == "model-1->model-2->model-3"
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_other_provider_does_not_reuse(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            ('{"category": "Fiction", "genre": "Drama"}', "model-1"),
+            ("Analysis", "model-2"),
+            ("# Review", "model-3"),
+        ] * 2
+        mock_get_prov.return_value = mock_provider
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="anthropic")
+
+        assert mock_provider.generate.call_count == 6
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_resume_state_takes_precedence(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            ('{"category": "Fiction", "genre": "Drama"}', "model-1"),
+            ("Cached analysis", "model-2"),
+            ("# Review", "model-3"),
+            ("# Resumed", "model-3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+        resume = {
+            "librarian_data": {"category": "Non-Fiction", "genre": "History"},
+            "model1_name": "m1",
+            "analyst_output": "Resumed analysis",
+            "model2_name": "m2",
+        }
+        result = review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini", resume_state=resume)
+
+        assert "Resumed analysis" in mock_provider.generate.call_args.kwargs["prompt"]
+        assert result["genre"] == "History"
+
+
+class TestReviewCrashResume:
+    """Completed steps are checkpointed to disk until the review finishes."""
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_restart_resumes_from_disk(self, mock_keys, mock_get_prov, sample_pdf_bytes):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            ('{"category": "Fiction", "genre": "Drama"}', "model-1"),
+            RuntimeError("process died"),
+            ("Analysis", "model-2"),
+            ("# Review", "model-3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+
+        with pytest.raises(PartialCompletionError):
+            review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+        review._checkpoints.clear()  # simulate a fresh process
+
+        result = review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+
+        assert mock_provider.generate.call_count == 4
+        assert result["genre"] == "Drama"
+        assert result["used_model"] == "model-1->model-2->model-3"
+
+    @patch("app.services.review.get_provider")
+    @patch("app.services.review.resolve_provider_keys")
+    def test_checkpoint_removed_after_success(self, mock_keys, mock_get_prov, sample_pdf_bytes, tmp_path):
+        mock_keys.return_value = ["test-key"]
+        mock_provider = MagicMock()
+        mock_provider.generate.side_effect = [
+            ('{"category": "Fiction", "genre": "Drama"}', "model-1"),
+            ("Analysis", "model-2"),
+            ("# Review", "model-3"),
+        ]
+        mock_get_prov.return_value = mock_provider
+
+        review_book_syntopic(sample_pdf_bytes, "application/pdf", provider="gemini")
+
+        assert list((tmp_path / "checkpoints").glob("*.json")) == []
+
+    def test_disabled_with_empty_dir(self, monkeypatch):
+        monkeypatch.setattr(review.settings, "review_checkpoint_dir", "")
+        review._save_progress(("abc", "gemini"), {"librarian_data": {}})
+        assert review._load_progress(("abc", "gemini")) == {}
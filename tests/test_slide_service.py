@@ -109,3 +109,51 @@ class TestAnalyzeDocument:
         # Verify the system instruction includes detail mode
         call_kwargs = mock_provider.generate.call_args[1]
         assert "Chi tiết" in call_kwargs.get("system", "") or len(call_kwargs.get("system", "")) > 100
+
+
+class TestSlideResultCache:
+    """Opt-in reuse of the parsed outline for identical inputs."""
+
+    VALID_SLIDE_JSON = TestAnalyzeDocument.VALID_SLIDE_JSON
+
+    @pytest.fixture(autouse=True)
+    def _enabled(self, monkeypatch):
+        from app.services import slide
+
+        monkeypatch.setattr(slide.settings, "slide_result_cache", True)
+        monkeypatch.setattr(slide, "_results", {})
+
+    def _provider(self, mock_get_prov):
+        mock_provider = MagicMock()
+        mock_provider.generate.return_value = (self.VALID_SLIDE_JSON, "m")
+        mock_get_prov.return_value = mock_provider
+        return mock_provider
+
+    @patch("app.services.slide.get_provider")
+    @patch("app.services.slide.resolve_provider_keys", return_value=["k"])
+    def test_identical_run_skips_llm(self, _keys, mock_get_prov, sample_pdf_bytes):
+        mock_provider = self._provider(mock_get_prov)
+        first = analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama")
+        first["title"] = "mutated by caller"
+        second = analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama")
+
+        assert mock_provider.generate.call_count == 1
+        assert second["title"] == "AI Overview"
+
+    @patch("app.services.slide.get_provider")
+    @patch("app.services.slide.resolve_provider_keys", return_value=["k"])
+    def test_refresh_cache_reruns_llm(self, _keys, mock_get_prov, sample_pdf_bytes):
+        mock_provider = self._provider(mock_get_prov)
+        analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama")
+        analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama", refresh_cache=True)
+
+        assert mock_provider.generate.call_count == 2
+
+    @patch("app.services.slide.get_provider")
+    @patch("app.services.slide.resolve_provider_keys", return_value=["k"])
+    def test_changed_instructions_miss(self, _keys, mock_get_prov, sample_pdf_bytes):
+        mock_provider = self._provider(mock_get_prov)
+        analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama")
+        analyze_document(sample_pdf_bytes, "application/pdf", provider="ollama", user_instructions="ngắn gọn")
+
+        assert mock_provider.generate.call_count == 2